@@ -1,7 +1,10 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify, stream_with_context
 from flask_cors import CORS
-from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 import os
+import atexit
+import hashlib
+import hmac
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import sys
@@ -25,7 +28,8 @@ CORS(app, resources={
             "https://aarogya.vercel.app"
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "allow_headers": ["Content-Type", "Authorization", "If-None-Match"],
+        "expose_headers": ["ETag"],
         "supports_credentials": True
     }
 })
@@ -37,20 +41,128 @@ db_name = os.getenv("DB_NAME")
 if not mongo_uri or not db_name:
     raise ValueError("❌ MONGO_URI or DB_NAME is not set in your .env file.")
 
-client = MongoClient(mongo_uri)
-db = client[db_name]
-print("✅ Connected to MongoDB")
-
 # Add the current directory to path so we can import our models
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from models.patient import Patient, MedicalRecord
+from models.patient import Patient, Appointment, MedicalRecord
 from models.doctor import Doctor
 from models.hospital_admin import HospitalAdmin
+from models.cache import result_cache
+from models.ids import new_id
 from portal_system import HospitalPortalSystem
+from auth_tokens import TokenSigner, bearer_token
+from serializers import dumps, parse_fields
+from exporters import csv_lines, ndjson_lines
+from metrics import MetricsMiddleware, RequestMetrics, mark_endpoint
+from storage import MongoStore, SharedState, WriteBehindQueue, connect, open_state_backend
+
+# Per-endpoint latency, status and size metrics for /metrics; with METRICS_DIR
+# set, each gunicorn worker writes its counters there and /metrics adds them up
+request_metrics = RequestMetrics(os.getenv("METRICS_DIR"),
+                                 flush_interval=float(os.getenv("METRICS_FLUSH_INTERVAL", "5")))
+request_metrics.start()
+atexit.register(request_metrics.stop)
+app.wsgi_app = MetricsMiddleware(app.wsgi_app, request_metrics)
+
+@app.before_request
+def label_request_metrics():
+    """Tag the request with its route for the metrics middleware"""
+    mark_endpoint(request_metrics, request.environ, request.method,
+                  request.url_rule.rule if request.url_rule else None)
 
-# Initialize the portal system
+# Pool sizes come from MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE
+db = connect(mongo_uri, db_name)
+store = MongoStore(db, batch_size=int(os.getenv("MONGO_BATCH_SIZE", "1000")))
+print("✅ Connected to MongoDB")
+
+# Initialize the portal system and restore saved state
 portal_system = HospitalPortalSystem()
+# Every worker must sign with the same secret for tokens to work on any of them.
+# The session key above is committed to the repo, so it is never used here:
+# without AUTH_TOKEN_SECRET each worker signs with its own random key.
+if not os.getenv("AUTH_TOKEN_SECRET"):
+    print("⚠️ AUTH_TOKEN_SECRET is not set; bearer tokens only work on the worker that issued them")
+portal_system.auth_system.tokens = TokenSigner(os.getenv("AUTH_TOKEN_SECRET"))
+try:
+    store.ensure_indexes()
+    loaded = store.load_into(portal_system)
+    print(f"✅ Loaded {loaded['patients']} patients, {loaded['doctors']} doctors and "
+          f"{loaded['appointments']} appointments from MongoDB")
+except PyMongoError as e:
+    print(f"⚠️ Could not load saved data from MongoDB: {e}")
+
+# Share state between gunicorn workers when SHARED_STATE_URL is set,
+# e.g. sqlite:////tmp/aarogya_state.db
+shared_state = None
+shared_state_url = os.getenv("SHARED_STATE_URL")
+if shared_state_url:
+    shared_state = SharedState(portal_system, open_state_backend(shared_state_url))
+    shared_state.sync()
+    shared_state.attach()
+
+# Persist changes from a background thread in coalesced batches
+write_behind = WriteBehindQueue(
+    store,
+    flush_interval=float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0")),
+    batch_size=int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500")),
+    max_backlog=int(os.getenv("WRITE_BEHIND_MAX_BACKLOG", "10000")),
+    skip_when=lambda: shared_state is not None and shared_state.applying  # the writing worker saves those
+)
+write_behind.attach(portal_system.auth_system.users)
+write_behind.start()
+atexit.register(write_behind.stop)
+
+@app.before_request
+def sync_shared_state():
+    """Pick up changes made by other workers before handling a request"""
+    if shared_state:
+        shared_state.sync()
+
+def request_user(role: str = None):
+    """The caller, from an 'Authorization: Bearer' token or else the session cookie"""
+    token = bearer_token(request.headers.get('Authorization'))
+    if token:
+        user = portal_system.auth_system.authenticate(token)
+    else:
+        user = portal_system.auth_system.users.get(session['user_id']) if 'user_id' in session else None
+    if user is None or (role and user.role != role):
+        return None
+    return user
+
+def dashboard_json(user):
+    """A user's dashboard as (ETag, JSON body), kept until their entity version moves on
+
+    The tag is a hash of the body, so every worker holding the same data
+    issues the same tag and a browser's If-None-Match is honoured by
+    whichever worker gets the next request. Dashboards depend on the clock;
+    the result cache's ttl bounds how long a body and its tag are reused.
+    """
+    def render():
+        body = dumps({'role': user.role, 'dashboard': user.get_dashboard_data()})
+        return hashlib.sha1(user.user_id.encode() + b":" + body).hexdigest(), body
+    return result_cache.get_or_compute(('dashboard_json', user.user_id), user.cache_version(), render)
+
+def json_dashboard(role: str):
+    """Dashboard JSON for the caller, or 304 when their If-None-Match is still current"""
+    user = request_user(role)
+    if user is None:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    etag, body = dashboard_json(user)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.update(('Authorization', 'Cookie'))
+    return response
+
+def json_page(name: str, page, model: type):
+    """One page of a listing as JSON, with the fields chosen by ?fields=a,b"""
+    fields = parse_fields(model, request.args.get('fields'))
+    body = dumps({name: page.items, 'next_cursor': page.next_cursor}, {model: fields} if fields else None)
+    return app.response_class(body, mimetype='application/json')
 
 # ---------------- ROUTES ---------------- #
 
@@ -58,7 +170,7 @@ portal_system = HospitalPortalSystem()
 def testdb():
     """Test inserting data into MongoDB"""
     test_data = {"name": "Test Patient", "age": 30}
-    db.patients.insert_one(test_data)
+    db.connection_test.insert_one(test_data)
     return {"message": "Data inserted into MongoDB!"}
 
 @app.route('/')
@@ -68,8 +180,9 @@ def home():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
-        email = request.form['email']
-        password = request.form['password']
+        data = (request.get_json(silent=True) or {}) if request.is_json else request.form
+        email = data.get('email', '')
+        password = data.get('password', '')
         
         user = portal_system.auth_system.login(email, password)
         if user:
@@ -77,12 +190,21 @@ def login():
             session['user_role'] = user.role
             session['user_name'] = user.name
             
+            if request.is_json:
+                return jsonify({
+                    'token': portal_system.auth_system.issue_token(user),
+                    'token_type': 'Bearer',
+                    'expires_in': portal_system.auth_system.tokens.max_age,
+                    'user': {'user_id': user.user_id, 'role': user.role, 'name': user.name}
+                })
             if user.role == 'Patient':
                 return redirect(url_for('patient_dashboard'))
             elif user.role == 'Doctor':
                 return redirect(url_for('doctor_dashboard'))
             elif user.role == 'Hospital Admin':
                 return redirect(url_for('admin_dashboard'))
+        elif request.is_json:
+            return jsonify({'error': 'Invalid credentials'}), 401
         else:
             flash('Invalid credentials. Please try again.', 'error')
     return render_template('login.html')
@@ -109,22 +231,24 @@ def register_patient():
     
     try:
         # Check if email already exists
-        if any(user.email == email for user in portal_system.auth_system.users.values()):
+        if portal_system.auth_system.users.has_email(email):
             return jsonify({'error': 'Email already registered'}), 400
         
         # Create new patient
         new_patient = Patient(
-            user_id=f"PAT{len(portal_system.auth_system.users) + 1}",
+            user_id=new_id("PAT"),
             name=name,
             email=email,
             password=password,
             age=age,
             gender=gender,
-            phone=phone
+            phone=phone,
+            address=data.get('address', '')
         )
         
         # Add to portal system
-        portal_system.auth_system.users[new_patient.user_id] = new_patient
+        if not portal_system.auth_system.register_user(new_patient):
+            return jsonify({'error': 'Email already registered'}), 400
         return jsonify({'message': 'Patient registered successfully', 'user_id': new_patient.user_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -140,21 +264,23 @@ def register_doctor():
     
     try:
         # Check if email already exists
-        if any(user.email == email for user in portal_system.auth_system.users.values()):
+        if portal_system.auth_system.users.has_email(email):
             return jsonify({'error': 'Email already registered'}), 400
         
         # Create new doctor
         new_doctor = Doctor(
-            user_id=f"DOC{len(portal_system.auth_system.users) + 1}",
+            user_id=new_id("DOC"),
             name=name,
             email=email,
             password=password,
             specialization=specialization,
-            experience=experience
+            license_number=data.get('license_number', ''),
+            years_experience=experience
         )
         
         # Add to portal system
-        portal_system.auth_system.users[new_doctor.user_id] = new_doctor
+        if not portal_system.auth_system.register_user(new_doctor):
+            return jsonify({'error': 'Email already registered'}), 400
         return jsonify({'message': 'Doctor registered successfully', 'user_id': new_doctor.user_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -169,27 +295,27 @@ def register_admin():
     
     try:
         # Check if email already exists
-        if any(user.email == email for user in portal_system.auth_system.users.values()):
+        if portal_system.auth_system.users.has_email(email):
             return jsonify({'error': 'Email already registered'}), 400
         
         # Create new admin
         new_admin = HospitalAdmin(
-            user_id=f"ADM{len(portal_system.auth_system.users) + 1}",
+            user_id=new_id("ADM"),
             name=name,
             email=email,
-            password=password,
-            hospital_name=hospital_name
+            password=password
         )
         
         # Add to portal system
-        portal_system.auth_system.users[new_admin.user_id] = new_admin
+        if not portal_system.auth_system.register_user(new_admin):
+            return jsonify({'error': 'Email already registered'}), 400
         return jsonify({'message': 'Admin registered successfully', 'user_id': new_admin.user_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/logout')
 def logout():
-    portal_system.auth_system.logout()
+    portal_system.auth_system.logout(request_user())
     session.clear()
     flash('You have been logged out successfully.', 'success')
     return redirect(url_for('home'))
@@ -202,15 +328,7 @@ def initialize_demo():
 
 @app.route('/patient/dashboard')
 def patient_dashboard():
-    if 'user_id' not in session or session.get('user_role') != 'Patient':
-        return redirect(url_for('login'))
-    
-    user = portal_system.auth_system.get_current_user()
-    if not user:
-        for system_user in portal_system.auth_system.users.values():
-            if system_user.user_id == session['user_id']:
-                user = system_user
-                break
+    user = request_user('Patient')
     
     if user:
         dashboard_data = user.get_dashboard_data()
@@ -226,15 +344,7 @@ def patient_dashboard():
 
 @app.route('/doctor/dashboard')
 def doctor_dashboard():
-    if 'user_id' not in session or session.get('user_role') != 'Doctor':
-        return redirect(url_for('login'))
-    
-    user = portal_system.auth_system.get_current_user()
-    if not user:
-        for system_user in portal_system.auth_system.users.values():
-            if system_user.user_id == session['user_id']:
-                user = system_user
-                break
+    user = request_user('Doctor')
     
     if user:
         dashboard_data = user.get_dashboard_data()
@@ -248,15 +358,7 @@ def doctor_dashboard():
 
 @app.route('/admin/dashboard')
 def admin_dashboard():
-    if 'user_id' not in session or session.get('user_role') != 'Hospital Admin':
-        return redirect(url_for('login'))
-    
-    user = portal_system.auth_system.get_current_user()
-    if not user:
-        for system_user in portal_system.auth_system.users.values():
-            if system_user.user_id == session['user_id']:
-                user = system_user
-                break
+    user = request_user('Hospital Admin')
     
     if user:
         dashboard_data = user.get_dashboard_data()
@@ -270,7 +372,8 @@ def admin_dashboard():
 
 @app.route('/patient/book_appointment', methods=['GET', 'POST'])
 def book_appointment():
-    if 'user_id' not in session or session.get('user_role') != 'Patient':
+    patient = request_user('Patient')
+    if patient is None:
         return redirect(url_for('login'))
     
     if request.method == 'POST':
@@ -279,37 +382,157 @@ def book_appointment():
         
         apt_date = datetime.now() + timedelta(days=1, hours=10)
         
-        patient = None
-        for user in portal_system.auth_system.users.values():
-            if user.user_id == session['user_id'] and isinstance(user, Patient):
-                patient = user
-                break
-        
-        if patient:
+        if isinstance(patient, Patient):
             apt_id = patient.book_appointment(doctor_id, apt_date, reason)
             flash(f'Appointment booked successfully! ID: {apt_id}', 'success')
             return redirect(url_for('patient_dashboard'))
     
-    admin = None
-    for user in portal_system.auth_system.users.values():
-        if isinstance(user, HospitalAdmin):
-            admin = user
-            break
-    
+    admin = portal_system.auth_system.users.first_with_role('Hospital Admin')
     doctors = admin.managed_doctors if admin else []
     return render_template('book_appointment.html', doctors=doctors)
 
+@app.route('/api/earliest_slots')
+def api_earliest_slots():
+    if request_user() is None:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    specialization = request.args.get('specialization')
+    if not specialization:
+        return jsonify({'error': 'specialization is required'}), 400
+
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    days = min(max(request.args.get('days', 14, type=int), 1), 90)
+
+    admin = portal_system.auth_system.users.first_with_role('Hospital Admin')
+    slots = admin.find_earliest_available_slots(specialization, limit, days) if admin else []
+    return jsonify({
+        'specialization': specialization,
+        'days': days,
+        'slots': slots
+    })
+
+@app.route('/api/patient/dashboard')
+def api_patient_dashboard():
+    return json_dashboard('Patient')
+
+@app.route('/api/doctor/dashboard')
+def api_doctor_dashboard():
+    return json_dashboard('Doctor')
+
+@app.route('/api/admin/dashboard')
+def api_admin_dashboard():
+    return json_dashboard('Hospital Admin')
+
+@app.route('/api/patients')
+def api_patients():
+    admin = request_user()
+    if admin is None:
+        return jsonify({'error': 'Not logged in'}), 401
+    if admin.role != 'Hospital Admin':
+        return jsonify({'error': 'Not authorized'}), 403
+    try:
+        page = admin.page_patients(request.args.get('cursor'), request.args.get('limit', type=int))
+        return json_page('patients', page, Patient)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/doctors')
+def api_doctors():
+    if request_user() is None:
+        return jsonify({'error': 'Not logged in'}), 401
+    admin = portal_system.auth_system.users.first_with_role('Hospital Admin')
+    if admin is None:
+        return jsonify({'doctors': [], 'next_cursor': None})
+    try:
+        page = admin.page_doctors(request.args.get('cursor'), request.args.get('limit', type=int))
+        return json_page('doctors', page, Doctor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/appointments')
+def api_appointments():
+    """The caller's appointments, or every appointment for an admin, a page at a time"""
+    user = request_user()
+    if user is None:
+        return jsonify({'error': 'Not logged in'}), 401
+    if not isinstance(user, (Patient, Doctor, HospitalAdmin)):
+        return jsonify({'appointments': [], 'next_cursor': None})
+    try:
+        page = user.page_appointments(request.args.get('cursor'), request.args.get('limit', type=int),
+                                      request.args.get('status'))
+        return json_page('appointments', page, Appointment)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+UTILIZATION_COLUMNS = ('doctor_id', 'name', 'specialization', 'total_patients', 'appointments')
+
+def _export_date(name: str):
+    value = request.args.get(name)
+    return datetime.fromisoformat(value) if value else None
+
+@app.route('/admin/export/<dataset>.<fmt>')
+def admin_export(dataset, fmt):
+    """Stream appointments, patients or doctor utilization as CSV or NDJSON
+
+    Query: start and end (ISO dates, start <= date < end), status, fields.
+    Rows are generated while the response is sent, so memory stays flat.
+    """
+    admin = request_user('Hospital Admin')
+    if admin is None or not admin.permissions.get('view_reports', False):
+        return jsonify({'error': 'Not authorized'}), 403
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unknown format {fmt}'}), 404
+
+    try:
+        start, end, status = _export_date('start'), _export_date('end'), request.args.get('status')
+        if dataset == 'appointments':
+            model, rows = Appointment, admin.export_appointments(start, end, status)
+        elif dataset == 'patients':
+            model, rows = Patient, admin.export_patients(start, end)
+        elif dataset == 'doctor_utilization':
+            model, rows = None, admin.export_doctor_utilization(start, end, status)
+        else:
+            return jsonify({'error': f'Unknown export {dataset}'}), 404
+        fields = parse_fields(model, request.args.get('fields')) if model else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if fmt == 'csv':
+        body = csv_lines(rows, model, fields, columns=UTILIZATION_COLUMNS)
+    else:
+        body = ndjson_lines(rows, model, fields)
+    return Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename={dataset}.{fmt}'})
+
 @app.route('/api/user_info')
 def api_user_info():
-    if 'user_id' not in session:
+    user = request_user()
+    if user is None:
         return jsonify({'error': 'Not logged in'}), 401
     
     return jsonify({
-        'user_id': session.get('user_id'),
-        'role': session.get('user_role'),
-        'name': session.get('user_name')
+        'user_id': user.user_id,
+        'role': user.role,
+        'name': user.name
     })
 
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    if request_user('Hospital Admin') is None:
+        return jsonify({'error': 'Not authorized'}), 403
+
+    return jsonify(dict(result_cache.stats(), pid=os.getpid()))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request metrics of every worker in the Prometheus text format"""
+    token = os.getenv("METRICS_TOKEN")
+    if token and not hmac.compare_digest(bearer_token(request.headers.get('Authorization')) or '', token):
+        return jsonify({'error': 'Not authorized'}), 403
+
+    return Response(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/test-db')
 def test_db():
     return {"status": "ok"}
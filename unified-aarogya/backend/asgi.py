@@ -0,0 +1,12 @@
+"""
+ASGI entry point: the async read API under /async, with every other path
+served by the Flask app
+
+    gunicorn --workers 4 -k uvicorn.workers.UvicornWorker asgi:application
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+from app import app, portal_system, shared_state
+from async_api import AsyncReadAPI
+
+application = AsyncReadAPI(app, portal_system, WsgiToAsgi(app), shared_state)
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timedelta
+from itertools import islice
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from itsdangerous import BadSignature
+from auth_tokens import bearer_token
+from models.patient import Patient, Appointment
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.pagination import MAX_PAGE_SIZE
+from serializers import dumps
+
+# Fields returned for appointments and doctors in listings
+SUMMARY_FIELDS = {
+    Appointment: ("appointment_id", "patient_id", "doctor_id", "date", "reason", "status"),
+    Doctor: ("user_id", "name", "specialization", "years_experience", "consultation_fee", "rating")
+}
+
+class AsyncReadAPI:
+    """ASGI application serving read-only JSON under /async, next to the Flask app
+
+    Dashboards, appointment listings and doctor listings are answered on
+    the event loop straight from the in-memory models, so one process can
+    serve many concurrent reads; only the shared-state sync, which touches
+    SQLite, runs in a thread. The caller is identified from a bearer token,
+    or else from the Flask session cookie. Every other request is passed to fallback, normally
+    the Flask app wrapped for ASGI.
+
+        GET /async/dashboard
+        GET /async/appointments?status=scheduled&limit=100
+        GET /async/doctors?specialization=Cardiology
+    """
+
+    PREFIX = "/async/"
+
+    def __init__(self, flask_app, portal_system, fallback, shared_state=None):
+        self.flask_app = flask_app
+        self.portal_system = portal_system
+        self.fallback = fallback
+        self.shared_state = shared_state
+        self.routes = {
+            "/async/dashboard": self.dashboard,
+            "/async/appointments": self.appointments,
+            "/async/doctors": self.doctors
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http" and scope["path"].startswith(self.PREFIX):
+            status, body = await self._handle(scope)
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())]
+            })
+            await send({"type": "http.response.body", "body": body})
+        else:
+            await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle(self, scope) -> Tuple[int, bytes]:
+        handler = self.routes.get(scope["path"].rstrip("/"))
+        if handler is None:
+            return self._json(404, {"error": "Not found"})
+        if scope["method"] not in ("GET", "HEAD"):
+            return self._json(405, {"error": "Method not allowed"})
+
+        if self.shared_state:
+            await asyncio.get_running_loop().run_in_executor(None, self.shared_state.sync)
+
+        user = self._user(scope)
+        if user is None:
+            return self._json(401, {"error": "Not logged in"})
+
+        query = {key: values[-1] for key, values in parse_qs(scope.get("query_string", b"").decode()).items()}
+        try:
+            return self._json(200, handler(user, query))
+        except ValueError as e:
+            return self._json(400, {"error": str(e)})
+
+    def _user(self, scope):
+        """The caller, from an 'Authorization: Bearer' token or else the session cookie"""
+        auth_system = self.portal_system.auth_system
+        authorization = b"".join(value for name, value in scope["headers"] if name == b"authorization")
+        token = bearer_token(authorization.decode("latin-1"))
+        if token:
+            return auth_system.authenticate(token)
+        session = self._session(scope)
+        return auth_system.users.get(session.get("user_id")) if session else None
+
+    def _session(self, scope) -> Optional[Dict]:
+        """Decode the signed Flask session cookie, or None if absent or invalid"""
+        cookie_header = b"; ".join(value for name, value in scope["headers"] if name == b"cookie")
+        if not cookie_header:
+            return None
+        cookie = SimpleCookie()
+        cookie.load(cookie_header.decode("latin-1"))
+        morsel = cookie.get(self.flask_app.config["SESSION_COOKIE_NAME"])
+        if morsel is None:
+            return None
+
+        serializer = self.flask_app.session_interface.get_signing_serializer(self.flask_app)
+        max_age = int(self.flask_app.permanent_session_lifetime.total_seconds())
+        try:
+            return serializer.loads(morsel.value, max_age=max_age)
+        except BadSignature:
+            return None
+
+    @staticmethod
+    def _json(status: int, payload) -> Tuple[int, bytes]:
+        return status, dumps(payload, SUMMARY_FIELDS)
+
+    @staticmethod
+    def _limit(query: Dict, default: int = 100) -> int:
+        return min(max(int(query.get("limit", default)), 1), MAX_PAGE_SIZE)
+
+    # ---- Endpoints ----
+
+    def dashboard(self, user, query: Dict) -> Dict:
+        return {"role": user.role, "dashboard": user.get_dashboard_data()}
+
+    def appointments(self, user, query: Dict) -> Dict:
+        status = query.get("status")
+        limit = self._limit(query)
+        if isinstance(user, HospitalAdmin):
+            start = datetime.fromisoformat(query["start"]) if "start" in query else datetime.now()
+            end = datetime.fromisoformat(query["end"]) if "end" in query else start + timedelta(days=7)
+            appointments: List[Appointment] = list(islice(
+                (appointment for appointment in user.repository.between(start, end)
+                 if status is None or appointment.status == status), limit))
+        elif isinstance(user, (Patient, Doctor)):
+            # The first page of the owner's (owner, status) index, so the cost follows limit, not history
+            appointments = user.page_appointments(limit=limit, status=status).items
+        else:
+            appointments = []
+        return {"appointments": appointments}
+
+    def doctors(self, user, query: Dict) -> Dict:
+        admin = self.portal_system.auth_system.users.first_with_role("Hospital Admin")
+        if admin is None:
+            return {"doctors": []}
+        specialization = query.get("specialization")
+        doctors = admin.find_doctor_by_specialization(specialization) if specialization else admin.managed_doctors
+        return {"doctors": doctors[:self._limit(query)]}
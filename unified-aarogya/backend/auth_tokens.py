@@ -0,0 +1,52 @@
+import hashlib
+import os
+import secrets
+from typing import Dict, Optional
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+DEFAULT_MAX_AGE = 12 * 60 * 60  # seconds
+
+class TokenSigner:
+    """Issues and checks signed, expiring bearer tokens
+
+    A token is the user's ID and role plus a timestamp, signed with
+    HMAC-SHA256 under the shared secret. Any worker or node holding the
+    same secret can check it without looking anything up, so there is no
+    login state to keep per process. Tokens are not encrypted; they carry
+    nothing the user does not already know.
+    """
+
+    SALT = "aarogya-auth-token"
+
+    def __init__(self, secret: Optional[str] = None, max_age: Optional[int] = None):
+        # Without AUTH_TOKEN_SECRET tokens only work in the process that issued them
+        self.secret = secret or os.getenv("AUTH_TOKEN_SECRET") or secrets.token_hex(32)
+        self.max_age = max_age or int(os.getenv("AUTH_TOKEN_MAX_AGE", DEFAULT_MAX_AGE))
+        # itsdangerous signs with HMAC-SHA1 unless told otherwise
+        self._serializer = URLSafeTimedSerializer(self.secret, salt=self.SALT,
+                                                  signer_kwargs={"digest_method": hashlib.sha256})
+
+    def issue(self, user) -> str:
+        """Return a token for a user"""
+        return self._serializer.dumps({"uid": user.user_id, "role": user.role})
+
+    def verify(self, token: Optional[str]) -> Optional[Dict]:
+        """Return {'user_id', 'role'} from a valid, unexpired token, else None"""
+        if not token:
+            return None
+        try:
+            claims = self._serializer.loads(token, max_age=self.max_age)
+        except BadSignature:  # also raised for expired tokens
+            return None
+        if not isinstance(claims, dict) or "uid" not in claims or "role" not in claims:
+            return None
+        return {"user_id": claims["uid"], "role": claims["role"]}
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """The token from an 'Authorization: Bearer <token>' header value"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.strip().partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Requests/sec benchmark: async read API against the sync Flask routes
+Starts gunicorn twice on the same data, once with sync workers serving
+app:app and once with uvicorn workers serving asgi:application, logs in
+as the demo patient and hammers one path on each with concurrent
+clients. Needs gunicorn and uvicorn installed; MongoDB is replaced by
+mongomock unless MONGO_URI is set.
+
+    python benchmarks/bench_async.py --workers 4 --concurrency 64 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def start_server(target: str, worker_class: str, port: int, workers: int, state_path: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.setdefault("MONGO_URI", "mongomock://localhost")
+    env.setdefault("DB_NAME", "aarogya_bench")
+    env["SHARED_STATE_URL"] = f"sqlite:///{state_path}"
+    command = ["gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+               "--worker-class", worker_class, "--log-level", "warning", target]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/test-db", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{target} did not start on port {port}")
+
+def login(port: int, email: str, password: str) -> str:
+    """Log in through the Flask form and return the session cookie header"""
+    jar = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    data = urllib.parse.urlencode({"email": email, "password": password}).encode()
+    opener.open(f"http://127.0.0.1:{port}/login", data=data, timeout=10)
+    return "; ".join(f"{cookie.name}={cookie.value}" for cookie in jar)
+
+async def fetch(port: int, path: str, cookie: str) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n"
+                  f"Connection: close\r\n\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()  # drain headers and body until the server closes
+    writer.close()
+    return int(status_line.split()[1])
+
+async def hammer(port: int, path: str, cookie: str, concurrency: int, seconds: float):
+    done = errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal done, errors
+        while time.perf_counter() < deadline:
+            try:
+                status = await fetch(port, path, cookie)
+            except OSError:
+                status = 0
+            if status == 200:
+                done += 1
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return done, errors, time.perf_counter() - started
+
+def run(label: str, target: str, worker_class: str, port: int, path: str, args) -> float:
+    with tempfile.TemporaryDirectory() as state_dir:
+        server = start_server(target, worker_class, port, args.workers, os.path.join(state_dir, "state.db"))
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/demo_data", timeout=10)
+            cookie = login(port, args.email, args.password)
+            done, errors, seconds = asyncio.run(hammer(port, path, cookie, args.concurrency, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+    rate = done / seconds
+    print(f"{label:<8} {path:<24} {done:>8,} ok {errors:>6,} errors  {rate:>10,.0f} req/s")
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare async and sync read throughput")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sync-path", default="/patient/dashboard")
+    parser.add_argument("--async-path", default="/async/dashboard")
+    parser.add_argument("--email", default="alice@email.com")
+    parser.add_argument("--password", default="pat123")
+    parser.add_argument("--port", type=int, default=5190)
+    args = parser.parse_args()
+
+    print("ASYNC READ API BENCHMARK")
+    print("=" * 50)
+    print(f"{args.workers} workers, {args.concurrency} concurrent clients, {args.seconds:.0f}s per run\n")
+
+    sync_rate = run("sync", "app:app", "sync", args.port, args.sync_path, args)
+    async_rate = run("async", "asgi:application", "uvicorn.workers.UvicornWorker", args.port + 1, args.async_path, args)
+    print(f"\nAsync/sync throughput: {async_rate / sync_rate:.2f}x" if sync_rate else "")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark
+Measures successful logins/sec through AuthenticationSystem.login at
+several PBKDF2 work factors, with a number of request threads sharing
+one process (one worker) and its bounded hashing pool.
+
+    python benchmarks/bench_login.py --costs 10000 100000 260000 600000 --threads 8 --pool 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.patient import Patient
+from passwords import PasswordHasher
+from portal_system import AuthenticationSystem
+
+def measure(cost: int, users: int, threads: int, pool: int, seconds: float):
+    hasher = PasswordHasher(iterations=cost, max_workers=pool)
+    auth = AuthenticationSystem(hasher)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(users):
+            auth.register_user(Patient(f"PAT{i:05d}", f"Patient {i}", f"patient{i}@example.com",
+                                       f"password{i}", 30, "Female", "555-0100", "1 Main St"))
+
+    logins = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def request_thread(index: int):
+        i = index
+        while time.perf_counter() < deadline:
+            user_number = i % users
+            if auth.login(f"patient{user_number}@example.com", f"password{user_number}"):
+                logins[index] += 1
+            i += threads
+
+    workers = [threading.Thread(target=request_thread, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+    return sum(logins), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure logins/sec at different hash costs")
+    parser.add_argument("--costs", type=int, nargs="+", default=[10_000, 100_000, 260_000, 600_000],
+                        help="PBKDF2 iteration counts to try")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent request threads")
+    parser.add_argument("--pool", type=int, default=min(4, os.cpu_count() or 1), help="hashing pool size")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("LOGIN THROUGHPUT BENCHMARK")
+    print("=" * 50)
+    print(f"{args.threads} request threads, hashing pool of {args.pool}, {args.seconds:.0f}s per cost\n")
+    print(f"{'Iterations':>12} {'Logins':>10} {'Logins/sec':>12} {'ms/login':>10}")
+    for cost in args.costs:
+        logins, elapsed = measure(cost, args.users, args.threads, args.pool, args.seconds)
+        rate = logins / elapsed
+        print(f"{cost:>12,} {logins:>10,} {rate:>12,.1f} {1000 / rate if rate else 0:>10.1f}")
+
+if __name__ == "__main__":
+    main()
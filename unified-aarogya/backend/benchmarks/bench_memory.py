@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the model classes
+Loads a large number of appointments and medical records and reports the
+resident memory they take, optionally next to dict-backed copies of the
+classes as they were before they used __slots__.
+
+    python benchmarks/bench_memory.py --appointments 10000000 --records 2000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.patient import Appointment, MedicalRecord
+
+class LegacyAppointment:
+    """Appointment laid out the way it was before __slots__"""
+    def __init__(self, appointment_id, patient_id, doctor_id, date, reason, status="scheduled"):
+        self.appointment_id = appointment_id
+        self.patient_id = patient_id
+        self.doctor_id = doctor_id
+        self.date = date
+        self.reason = reason
+        self.status = status
+        self.diagnosis = None
+        self.prescription = None
+        self.notes = None
+        self._observers = []
+
+class LegacyMedicalRecord:
+    """MedicalRecord laid out the way it was before __slots__"""
+    def __init__(self, record_id, patient_id, doctor_id, diagnosis, treatment, date):
+        self.record_id = record_id
+        self.patient_id = patient_id
+        self.doctor_id = doctor_id
+        self.diagnosis = diagnosis
+        self.treatment = treatment
+        self.date = date
+        self.medications = []
+        self.lab_results = {}
+
+    def add_medication(self, medication, dosage, duration):
+        self.medications.append({
+            'medication': medication,
+            'dosage': dosage,
+            'duration': duration,
+            'prescribed_date': datetime.now()
+        })
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss is a high-water mark: KiB on Linux, bytes on macOS
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+def load(appointment_cls, record_cls, appointments: int, records: int, patients: int, doctors: int):
+    """Build the objects and return (objects, appointment_bytes, record_bytes, seconds)"""
+    patient_ids = [f"PAT{i:07d}" for i in range(patients)]
+    doctor_ids = [f"DOC{i:05d}" for i in range(doctors)]
+    reasons = ["Regular checkup", "Follow-up visit", "Chest pain", "Vaccination", "Consultation"]
+    start_date = datetime(2024, 1, 1, 8, 0)
+
+    gc.collect()
+    started = time.perf_counter()
+    base = current_rss()
+
+    appointment_objects = []
+    for i in range(appointments):
+        patient_id = patient_ids[i % patients]
+        appointment_objects.append(appointment_cls(
+            f"APT_{i:08d}_{patient_id}", patient_id, doctor_ids[i % doctors],
+            start_date + timedelta(minutes=30 * i), reasons[i % len(reasons)]
+        ))
+    after_appointments = current_rss()
+
+    record_objects = []
+    for i in range(records):
+        record = record_cls(f"MR_{i:08d}", patient_ids[i % patients], doctor_ids[i % doctors],
+                            "Hypertension", "Lifestyle changes", start_date + timedelta(hours=i))
+        if i % 2 == 0:
+            record.add_medication("Lisinopril", "10mg daily", "30 days")
+        record_objects.append(record)
+    after_records = current_rss()
+
+    seconds = time.perf_counter() - started
+    return (appointment_objects, record_objects), after_appointments - base, after_records - after_appointments, seconds
+
+def report(label: str, appointments: int, records: int, appointment_bytes: int, record_bytes: int, seconds: float):
+    print(f"\n{label}")
+    print("-" * len(label))
+    print(f"Appointments: {appointments:,} -> {appointment_bytes / 2**20:,.1f} MiB "
+          f"({appointment_bytes / max(appointments, 1):.0f} bytes each)")
+    print(f"Records:      {records:,} -> {record_bytes / 2**20:,.1f} MiB "
+          f"({record_bytes / max(records, 1):.0f} bytes each)")
+    print(f"Load time:    {seconds:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure model memory use")
+    parser.add_argument("--appointments", type=int, default=10_000_000)
+    parser.add_argument("--records", type=int, default=2_000_000)
+    parser.add_argument("--patients", type=int, default=200_000)
+    parser.add_argument("--doctors", type=int, default=2_000)
+    parser.add_argument("--legacy", action="store_true",
+                        help="also measure dict-backed classes (needs roughly twice the memory)")
+    args = parser.parse_args()
+
+    print("MODEL MEMORY BENCHMARK")
+    print("=" * 50)
+
+    objects, appointment_bytes, record_bytes, seconds = load(
+        Appointment, MedicalRecord, args.appointments, args.records, args.patients, args.doctors)
+    report("Slotted models", args.appointments, args.records, appointment_bytes, record_bytes, seconds)
+
+    if args.legacy:
+        del objects
+        gc.collect()
+        _, appointment_bytes, record_bytes, seconds = load(
+            LegacyAppointment, LegacyMedicalRecord, args.appointments, args.records, args.patients, args.doctors)
+        report("Dict-backed models", args.appointments, args.records, appointment_bytes, record_bytes, seconds)
+
+if __name__ == "__main__":
+    main()
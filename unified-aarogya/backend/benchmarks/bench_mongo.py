@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the MongoDB storage layer
+Bulk-inserts patients and appointments through MongoStore, compares
+batched upserts with one-at-a-time writes, then times indexed, projected
+reads of single patients' appointments. Runs against an in-process
+mongomock database unless --uri points at a real server (mongomock is
+much slower than a server, especially for upserts, so keep counts small).
+
+    python benchmarks/bench_mongo.py
+    python benchmarks/bench_mongo.py --uri mongodb://localhost:27017 --appointments 1000000 --upserts 100000 --reads 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.patient import Patient, Appointment
+from storage import MongoStore, connect
+from storage.documents import appointment_to_document
+
+def make_patients(count: int):
+    genders = ["Male", "Female", "Other"]
+    return [
+        Patient(f"PAT{i:07d}", f"Patient {i}", f"patient{i}@example.com", "secret",
+                18 + i % 70, genders[i % 3], f"555-{i % 10000:04d}", f"{i} Main St")
+        for i in range(count)
+    ]
+
+def make_appointments(count: int, patients: int, doctors: int):
+    # Built directly rather than through Patient.book_appointment so the
+    # shared appointment repository is not involved
+    start = datetime(2024, 1, 1, 8, 0)
+    statuses = ["scheduled", "completed", "cancelled"]
+    return [
+        Appointment(f"APT_{i:08d}", f"PAT{i % patients:07d}", f"DOC{i % doctors:05d}",
+                    start + timedelta(minutes=30 * i), "Consultation", statuses[i % 3])
+        for i in range(count)
+    ]
+
+def timed(label: str, count: int, action):
+    started = time.perf_counter()
+    result = action()
+    seconds = time.perf_counter() - started
+    print(f"{label:<38} {count:>10,} in {seconds:7.2f}s  ({count / seconds:,.0f}/s)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MongoStore throughput")
+    parser.add_argument("--uri", default="mongomock://localhost")
+    parser.add_argument("--db", default="aarogya_bench")
+    parser.add_argument("--patients", type=int, default=2_000)
+    parser.add_argument("--appointments", type=int, default=20_000)
+    parser.add_argument("--doctors", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--upserts", type=int, default=200,
+                        help="existing appointments to rewrite, batched and then one at a time")
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    db = connect(args.uri, args.db)
+    store = MongoStore(db, batch_size=args.batch_size)
+    for collection in (store.patients, store.appointments):
+        collection.drop()
+    store.ensure_indexes()
+
+    print("MONGO STORAGE BENCHMARK")
+    print("=" * 50)
+    print(f"Database: {args.uri} / {args.db}, batch size {args.batch_size}\n")
+
+    patients = make_patients(args.patients)
+    appointments = make_appointments(args.appointments, args.patients, args.doctors)
+
+    timed("Bulk insert patients", len(patients), lambda: store.save_patients(patients, upsert=False))
+    timed("Bulk insert appointments", len(appointments), lambda: store.save_appointments(appointments, upsert=False))
+
+    rewritten = appointments[:args.upserts]
+    timed("Bulk upsert appointments", len(rewritten), lambda: store.save_appointments(rewritten))
+    def write_one_at_a_time():
+        for appointment in rewritten:
+            document = appointment_to_document(appointment)
+            store.appointments.replace_one({"_id": document["_id"]}, document, upsert=True)
+    timed("Upsert appointments one at a time", len(rewritten), write_one_at_a_time)
+
+    rng = random.Random(42)
+    patient_ids = [f"PAT{rng.randrange(args.patients):07d}" for _ in range(args.reads)]
+    returned = timed("Indexed reads, projected", len(patient_ids),
+                     lambda: sum(len(list(store.appointments_for_patient(pid))) for pid in patient_ids))
+    timed("Indexed reads, whole documents", len(patient_ids),
+          lambda: sum(len(list(store.appointments_for_patient(pid, fields=None))) for pid in patient_ids))
+    print(f"\nAppointments returned per read: {returned / max(len(patient_ids), 1):.1f}")
+
+if __name__ == "__main__":
+    main()
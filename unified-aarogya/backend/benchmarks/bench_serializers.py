@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark
+Encodes lists of appointments, medical records and patients three ways:
+hand-written to_dict functions plus json.dumps (the naive approach), the
+compiled encoders with the standard json module, and the compiled
+encoders with orjson (when installed). Reports objects/sec and output
+size per run.
+
+    python benchmarks/bench_serializers.py --objects 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serializers
+from models.patient import Patient, Appointment, MedicalRecord
+
+def build(count: int):
+    base = datetime(2025, 1, 1, 9, 0)
+    appointments = [Appointment(f"APT{i:07d}", f"PAT{i % 5000:05d}", f"DOC{i % 200:03d}",
+                                base + timedelta(minutes=30 * i), "Routine checkup") for i in range(count)]
+    records = []
+    for i in range(count):
+        record = MedicalRecord(f"REC{i:07d}", f"PAT{i % 5000:05d}", f"DOC{i % 200:03d}",
+                               "Hypertension", "Lifestyle changes", base + timedelta(days=i % 365))
+        record.add_medication("Amlodipine", "5mg", "30 days")
+        record.add_lab_result("Blood pressure", "140/90", "120/80")
+        records.append(record)
+    patients = []
+    for i in range(count):
+        patient = Patient(f"PAT{i:07d}", f"Patient {i}", f"patient{i}@example.com", "secret",
+                          30 + i % 50, "Female", "555-0100", "1 Main St")
+        patient.allergies = ["Penicillin"]
+        patients.append(patient)
+    return appointments, records, patients
+
+# ---- Naive: build a fresh dict per object by hand, then json.dumps ----
+
+def naive_appointment(appointment: Appointment):
+    return {
+        "appointment_id": appointment.appointment_id,
+        "patient_id": appointment.patient_id,
+        "doctor_id": appointment.doctor_id,
+        "date": appointment.date.isoformat(),
+        "reason": appointment.reason,
+        "status": appointment.status,
+        "diagnosis": appointment.diagnosis,
+        "prescription": appointment.prescription,
+        "notes": appointment.notes
+    }
+
+def naive_record(record: MedicalRecord):
+    return {
+        "record_id": record.record_id,
+        "patient_id": record.patient_id,
+        "doctor_id": record.doctor_id,
+        "diagnosis": record.diagnosis,
+        "treatment": record.treatment,
+        "date": record.date.isoformat(),
+        "medications": [{key: (value.isoformat() if isinstance(value, datetime) else value)
+                         for key, value in dict(entry).items()} for entry in record.medications],
+        "lab_results": {name: {key: (value.isoformat() if isinstance(value, datetime) else value)
+                               for key, value in dict(entry).items()}
+                        for name, entry in record.lab_results.items()}
+    }
+
+def naive_patient(patient: Patient):
+    return {
+        "user_id": patient.user_id,
+        "name": patient.name,
+        "email": patient.email,
+        "role": patient.role,
+        "created_at": patient.created_at.isoformat(),
+        "last_login": patient.last_login.isoformat() if patient.last_login else None,
+        "age": patient.age,
+        "gender": patient.gender,
+        "phone": patient.phone,
+        "address": patient.address,
+        "emergency_contact": patient.emergency_contact,
+        "insurance_info": patient.insurance_info,
+        "blood_type": patient.blood_type,
+        "allergies": list(patient.allergies)
+    }
+
+NAIVE = {Appointment: naive_appointment, MedicalRecord: naive_record, Patient: naive_patient}
+
+def naive_dumps(objects) -> bytes:
+    to_dict = NAIVE[type(objects[0])]
+    return json.dumps([to_dict(obj) for obj in objects]).encode()
+
+def compiled_json_dumps(objects) -> bytes:
+    backend, serializers.orjson = serializers.orjson, None
+    try:
+        return serializers.dumps(objects)
+    finally:
+        serializers.orjson = backend
+
+def compiled_orjson_dumps(objects) -> bytes:
+    return serializers.dumps(objects)
+
+def best_of(encode, objects, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = encode(objects)
+        best = min(best, time.perf_counter() - started)
+    return best, len(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare compiled serializers with naive dict building")
+    parser.add_argument("--objects", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is kept")
+    args = parser.parse_args()
+
+    methods = [("naive + json", naive_dumps), ("compiled + json", compiled_json_dumps)]
+    if serializers.orjson is not None:
+        methods.append(("compiled + orjson", compiled_orjson_dumps))
+    else:
+        print("orjson is not installed; skipping the orjson backend\n")
+
+    print("SERIALIZATION BENCHMARK")
+    print("=" * 50)
+    print(f"{'Model':<14} {'Objects':>9} {'Method':<18} {'ms':>9} {'objects/sec':>13} {'KB':>9} {'Speedup':>8}")
+    for count in args.objects:
+        appointments, records, patients = build(count)
+        for label, objects in (("Appointment", appointments), ("MedicalRecord", records), ("Patient", patients)):
+            baseline = None
+            for name, encode in methods:
+                seconds, size = best_of(encode, objects, args.repeat)
+                baseline = baseline or seconds
+                print(f"{label:<14} {count:>9,} {name:<18} {seconds * 1000:>9.1f} {count / seconds:>13,.0f} "
+                      f"{size / 1024:>9,.0f} {baseline / seconds:>7.2f}x")
+        print()
+
+if __name__ == "__main__":
+    main()
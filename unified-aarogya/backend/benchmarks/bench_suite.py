@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Model micro-benchmark suite
+Times the hot model operations (schedules, admin lookups, hospital data,
+every report type, login and each role's dashboard) on synthetic
+hospitals of several sizes from synthetic_data.py, and writes the results
+to JSON so two commits can be compared. Each scale runs in a fresh
+process, so the heap a larger hospital leaves behind does not slow the
+garbage collector for the next one. Result caching is switched off so
+every call does its real work. Runs offline; MongoDB is not used.
+
+    python benchmarks/bench_suite.py --scales tiny small --repeat 5
+    python benchmarks/bench_suite.py --output new.json --compare benchmarks/results/abc1234.json
+
+Times are per operation in microseconds (best and median of the repeats).
+Logins hash with --login-iterations PBKDF2 rounds (1,000 by default) so
+the lookup and bookkeeping around the hash stay visible; pass the
+production cost to measure the hash itself.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(BACKEND_DIR)
+
+SAMPLES = 1000  # IDs, users and schedule days sampled per lookup benchmark
+MIN_REPEAT_SECONDS = 0.2  # each repeat runs a benchmark at least this long
+DEFAULT_THRESHOLD = 10  # --compare flags anything this many percent slower
+
+def measure(setup: Callable[[], object], run: Callable[[object], int], repeat: int) -> Dict:
+    """Best and median microseconds per operation; run(state) does the work and returns its op count
+
+    Each repeat calls setup() and run() as often as it takes to fill
+    MIN_REPEAT_SECONDS, timing only run(), with the garbage collector
+    paused the way timeit does.
+    """
+    per_op = []
+    ops = 0
+    for _ in range(repeat):
+        elapsed, ops = 0.0, 0
+        gc.collect()
+        while elapsed < MIN_REPEAT_SECONDS:
+            state = setup()
+            gc.disable()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    started = time.perf_counter()
+                    ops += run(state)
+                    elapsed += time.perf_counter() - started
+            finally:
+                gc.enable()
+        per_op.append(elapsed / max(ops, 1) * 1e6)
+    return {"ops": ops, "best_us": round(min(per_op), 3), "median_us": round(statistics.median(per_op), 3)}
+
+def run_scale(scale: str, seed: int, anchor: date, repeat: int, login_iterations: int) -> Dict:
+    """Build one synthetic hospital and time every benchmark on it (runs in a fresh process)"""
+    from models.cache import result_cache
+    from models.doctor import Schedule
+    from models.reports import REPORT_TYPES
+    from passwords import PasswordHasher
+    from portal_system import HospitalPortalSystem
+    from synthetic_data import ADMIN_EMAIL, DEFAULT_PASSWORD, SyntheticHospital
+
+    system = HospitalPortalSystem()
+    system.auth_system.hasher = PasswordHasher(iterations=login_iterations)
+    hospital = SyntheticHospital.from_scale(scale, seed=seed, anchor=anchor)
+    report = hospital.populate(system)
+    result_cache.enabled = False
+
+    users = system.auth_system.users
+    admin = users.get_by_email(ADMIN_EMAIL)
+    doctors = users.by_role("Doctor")
+    patients = users.by_role("Patient")
+    rng = random.Random(f"{seed}:bench")
+    sample_doctors = [rng.choice(doctors) for _ in range(SAMPLES)]
+    sample_patients = [rng.choice(patients) for _ in range(SAMPLES)]
+    window = [hospital.anchor + timedelta(days=offset)
+              for offset in range(-hospital.past_days, hospital.future_days)]
+    schedule_days = [(rng.choice(doctors).schedule, rng.choice(window)) for _ in range(SAMPLES)]
+    specializations = sorted({doctor.specialization for doctor in doctors})
+    year = [hospital.anchor + timedelta(days=offset) for offset in range(365)]
+
+    def offered_schedule():
+        schedule = Schedule()
+        for day in year:
+            schedule.add_availability(day, "09:00", "17:00")
+        return schedule
+
+    def book_all(schedule):
+        for day in year:
+            for hour in range(9, 17):
+                schedule.book_slot(day, f"{hour:02d}:00")
+                schedule.book_slot(day, f"{hour:02d}:30")
+        return len(year) * 16
+
+    def each(objects, call):
+        for obj in objects:
+            call(obj)
+        return len(objects)
+
+    def once(call):
+        call()
+        return 1
+
+    benchmarks = {
+        "schedule.add_availability": (Schedule, lambda schedule: each(
+            year, lambda day: schedule.add_availability(day, "09:00", "17:00"))),
+        "schedule.book_slot": (offered_schedule, book_all),
+        "schedule.get_available_slots": (None, lambda _: each(
+            schedule_days, lambda pair: pair[0].get_available_slots(pair[1]))),
+        "admin.find_doctor_by_id": (None, lambda _: each(
+            sample_doctors, lambda doctor: admin.find_doctor_by_id(doctor.user_id))),
+        "admin.find_patient_by_id": (None, lambda _: each(
+            sample_patients, lambda patient: admin.find_patient_by_id(patient.user_id))),
+        "admin.find_doctor_by_specialization": (None, lambda _: each(
+            specializations, admin.find_doctor_by_specialization)),
+        "admin.view_hospital_data": (None, lambda _: once(admin.view_hospital_data))
+    }
+    for report_type in REPORT_TYPES:
+        benchmarks[f"admin.generate_report[{report_type}]"] = (
+            None, lambda _, report_type=report_type: once(lambda: admin.generate_report(report_type)))
+    benchmarks["admin.generate_report[all]"] = (None, lambda _: once(lambda: admin.generate_report(list(REPORT_TYPES))))
+    benchmarks["auth.login"] = (None, lambda _: each(
+        sample_patients[:100], lambda patient: system.auth_system.login(patient.email, DEFAULT_PASSWORD)))
+    benchmarks["patient.get_dashboard_data"] = (None, lambda _: each(
+        sample_patients, lambda patient: patient.get_dashboard_data()))
+    benchmarks["doctor.get_dashboard_data"] = (None, lambda _: each(
+        sample_doctors[:100], lambda doctor: doctor.get_dashboard_data()))
+    benchmarks["admin.get_dashboard_data"] = (None, lambda _: once(admin.get_dashboard_data))
+
+    results = {name: measure(setup or (lambda: None), run, repeat) for name, (setup, run) in benchmarks.items()}
+    return {"sizes": report.counts, "generate_seconds": round(report.seconds, 2), "benchmarks": results}
+
+def git_commit() -> str:
+    """Short hash of HEAD, marked dirty when tracked files have uncommitted changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=BACKEND_DIR).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+def compare(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD):
+    """Print the change in best time for every benchmark both runs measured"""
+    print(f"\nCOMPARED WITH {baseline.get('commit', '?')}")
+    print(f"{'Scale':<8} {'Benchmark':<46} {'Before µs':>11} {'After µs':>11} {'Change':>8}")
+    regressions = 0
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale, {}).get("benchmarks", {})
+        for name, timing in current["benchmarks"].items():
+            if name not in previous:
+                continue
+            before, after = previous[name]["best_us"], timing["best_us"]
+            ratio = after / before if before else float("inf")
+            flag = "  <-- slower" if ratio > 1 + threshold / 100 else ""
+            regressions += bool(flag)
+            print(f"{scale:<8} {name:<46} {before:>11,.2f} {after:>11,.2f} {ratio:>7.2f}x{flag}")
+    print(f"\n{regressions} benchmark(s) more than {threshold:g}% slower")
+
+def main():
+    from synthetic_data import SCALES
+
+    parser = argparse.ArgumentParser(description="Time model operations on synthetic hospitals of several sizes")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["tiny", "small"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date.today(),
+                        help="the dataset's 'today', YYYY-MM-DD (default: today)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark; best and median are kept")
+    parser.add_argument("--login-iterations", type=int, default=1000, help="PBKDF2 rounds for the login benchmark")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier commit to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="percent slower that --compare reports as a regression")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "anchor": args.anchor.isoformat(),
+        "repeat": args.repeat,
+        "login_iterations": args.login_iterations,
+        "scales": {}
+    }
+
+    print("MODEL BENCHMARK SUITE")
+    print("=" * 50)
+    spawn = multiprocessing.get_context("spawn")
+    for scale in args.scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            outcome = pool.submit(run_scale, scale, args.seed, args.anchor, args.repeat,
+                                  args.login_iterations).result()
+        results["scales"][scale] = outcome
+        sizes = ", ".join(f"{count:,} {name.replace('_', ' ')}" for name, count in outcome["sizes"].items())
+        print(f"\n{scale}: {sizes} (generated in {outcome['generate_seconds']:.1f}s)")
+        print(f"{'Benchmark':<46} {'Ops':>6} {'Best µs':>12} {'Median µs':>12}")
+        for name, timing in outcome["benchmarks"].items():
+            print(f"{name:<46} {timing['ops']:>6} {timing['best_us']:>12,.2f} {timing['median_us']:>12,.2f}")
+
+    output = args.output or os.path.join(BACKEND_DIR, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f), args.threshold)
+
+if __name__ == "__main__":
+    main()
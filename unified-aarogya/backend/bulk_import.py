@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Bulk import of patients and doctors from CSV or NDJSON
+Rows are parsed, validated and have their passwords hashed in a process
+pool; the main process dedupes by email in one pass over a set and
+registers users in batches, without the per-user messages of
+register_user/add_patient. Prints rows/sec when done.
+
+    python bulk_import.py patients.csv --role Patient --workers 8
+    python bulk_import.py staff.ndjson --dry-run
+
+CSV files need a header row. Each row is a Patient or a Doctor, taken
+from its "role" column or from --role:
+
+    Patient: name, email, password, age, gender, phone [, address, blood_type, allergies, user_id]
+    Doctor:  name, email, password, specialization, license_number, years_experience
+             [, consultation_fee, user_id]
+
+Allergies are separated by ";" in CSV, or a list in NDJSON. Passwords
+that are already pbkdf2_sha256 hashes are kept as they are.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.patient import Patient
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.ids import new_id
+from models.user import User
+from passwords import hash_password, is_hashed
+
+REQUIRED = {
+    "Patient": ("name", "email", "password", "age", "gender", "phone"),
+    "Doctor": ("name", "email", "password", "specialization", "license_number", "years_experience")
+}
+ID_PREFIXES = {"Patient": "PAT", "Doctor": "DOC"}
+ROLES = {"patient": "Patient", "doctor": "Doctor"}
+MAX_REPORTED_ERRORS = 100
+
+Row = Tuple[int, object]  # (line number, CSV fields or NDJSON text)
+ParseTask = Tuple[str, List[str], List[Row], Optional[str], int]
+
+# ---- Parsing (runs in the worker processes) ----
+
+def _text(row: Dict, field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+def _allergies(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(allergy).strip() for allergy in value if str(allergy).strip()]
+    return [allergy.strip() for allergy in str(value or "").split(";") if allergy.strip()]
+
+def clean_row(row: Dict, default_role: Optional[str], iterations: int) -> Dict:
+    """Validate one input row and return plain constructor values; raises ValueError"""
+    role = ROLES.get((_text(row, "role") or default_role or "").lower())
+    if role is None:
+        raise ValueError("role must be Patient or Doctor")
+    missing = [field for field in REQUIRED[role] if not _text(row, field)]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    email = _text(row, "email")
+    if "@" not in email or " " in email:
+        raise ValueError(f"invalid email {email!r}")
+
+    password = str(row["password"])
+    record = {
+        "role": role,
+        "user_id": _text(row, "user_id") or None,
+        "name": _text(row, "name"),
+        "email": email,
+        "password": password if is_hashed(password) else hash_password(password, iterations)
+    }
+    if role == "Patient":
+        age = int(_text(row, "age"))
+        if not 0 <= age <= 150:
+            raise ValueError(f"age out of range: {age}")
+        record.update(age=age, gender=_text(row, "gender"), phone=_text(row, "phone"),
+                      address=_text(row, "address"), blood_type=_text(row, "blood_type") or None,
+                      allergies=_allergies(row.get("allergies")))
+    else:
+        years = int(_text(row, "years_experience"))
+        if years < 0:
+            raise ValueError(f"years_experience out of range: {years}")
+        record.update(specialization=_text(row, "specialization"), license_number=_text(row, "license_number"),
+                      years_experience=years, consultation_fee=float(_text(row, "consultation_fee") or 0))
+    return record
+
+def parse_chunk(task: ParseTask) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    """Parse and validate a chunk of rows; returns (records, [(line, error)])"""
+    fmt, header, rows, default_role, iterations = task
+    records, errors = [], []
+    for line, raw in rows:
+        try:
+            row = json.loads(raw) if fmt == "ndjson" else dict(zip(header, raw))
+            if not isinstance(row, dict):
+                raise ValueError("expected a JSON object")
+            records.append(clean_row(row, default_role, iterations))
+        except (ValueError, TypeError) as e:
+            errors.append((line, str(e)))
+    return records, errors
+
+# ---- Reading and dispatch (main process) ----
+
+def read_chunks(path: str, fmt: str, chunk_size: int) -> Iterator[Tuple[List[str], List[Row]]]:
+    """Yield (header, rows) chunks without reading the whole file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+            rows = ((reader.line_num, fields) for fields in reader if fields)
+        else:
+            header = []
+            rows = ((number, text) for number, text in enumerate(f, 1) if text.strip())
+
+        chunk: List[Row] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+
+def _ordered_results(pool: Optional[ProcessPoolExecutor], tasks: Iterable[ParseTask], window: int):
+    """Results of parse_chunk in input order, with at most window chunks in flight"""
+    if pool is None:
+        yield from map(parse_chunk, tasks)
+        return
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(parse_chunk, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+class ImportReport:
+    """Counts from one bulk import"""
+
+    def __init__(self):
+        self.rows = 0
+        self.imported = {"Patient": 0, "Doctor": 0}
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[Tuple[int, str]] = []  # first MAX_REPORTED_ERRORS (line, message)
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.rows:,} rows in {self.seconds:.1f}s ({self.rows_per_second:,.0f} rows/sec): "
+                f"{self.imported['Patient']:,} patients and {self.imported['Doctor']:,} doctors imported, "
+                f"{self.duplicates:,} duplicates, {self.invalid:,} invalid")
+
+class BulkImporter:
+    """Imports patient and doctor files into a HospitalPortalSystem
+
+    on_batch, if given, is called with each batch of newly registered
+    users, e.g. to write them to MongoDB.
+    """
+
+    def __init__(self, system, admin: Optional[HospitalAdmin] = None, workers: Optional[int] = None,
+                 chunk_size: int = 1000, batch_size: int = 5000,
+                 on_batch: Optional[Callable[[List[User]], None]] = None):
+        self.auth_system = system.auth_system
+        self.registry = system.auth_system.users
+        self.admin = admin or self.registry.first_with_role("Hospital Admin")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self._batch_ids = set()
+
+    def import_file(self, path: str, fmt: Optional[str] = None, role: Optional[str] = None) -> ImportReport:
+        """Import every valid, new row of a CSV or NDJSON file"""
+        fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+        iterations = self.auth_system.hasher.iterations
+        tasks = ((fmt, header, rows, role, iterations) for header, rows in read_chunks(path, fmt, self.chunk_size))
+
+        report = ImportReport()
+        seen_emails = set()
+        batch: List[User] = []
+        started = time.perf_counter()
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for records, errors in _ordered_results(pool, tasks, window=2 * self.workers):
+                report.rows += len(records) + len(errors)
+                report.invalid += len(errors)
+                report.errors.extend(errors[:MAX_REPORTED_ERRORS - len(report.errors)])
+                for record in records:
+                    email_key = self.registry.normalize_email(record["email"])
+                    if email_key in seen_emails or self.registry.has_email(email_key):
+                        report.duplicates += 1
+                        continue
+                    seen_emails.add(email_key)
+                    batch.append(self._build(record))
+                    if len(batch) >= self.batch_size:
+                        self._insert(batch, report)
+                        batch = []
+            self._insert(batch, report)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _build(self, record: Dict) -> User:
+        role = record["role"]
+        user_id = record["user_id"]
+        if user_id is None or user_id in self.registry or user_id in self._batch_ids:
+            user_id = new_id(ID_PREFIXES[role])
+        self._batch_ids.add(user_id)
+
+        if role == "Patient":
+            user = Patient(user_id, record["name"], record["email"], record["password"], record["age"],
+                           record["gender"], record["phone"], record["address"])
+            user.blood_type = record["blood_type"]
+            user.allergies = record["allergies"]
+        else:
+            user = Doctor(user_id, record["name"], record["email"], record["password"],
+                          record["specialization"], record["license_number"], record["years_experience"])
+            user.consultation_fee = record["consultation_fee"]
+        return user
+
+    def _insert(self, batch: List[User], report: ImportReport):
+        if not batch:
+            return
+        added = self.auth_system.register_users(batch)
+        if self.admin is not None:
+            self.admin.add_doctors([user for user in added if isinstance(user, Doctor)])
+            self.admin.add_patients([user for user in added if isinstance(user, Patient)])
+        for user in added:
+            report.imported[user.role] += 1
+        report.duplicates += len(batch) - len(added)
+        self._batch_ids.clear()
+        if self.on_batch and added:
+            self.on_batch(added)
+
+def bulk_import(system, path: str, fmt: Optional[str] = None, role: Optional[str] = None,
+                **options) -> ImportReport:
+    """Import a CSV or NDJSON file of patients and doctors; see BulkImporter for options"""
+    return BulkImporter(system, **options).import_file(path, fmt, role)
+
+def main():
+    from dotenv import load_dotenv
+    from portal_system import HospitalPortalSystem
+
+    parser = argparse.ArgumentParser(description="Import patients and doctors from CSV or NDJSON")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--role", choices=["Patient", "Doctor"], help="for rows without a role column")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parsing processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per parsing task")
+    parser.add_argument("--batch-size", type=int, default=5000, help="users registered and saved at a time")
+    parser.add_argument("--dry-run", action="store_true", help="import into memory only, without MongoDB")
+    args = parser.parse_args()
+
+    load_dotenv()
+    system = HospitalPortalSystem()
+    store = None
+    if args.dry_run:
+        system.auth_system.users.add(HospitalAdmin("ADM_IMPORT", "Import Admin", "import@hospital.local", "-", "super"))
+    else:
+        from storage import MongoStore, connect
+        if not os.getenv("MONGO_URI") or not os.getenv("DB_NAME"):
+            parser.error("MONGO_URI and DB_NAME must be set, or use --dry-run")
+        store = MongoStore(connect(os.getenv("MONGO_URI"), os.getenv("DB_NAME")))
+        loaded = store.load_into(system)
+        print(f"Loaded {loaded['patients']:,} patients and {loaded['doctors']:,} doctors")
+        if system.auth_system.users.first_with_role("Hospital Admin") is None:
+            parser.error("no Hospital Admin in the database to manage the imported users")
+
+    importer = BulkImporter(system, workers=args.workers, chunk_size=args.chunk_size, batch_size=args.batch_size,
+                            on_batch=(lambda users: store.save(*users)) if store else None)
+    report = importer.import_file(args.path, args.format, args.role)
+    if store is not None and importer.admin is not None:
+        store.save(importer.admin)
+
+    print(report.summary())
+    for line, message in report.errors:
+        print(f"  line {line}: {message}")
+    if report.invalid > len(report.errors):
+        print(f"  ... and {report.invalid - len(report.errors):,} more invalid rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import csv
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+from serializers import FIELDS, dumper, dumps, encoder
+
+# Rows are written in groups so a streamed response is a few large writes
+# rather than one tiny write per row
+ROWS_PER_CHUNK = 256
+
+class _LineBuffer:
+    """File-like object that hands back what csv.writer writes instead of storing it"""
+
+    def write(self, line: str) -> str:
+        return line
+
+def ndjson_lines(rows: Iterable, model: Optional[type] = None,
+                 fields: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """Encode rows (model objects or dicts) as newline-delimited JSON, a chunk at a time"""
+    encode = dumper({model: fields} if model and fields else None)
+    chunk = []
+    for row in rows:
+        chunk.append(encode(row))
+        if len(chunk) == ROWS_PER_CHUNK:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+def _csv_value(value: Any):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, dict)):
+        return dumps(value).decode()
+    return value
+
+def csv_lines(rows: Iterable, model: Optional[type] = None, fields: Optional[Sequence[str]] = None,
+              columns: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """Encode rows as CSV with a header, a chunk at a time
+
+    Model objects go through their compiled encoder (all allowed fields,
+    or `fields`); dict rows are written under `columns`. Nested values
+    such as allergies become JSON strings.
+    """
+    if model is not None:
+        to_row = encoder(model, fields)
+        columns = tuple(fields) if fields else FIELDS[model]
+    else:
+        to_row = dict
+    writer = csv.writer(_LineBuffer())
+    chunk = [writer.writerow(columns)]
+    for row in rows:
+        values: Dict = to_row(row)
+        chunk.append(writer.writerow([_csv_value(values.get(column)) for column in columns]))
+        if len(chunk) == ROWS_PER_CHUNK:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
@@ -0,0 +1,330 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds of the latency buckets in seconds, and of the response size buckets in bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.0075, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75,
+                   1.0, 2.5, 5.0, 7.5, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED = "<unmatched>"  # endpoint label for requests that matched no route
+ENVIRON_KEY = "aarogya.metrics.endpoint"
+
+class EndpointStats:
+    """Counters for one (method, endpoint): latency and size histograms, status codes, in-flight"""
+    __slots__ = ("latency", "latency_sum", "sizes", "size_sum", "count", "statuses", "in_flight")
+
+    def __init__(self):
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)  # last bucket is +Inf
+        self.latency_sum = 0.0
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.count = 0
+        self.statuses: Dict[str, int] = {}
+        self.in_flight = 0
+
+    def to_document(self) -> Dict:
+        return {"latency": self.latency, "latency_sum": self.latency_sum, "sizes": self.sizes,
+                "size_sum": self.size_sum, "count": self.count, "statuses": self.statuses,
+                "in_flight": self.in_flight}
+
+    def merge(self, doc: Dict, live: bool):
+        """Add another worker's counters; in-flight only counts for workers still running"""
+        self.latency = [a + b for a, b in zip(self.latency, doc["latency"])]
+        self.latency_sum += doc["latency_sum"]
+        self.sizes = [a + b for a, b in zip(self.sizes, doc["sizes"])]
+        self.size_sum += doc["size_sum"]
+        self.count += doc["count"]
+        for status, count in doc["statuses"].items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        if live:
+            self.in_flight += doc["in_flight"]
+
+class RequestMetrics:
+    """Per-endpoint request metrics for one process, shared across workers through files
+
+    Each worker keeps its own counters in memory (one lock, a bisect per
+    histogram and a few additions per request) and, when a directory is
+    configured, rewrites metrics-<pid>.json there every flush_interval
+    seconds. render() merges every worker's file into one Prometheus text
+    exposition. Files of workers that have exited still count towards the
+    totals, so counters never go backwards when gunicorn replaces a
+    worker; only their in-flight gauges are dropped. The directory should
+    be emptied on deploy, e.g. by living under /tmp in the container.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}  # (method, endpoint) -> stats
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # ---- Recording ----
+
+    def _entry(self, method: str, endpoint: str) -> EndpointStats:
+        stats = self._stats.get((method, endpoint))
+        if stats is None:
+            stats = self._stats.setdefault((method, endpoint), EndpointStats())
+        return stats
+
+    def started(self, method: str, endpoint: str):
+        """Count a request as in flight once its route is known"""
+        with self._lock:
+            self._entry(method, endpoint).in_flight += 1
+
+    def finished(self, method: str, endpoint: str, status: str, seconds: float, size: int, in_flight: bool):
+        """Record a completed request; in_flight says whether started() was called for it"""
+        with self._lock:
+            stats = self._entry(method, endpoint)
+            stats.latency[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.latency_sum += seconds
+            stats.sizes[bisect_left(SIZE_BUCKETS, size)] += 1
+            stats.size_sum += size
+            stats.count += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if in_flight:
+                stats.in_flight -= 1
+
+    # ---- Sharing between workers ----
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"pid": os.getpid(),
+                    "endpoints": [[method, endpoint, stats.to_document()]
+                                  for (method, endpoint), stats in self._stats.items()]}
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self):
+        """Write this worker's counters to its file, replacing it atomically"""
+        if not self.directory:
+            return
+        snapshot = self.snapshot()
+        handle, temporary = tempfile.mkstemp(dir=self.directory, prefix=".metrics-", suffix=".tmp")
+        with os.fdopen(handle, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temporary, self._path(snapshot["pid"]))
+
+    def start(self):
+        """Flush from a background thread every flush_interval seconds"""
+        if not self.directory or self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️ Could not write metrics: {e}")
+
+    def _snapshots(self) -> Iterable[Tuple[Dict, bool]]:
+        """(snapshot, worker still running) for every worker, this one read from memory"""
+        yield self.snapshot(), True
+        if not self.directory:
+            return
+        own = os.getpid()
+        for name in os.listdir(self.directory):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            try:
+                pid = int(name[len("metrics-"):-len(".json")])
+                if pid == own:
+                    continue
+                with open(os.path.join(self.directory, name)) as f:
+                    yield json.load(f), _alive(pid)
+            except (ValueError, OSError):  # not ours, or replaced while we read it
+                continue
+
+    def merged(self) -> Tuple[Dict[Tuple[str, str], EndpointStats], int]:
+        """Every worker's counters added together, and the number of live workers"""
+        totals: Dict[Tuple[str, str], EndpointStats] = {}
+        workers = 0
+        for snapshot, live in self._snapshots():
+            workers += live
+            for method, endpoint, doc in snapshot["endpoints"]:
+                totals.setdefault((method, endpoint), EndpointStats()).merge(doc, live)
+        return totals, workers
+
+    # ---- Exposition ----
+
+    def render(self) -> str:
+        """All workers' metrics in the Prometheus text format"""
+        totals, workers = self.merged()
+        rows = sorted(totals.items(), key=lambda item: (item[0][1], item[0][0]))
+        lines = [
+            "# HELP aarogya_http_requests_total Requests handled, by endpoint, method and status code",
+            "# TYPE aarogya_http_requests_total counter"
+        ]
+        for (method, endpoint), stats in rows:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f"aarogya_http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+        lines += [
+            "# HELP aarogya_http_request_duration_seconds Time from receiving a request to sending its last byte",
+            "# TYPE aarogya_http_request_duration_seconds histogram"
+        ]
+        for (method, endpoint), stats in rows:
+            lines += _histogram("aarogya_http_request_duration_seconds", endpoint, method, LATENCY_BUCKETS,
+                                stats.latency, stats.latency_sum, stats.count)
+
+        lines += [
+            "# HELP aarogya_http_request_duration_quantile_seconds Latency quantiles since start, estimated from the histogram",
+            "# TYPE aarogya_http_request_duration_quantile_seconds gauge"
+        ]
+        for (method, endpoint), stats in rows:
+            for quantile in QUANTILES:
+                value = estimate_quantile(LATENCY_BUCKETS, stats.latency, quantile)
+                lines.append(f"aarogya_http_request_duration_quantile_seconds"
+                             f"{_labels(endpoint=endpoint, method=method, quantile=str(quantile))} {value:.6g}")
+
+        lines += [
+            "# HELP aarogya_http_response_size_bytes Response body sizes",
+            "# TYPE aarogya_http_response_size_bytes histogram"
+        ]
+        for (method, endpoint), stats in rows:
+            lines += _histogram("aarogya_http_response_size_bytes", endpoint, method, SIZE_BUCKETS,
+                                stats.sizes, stats.size_sum, stats.count)
+
+        lines += [
+            "# HELP aarogya_http_requests_in_flight Requests being handled right now",
+            "# TYPE aarogya_http_requests_in_flight gauge"
+        ]
+        for (method, endpoint), stats in rows:
+            lines.append(f"aarogya_http_requests_in_flight{_labels(endpoint=endpoint, method=method)} {stats.in_flight}")
+
+        lines += [
+            "# HELP aarogya_metrics_workers Worker processes reporting metrics",
+            "# TYPE aarogya_metrics_workers gauge",
+            f"aarogya_metrics_workers {workers}"
+        ]
+        return "\n".join(lines) + "\n"
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _number(value) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _histogram(name: str, endpoint: str, method: str, bounds: Tuple, counts: List[int],
+               total: float, count: int) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, bucket in zip(bounds + ("+Inf",), counts):
+        cumulative += bucket
+        le = bound if bound == "+Inf" else _number(bound)
+        lines.append(f"{name}_bucket{_labels(endpoint=endpoint, method=method, le=le)} {cumulative}")
+    labels = _labels(endpoint=endpoint, method=method)
+    lines.append(f"{name}_sum{labels} {_number(total)}")
+    lines.append(f"{name}_count{labels} {count}")
+    return lines
+
+def estimate_quantile(bounds: Tuple, counts: List[int], quantile: float) -> float:
+    """Quantile of a bucketed distribution, interpolating linearly inside the bucket it falls in
+
+    Works like Prometheus' histogram_quantile: values in the +Inf bucket
+    are reported as the largest finite bound.
+    """
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = quantile * total
+    cumulative = 0
+    for index, bucket in enumerate(counts):
+        if bucket and cumulative + bucket >= rank:
+            if index == len(bounds):
+                return float(bounds[-1])
+            lower = bounds[index - 1] if index else 0.0
+            return lower + (bounds[index] - lower) * (rank - cumulative) / bucket
+        cumulative += bucket
+    return float(bounds[-1])
+
+class _MeteredBody:
+    """A response body that counts its bytes and records the request when the server closes it"""
+    __slots__ = ("body", "finish", "size")
+
+    def __init__(self, body, finish):
+        self.body = body
+        self.finish = finish
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.body:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            close = getattr(self.body, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.finish(self.size)
+
+class MetricsMiddleware:
+    """WSGI middleware timing every request until its last byte is sent
+
+    The endpoint label is the route rule (e.g. /admin/export/<dataset>.<fmt>),
+    which the app stores in the WSGI environ under ENVIRON_KEY once routing
+    is done; see mark_endpoint. Streamed responses are measured to the end
+    of the stream.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        method = environ.get("REQUEST_METHOD", "GET")
+        status = ["500"]
+
+        def capture(status_line, headers, exc_info=None):
+            status[0] = status_line[:3]
+            return start_response(status_line, headers, exc_info)
+
+        def finish(size: int):
+            endpoint = environ.get(ENVIRON_KEY)
+            self.metrics.finished(method, endpoint or UNMATCHED, status[0],
+                                  time.perf_counter() - started, size, endpoint is not None)
+
+        try:
+            body = self.app(environ, capture)
+        except BaseException:
+            finish(0)
+            raise
+        return _MeteredBody(body, finish)
+
+def mark_endpoint(metrics: RequestMetrics, environ: Dict, method: str, rule: Optional[str]):
+    """Label the current request with its route and count it as in flight"""
+    if rule is not None and ENVIRON_KEY not in environ:
+        environ[ENVIRON_KEY] = rule
+        metrics.started(method, rule)
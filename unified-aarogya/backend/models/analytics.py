@@ -0,0 +1,292 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from .patient import Appointment, Patient
+from .doctor import Doctor
+from .events import WeakObserver
+from .reports import REPORT_TYPES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; HospitalAdmin falls back to ReportEngine
+    np = None
+
+AGE_BINS = [18, 35, 50, 65]  # upper bounds of the report age groups
+AGE_LABELS = ["0-18", "19-35", "36-50", "51-65", "65+"]
+
+def numpy_available() -> bool:
+    return np is not None
+
+class Column:
+    """Growable NumPy array with amortised O(1) appends"""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value) -> int:
+        """Append a value and return its row index"""
+        if self.size == len(self.data):
+            self.data = np.resize(self.data, len(self.data) * 2)
+        self.data[self.size] = value
+        self.size += 1
+        return self.size - 1
+
+    def values(self):
+        """View of the filled part of the column"""
+        return self.data[:self.size]
+
+class Codebook:
+    """Maps labels such as genders or statuses to small integer codes"""
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self.labels: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for label in labels:
+            self.code(label)
+        self.fixed = len(self.labels)  # labels always reported, even with a zero count
+
+    def code(self, label: str) -> int:
+        if label not in self.codes:
+            self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return self.codes[label]
+
+    def counts(self, codes) -> Dict[str, int]:
+        """Turn an array of codes into {label: count} for every known label"""
+        counts = np.bincount(codes, minlength=len(self.labels)) if len(codes) else np.zeros(len(self.labels), dtype=np.int64)
+        return {
+            label: int(count)
+            for code, (label, count) in enumerate(zip(self.labels, counts))
+            if count or code < self.fixed
+        }
+
+class AnalyticsStore:
+    """Columnar mirror of patients, doctors and appointments for vectorised reports
+
+    The store observes the patients and doctors it mirrors (allergies,
+    personal-info updates and "changed" events, e.g. from shared-state
+    sync) and the appointment repository (bookings, status changes and
+    reschedules), so the columns stay current. Requires NumPy.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NumPy is required for the analytics store")
+
+        self.genders = Codebook(["Male", "Female", "Other"])
+        self.statuses = Codebook(["scheduled", "completed", "cancelled"])
+        self.specializations = Codebook()
+
+        # Patient columns
+        self.patient_rows: Dict[str, int] = {}
+        self.patients: List[Patient] = []
+        self.patient_age = Column(np.int16)
+        self.patient_gender = Column(np.int8)
+        self.patient_allergy = Column(np.bool_)
+        self.patient_created_at = Column(np.float64)
+
+        # Doctor columns; a doctor keeps its row after removal with active=False
+        self.doctor_rows: Dict[str, int] = {}
+        self.doctors: List[Optional[Doctor]] = []
+        self.doctor_specialization = Column(np.int32)
+        self.doctor_experience = Column(np.float64)
+        self.doctor_active = Column(np.bool_)
+
+        # Appointment columns
+        self.appointment_rows: Dict[str, int] = {}
+        self.appointment_status = Column(np.int8)
+        self.appointment_date = Column(np.float64)
+        self.appointment_doctor = Column(np.int32)
+
+        # Weak, so mirrored users do not keep the store alive after its admin is gone
+        self._observer = WeakObserver(self.on_model_event)
+
+    # ---- Mirroring ----
+
+    def add_patient(self, patient: Patient):
+        """Mirror a patient and their existing appointments"""
+        if patient.user_id in self.patient_rows:
+            return
+        self.patient_rows[patient.user_id] = self.patient_age.append(int(patient.age))
+        self.patients.append(patient)
+        self.patient_gender.append(self.genders.code(patient.gender))
+        self.patient_allergy.append(bool(patient.allergies))
+        self.patient_created_at.append(patient.created_at.timestamp())
+        for appointment in patient.appointments:
+            self._add_appointment(appointment)
+        patient.subscribe(self._observer)
+
+    def _refresh_patient(self, patient: Patient):
+        """Copy every mirrored field of a patient that changed without saying which fields"""
+        row = self.patient_rows[patient.user_id]
+        self.patient_age.data[row] = int(patient.age)
+        self.patient_gender.data[row] = self.genders.code(patient.gender)
+        self.patient_allergy.data[row] = bool(patient.allergies)
+        self.patient_created_at.data[row] = patient.created_at.timestamp()
+
+    def add_doctor(self, doctor: Doctor):
+        """Mirror a doctor joining the hospital"""
+        row = self._doctor_row(doctor.user_id)
+        self.doctors[row] = doctor
+        self._refresh_doctor(doctor)
+        self.doctor_active.data[row] = True
+        doctor.subscribe(self._observer)
+
+    def _refresh_doctor(self, doctor: Doctor):
+        row = self.doctor_rows[doctor.user_id]
+        self.doctor_specialization.data[row] = self.specializations.code(doctor.specialization)
+        self.doctor_experience.data[row] = doctor.years_experience
+
+    def remove_doctor(self, doctor: Doctor):
+        """Mark a doctor as no longer part of the hospital"""
+        row = self.doctor_rows.get(doctor.user_id)
+        if row is not None:
+            self.doctor_active.data[row] = False
+            doctor.unsubscribe(self._observer)
+
+    def _doctor_row(self, doctor_id: str) -> int:
+        row = self.doctor_rows.get(doctor_id)
+        if row is None:
+            row = self.doctor_rows[doctor_id] = self.doctor_specialization.append(-1)
+            self.doctor_experience.append(0)
+            self.doctor_active.append(False)
+            self.doctors.append(None)
+        return row
+
+    def _add_appointment(self, appointment: Appointment):
+        if appointment.appointment_id in self.appointment_rows:
+            return
+        row = self.appointment_status.append(self.statuses.code(appointment.status))
+        self.appointment_rows[appointment.appointment_id] = row
+        self.appointment_date.append(appointment.date.timestamp())
+        self.appointment_doctor.append(self._doctor_row(appointment.doctor_id))
+
+    def on_model_event(self, source, event: str, **details):
+        """Apply a change reported by a mirrored patient or doctor, or the appointment repository"""
+        if event == "appointment_booked":
+            if details["appointment"].patient_id in self.patient_rows:
+                self._add_appointment(details["appointment"])
+        elif event == "appointment_status_changed":
+            row = self.appointment_rows.get(details["appointment"].appointment_id)
+            if row is not None:
+                self.appointment_status.data[row] = self.statuses.code(details["new_status"])
+        elif event == "appointment_rescheduled":
+            row = self.appointment_rows.get(details["appointment"].appointment_id)
+            if row is not None:
+                self.appointment_date.data[row] = details["new_date"].timestamp()
+        elif event == "changed":
+            if isinstance(source, Patient) and source.user_id in self.patient_rows:
+                self._refresh_patient(source)
+            elif isinstance(source, Doctor) and source.user_id in self.doctor_rows:
+                self._refresh_doctor(source)
+        elif event == "allergy_added":
+            self.patient_allergy.data[self.patient_rows[source.user_id]] = True
+        elif event == "info_updated":
+            row = self.patient_rows[source.user_id]
+            fields = details["fields"]
+            if "age" in fields:
+                self.patient_age.data[row] = int(fields["age"])
+            if "gender" in fields:
+                self.patient_gender.data[row] = self.genders.code(fields["gender"])
+            if "allergies" in fields:
+                self.patient_allergy.data[row] = bool(fields["allergies"])
+
+    # ---- Aggregates ----
+
+    def age_distribution(self) -> Dict[str, int]:
+        buckets = np.searchsorted(AGE_BINS, self.patient_age.values(), side="left")
+        counts = np.bincount(buckets, minlength=len(AGE_LABELS))
+        return {label: int(count) for label, count in zip(AGE_LABELS, counts)}
+
+    def status_counts(self) -> Dict[str, int]:
+        return self.statuses.counts(self.appointment_status.values())
+
+    def completion_rate(self) -> float:
+        total = self.appointment_status.size
+        if not total:
+            return 0
+        completed = int(np.count_nonzero(self.appointment_status.values() == self.statuses.code("completed")))
+        return completed / total * 100
+
+    def department_counts(self) -> Dict[str, int]:
+        """Active doctors per specialization"""
+        specs = self.doctor_specialization.values()[self.doctor_active.values()]
+        return self.specializations.counts(specs)
+
+    def appointments_between(self, start: datetime, end: datetime, status: str = None) -> int:
+        """Count appointments with start <= date < end, optionally by status"""
+        dates = self.appointment_date.values()
+        mask = (dates >= start.timestamp()) & (dates < end.timestamp())
+        if status:
+            mask &= self.appointment_status.values() == self.statuses.code(status)
+        return int(np.count_nonzero(mask))
+
+    def newest_patients(self, count: int) -> List[Patient]:
+        """The most recently created patients, newest first"""
+        created = self.patient_created_at.values()
+        if len(created) > count:
+            rows = np.argpartition(created, -count)[-count:]
+        else:
+            rows = np.arange(len(created))
+        rows = rows[np.argsort(created[rows])[::-1]]
+        return [self.patients[row] for row in rows]
+
+    # ---- Reports ----
+
+    def generate(self, report_types: Iterable[str]) -> Dict[str, Dict]:
+        """Same output as ReportEngine.generate, computed from the columns"""
+        wanted = set(report_types)
+        invalid = wanted.difference(REPORT_TYPES)
+        if invalid:
+            raise ValueError(f"Invalid report type: {', '.join(sorted(invalid))}")
+
+        reports = {}
+        if "patient_summary" in wanted:
+            reports["patient_summary"] = {
+                "total_patients": self.patient_age.size,
+                "age_distribution": self.age_distribution(),
+                "gender_distribution": self.genders.counts(self.patient_gender.values()),
+                "patients_with_allergies": int(np.count_nonzero(self.patient_allergy.values()))
+            }
+        if "appointment_analytics" in wanted:
+            reports["appointment_analytics"] = {
+                "total_appointments": self.appointment_status.size,
+                "appointment_status": self.status_counts(),
+                "completion_rate": self.completion_rate()
+            }
+        if "doctor_performance" in wanted:
+            active = self.doctor_active.values()
+            doctors_by_specialization = self.department_counts()
+            total_doctors = int(np.count_nonzero(active))
+            reports["doctor_performance"] = {
+                "total_doctors": total_doctors,
+                "specializations": list(doctors_by_specialization),
+                "average_experience": float(self.doctor_experience.values()[active].mean()) if total_doctors else 0,
+                "doctors_by_specialization": doctors_by_specialization
+            }
+        if "department_analysis" in wanted:
+            reports["department_analysis"] = {"departments": self._department_analysis()}
+        return reports
+
+    def _department_analysis(self) -> Dict[str, Dict]:
+        # Assigned patients and doctor-side appointments are not mirrored, so
+        # gather them per doctor and let bincount do the grouping
+        active_rows = np.flatnonzero(self.doctor_active.values())
+        specs = self.doctor_specialization.values()[active_rows]
+        patients = np.array([len(self.doctors[row].assigned_patients) for row in active_rows], dtype=np.int64)
+        appointments = np.array([self.doctors[row].count_appointments() for row in active_rows], dtype=np.int64)
+
+        size = len(self.specializations.labels)
+        doctor_counts = np.bincount(specs, minlength=size)
+        patient_counts = np.bincount(specs, weights=patients, minlength=size)
+        appointment_counts = np.bincount(specs, weights=appointments, minlength=size)
+
+        return {
+            label: {
+                "doctors": int(doctor_counts[code]),
+                "patients": int(patient_counts[code]),
+                "appointments": int(appointment_counts[code])
+            }
+            for code, label in enumerate(self.specializations.labels)
+            if doctor_counts[code]
+        }
@@ -0,0 +1,317 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+from .events import Observable, next_version
+from .pagination import Page, decode_cursor, encode_cursor, page_size
+
+if TYPE_CHECKING:
+    from .patient import Appointment
+
+class SortedRows:
+    """Repository rows in ascending order, e.g. those with one status
+
+    Rows are numbered in booking order, so a new appointment's row is an
+    append; only status changes insert or delete in the middle, which is
+    a bisect plus a memmove of the array.
+    """
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = array("q")
+
+    def add(self, row: int):
+        rows = self.rows
+        if not rows or rows[-1] < row:
+            rows.append(row)
+            return
+        position = bisect_left(rows, row)
+        if position == len(rows) or rows[position] != row:
+            rows.insert(position, row)
+
+    def discard(self, row: int):
+        rows = self.rows
+        position = bisect_left(rows, row)
+        if position < len(rows) and rows[position] == row:
+            del rows[position]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+class Timeline:
+    """Repository rows kept sorted by appointment date
+
+    Dates and rows are parallel sequences, so every lookup relative to a
+    moment ("now", the start of today) is a bisect.
+    """
+    __slots__ = ("dates", "rows")
+
+    def __init__(self):
+        self.dates: List[datetime] = []
+        self.rows = array("q")
+
+    def insert(self, date: datetime, row: int):
+        position = bisect_right(self.dates, date)
+        self.dates.insert(position, date)
+        self.rows.insert(position, row)
+
+    def remove(self, date: datetime, row: int):
+        position = bisect_left(self.dates, date)
+        while self.rows[position] != row:
+            position += 1
+        del self.dates[position]
+        del self.rows[position]
+
+    def span(self, start: Optional[datetime], end: Optional[datetime]) -> range:
+        """Positions with start <= date < end; None leaves that side open"""
+        lo = bisect_left(self.dates, start) if start is not None else 0
+        hi = bisect_left(self.dates, end) if end is not None else len(self.dates)
+        return range(lo, max(lo, hi))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+class AppointmentRepository(Observable):
+    """Single owner of every Appointment, with the indexes the models need
+
+    Appointments are indexed by appointment_id, doctor_id and patient_id
+    (each in booking order), by date (kept sorted), by status and by
+    (owner, status) as sorted rows, so a status-filtered page is a bisect
+    and a slice, and by (owner, status) timelines that let dashboards
+    count and find upcoming appointments without scanning history.
+    Patient.appointments and Doctor.appointments are views over
+    this repository, so both sides always see the same objects. Listings
+    page through booking order (row numbers, ascending per owner) from the
+    appointment a cursor names.
+
+    The repository observes every appointment it owns and re-publishes
+    "appointment_booked", "appointment_status_changed" and
+    "appointment_rescheduled" events to its own observers.
+    """
+
+    def __init__(self):
+        self._rows: List["Appointment"] = []  # row -> appointment, append-only
+        self._row_of: Dict[str, int] = {}  # appointment_id -> row
+        self._by_doctor: Dict[str, List["Appointment"]] = {}
+        self._by_patient: Dict[str, List["Appointment"]] = {}
+        self._owner_rows: Dict[str, array] = {}  # doctor/patient ID -> their rows, ascending
+        self._timeline = Timeline()
+        self._status_rows: Dict[str, SortedRows] = {}
+        self._owner_status_rows: Dict[Tuple[str, str], SortedRows] = {}  # (doctor/patient ID, status) -> rows
+        self._owner_timelines: Dict[Tuple[str, str], Timeline] = {}  # (doctor/patient ID, status) -> timeline
+        self._owner_versions: Dict[str, int] = {}  # doctor/patient ID -> version of their appointments
+        self._observers = ()
+        self.version = next_version()
+
+    # ---- Writes ----
+
+    def add(self, appointment: "Appointment") -> bool:
+        """Take ownership of an appointment; fails if its ID is already used"""
+        if appointment.appointment_id in self._row_of:
+            return False
+
+        row = len(self._rows)
+        self._rows.append(appointment)
+        self._row_of[appointment.appointment_id] = row
+        self._by_doctor.setdefault(appointment.doctor_id, []).append(appointment)
+        self._by_patient.setdefault(appointment.patient_id, []).append(appointment)
+        for owner_id in (appointment.doctor_id, appointment.patient_id):
+            self._owner_rows.setdefault(owner_id, array("q")).append(row)
+        self._timeline.insert(appointment.date, row)
+        for rows in self._status_rows_of(appointment, appointment.status):
+            rows.add(row)
+        for timeline in self._timelines_of(appointment, appointment.status):
+            timeline.insert(appointment.date, row)
+        self._touch(appointment)
+
+        appointment.subscribe(self)
+        self._notify("appointment_booked", appointment=appointment)
+        return True
+
+    def on_model_event(self, source: "Appointment", event: str, **details):
+        """Keep the date and status indexes in step with an appointment"""
+        row = self._row_of.get(source.appointment_id)
+        if row is None or self._rows[row] is not source:
+            return
+
+        if event == "status_changed":
+            for rows in self._status_rows_of(source, details["old_status"]):
+                rows.discard(row)
+            for rows in self._status_rows_of(source, details["new_status"]):
+                rows.add(row)
+            for timeline in self._timelines_of(source, details["old_status"]):
+                timeline.remove(source.date, row)
+            for timeline in self._timelines_of(source, details["new_status"]):
+                timeline.insert(source.date, row)
+        elif event == "rescheduled":
+            self._timeline.remove(details["old_date"], row)
+            self._timeline.insert(details["new_date"], row)
+            for timeline in self._timelines_of(source, source.status):
+                timeline.remove(details["old_date"], row)
+                timeline.insert(details["new_date"], row)
+        self._touch(source)
+        self._notify(f"appointment_{event}", appointment=source, **details)
+
+    def _touch(self, appointment: "Appointment"):
+        version = next_version()
+        self._owner_versions[appointment.doctor_id] = version
+        self._owner_versions[appointment.patient_id] = version
+
+    def _status_rows_of(self, appointment: "Appointment", status: str) -> Tuple[SortedRows, SortedRows, SortedRows]:
+        """The repository-wide, doctor and patient row sets for a status"""
+        sets = [self._status_rows.get(status)]
+        if sets[0] is None:
+            sets[0] = self._status_rows[status] = SortedRows()
+        for owner_id in (appointment.doctor_id, appointment.patient_id):
+            rows = self._owner_status_rows.get((owner_id, status))
+            if rows is None:
+                rows = self._owner_status_rows[(owner_id, status)] = SortedRows()
+            sets.append(rows)
+        return tuple(sets)
+
+    def _timelines_of(self, appointment: "Appointment", status: str) -> Tuple[Timeline, Timeline]:
+        timelines = []
+        for owner_id in (appointment.doctor_id, appointment.patient_id):
+            timeline = self._owner_timelines.get((owner_id, status))
+            if timeline is None:
+                timeline = self._owner_timelines[(owner_id, status)] = Timeline()
+            timelines.append(timeline)
+        return tuple(timelines)
+
+    # ---- Reads ----
+
+    def get(self, appointment_id: str) -> Optional["Appointment"]:
+        """Find an appointment by ID"""
+        row = self._row_of.get(appointment_id)
+        return self._rows[row] if row is not None else None
+
+    def __contains__(self, appointment_id: str) -> bool:
+        return appointment_id in self._row_of
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def for_patient(self, patient_id: str) -> List["Appointment"]:
+        """A patient's appointments in booking order"""
+        return list(self._by_patient.get(patient_id, ()))
+
+    def for_doctor(self, doctor_id: str) -> List["Appointment"]:
+        """A doctor's appointments in booking order"""
+        return list(self._by_doctor.get(doctor_id, ()))
+
+    def count_for_patient(self, patient_id: str) -> int:
+        return len(self._by_patient.get(patient_id, ()))
+
+    def count_for_doctor(self, doctor_id: str) -> int:
+        return len(self._by_doctor.get(doctor_id, ()))
+
+    def version_of(self, owner_id: str) -> int:
+        """Changes whenever an appointment of this doctor or patient changes"""
+        return self._owner_versions.get(owner_id, 0)
+
+    def between(self, start: datetime, end: datetime) -> Iterator["Appointment"]:
+        """Yield appointments with start <= date < end in date order"""
+        for position in self._timeline.span(start, end):
+            yield self._rows[self._timeline.rows[position]]
+
+    def scan(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             chunk: int = 500) -> Iterator["Appointment"]:
+        """Like between(), but safe to consume slowly while appointments change
+
+        Rows are read chunk at a time and the scan resumes after the last
+        date it yielded, skipping rows already seen on that date, so a
+        long export never holds the whole range and bookings made
+        meanwhile do not shift it onto rows it has already yielded.
+        """
+        timeline = self._timeline
+        floor: Optional[datetime] = start
+        seen_at_floor = set()
+        while True:
+            batch: List[Tuple[datetime, int]] = []
+            for position in timeline.span(floor, end):
+                row = timeline.rows[position]
+                if row not in seen_at_floor:
+                    batch.append((timeline.dates[position], row))
+                    if len(batch) == chunk:
+                        break
+            if not batch:
+                return
+            for _, row in batch:
+                yield self._rows[row]
+            last_date = batch[-1][0]
+            if last_date != floor:
+                floor, seen_at_floor = last_date, set()
+            seen_at_floor.update(row for date, row in batch if date == last_date)
+
+    def count_for_owner(self, owner_id: str, status: str, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> int:
+        """Count a doctor's or patient's appointments with a status and start <= date < end"""
+        timeline = self._owner_timelines.get((owner_id, status))
+        return len(timeline.span(start, end)) if timeline else 0
+
+    def next_for_owner(self, owner_id: str, status: str, start: datetime,
+                       end: Optional[datetime] = None) -> Optional["Appointment"]:
+        """Earliest appointment of a doctor or patient with a status and start <= date < end"""
+        timeline = self._owner_timelines.get((owner_id, status))
+        if timeline:
+            positions = timeline.span(start, end)
+            if positions:
+                return self._rows[timeline.rows[positions[0]]]
+        return None
+
+    def dates_for_owner(self, owner_id: str, status: str, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> Iterator[datetime]:
+        """Yield the dates of a doctor's or patient's appointments with a status and start <= date < end, in order"""
+        timeline = self._owner_timelines.get((owner_id, status))
+        if timeline:
+            for position in timeline.span(start, end):
+                yield timeline.dates[position]
+
+    def with_status(self, status: str) -> Iterator["Appointment"]:
+        """Yield appointments with a status in booking order"""
+        for row in self._status_rows.get(status, ()):
+            yield self._rows[row]
+
+    def page(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+             status: Optional[str] = None) -> Page["Appointment"]:
+        """One page of appointments in booking order, resuming from a cursor"""
+        if status is not None:
+            rows = self._status_rows.get(status)
+            return self._page(rows.rows if rows else (), cursor, limit)
+        return self._page(range(len(self._rows)), cursor, limit)
+
+    def page_for_owner(self, owner_id: str, cursor: Optional[str] = None, limit: Optional[int] = None,
+                       status: Optional[str] = None) -> Page["Appointment"]:
+        """Like page(), over one doctor's or patient's appointments"""
+        if status is not None:
+            rows = self._owner_status_rows.get((owner_id, status))
+            return self._page(rows.rows if rows else (), cursor, limit)
+        return self._page(self._owner_rows.get(owner_id, ()), cursor, limit)
+
+    def _page(self, rows: Sequence[int], cursor: Optional[str], limit: Optional[int]) -> Page["Appointment"]:
+        """Up to limit appointments from ascending rows, after the row of the cursor's appointment; O(limit)"""
+        # Cursors name the last appointment seen rather than a row, as rows differ between workers
+        after = decode_cursor("appointments", cursor)
+        limit = page_size(limit)
+        position = 0
+        if after is not None:
+            row = self._row_of.get(after)
+            if row is None:
+                raise ValueError("Invalid cursor")
+            position = bisect_right(rows, row)
+
+        end = min(position + limit, len(rows))
+        page = [self._rows[rows[index]] for index in range(position, end)]
+        more = end < len(rows)  # only when another row follows this page
+        return Page(page, encode_cursor("appointments", page[-1].appointment_id) if more else None)
+
+    def count_status(self, status: str) -> int:
+        rows = self._status_rows.get(status)
+        return len(rows) if rows else 0
+
+# Repository of users that are not in a UserRegistry yet; registering a
+# user switches it to the registry's own repository
+appointment_repository = AppointmentRepository()
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+
+class ResultCache:
+    """LRU cache for computed model results, validated against entity versions
+
+    Each entry remembers the version of the object it was computed from and
+    is treated as a miss once that version moves on, so mutating model
+    methods invalidate their own results without touching the cache. Entries
+    also expire after ttl seconds because dashboards depend on the clock.
+    Cached results are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (version, expires_at, value)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, version: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key at version, computing it on a miss"""
+        if not self.enabled:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# Shared by all model instances in this process
+result_cache = ResultCache()
+
+def cached_result(method):
+    """Cache a model method's result until the object's version changes
+
+    The object must expose user_id and cache_version() (see User).
+    Versions are unique per process, so an entry can never match a
+    different object that happens to share the user ID.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (type(self).__name__, self.user_id, method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:  # unhashable arguments, e.g. a list of report types
+            return method(self, *args, **kwargs)
+        return result_cache.get_or_compute(key, self.cache_version(), lambda: method(self, *args, **kwargs))
+    return wrapper
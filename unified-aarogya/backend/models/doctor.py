@@ -1,52 +1,112 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from .user import User
 from .patient import Appointment, MedicalRecord
+from .slots import SlotCalendar, iter_minutes, minute_to_time, time_to_minute
+from .cache import cached_result
+from .ids import new_id
+from .appointment_repository import AppointmentRepository, appointment_repository
+from .pagination import Page
 
 class Schedule:
+    __slots__ = ("calendar",)
+    
     def __init__(self):
-        self.time_slots = {}  # date -> list of time slots
-        self.booked_slots = {}  # date -> list of booked times
+        self.calendar = SlotCalendar()  # date -> bitset of offered/booked slots
     
     def add_availability(self, date: datetime, start_time: str, end_time: str, slot_duration: int = 30):
         """Add available time slots for a specific date"""
-        date_key = date.date()
-        if date_key not in self.time_slots:
-            self.time_slots[date_key] = []
-            self.booked_slots[date_key] = []
-        
-        # Generate time slots
-        start_hour, start_min = map(int, start_time.split(':'))
-        end_hour, end_min = map(int, end_time.split(':'))
-        
-        current_time = datetime.combine(date_key, datetime.min.time().replace(hour=start_hour, minute=start_min))
-        end_time_obj = datetime.combine(date_key, datetime.min.time().replace(hour=end_hour, minute=end_min))
+        start_minute = time_to_minute(start_time)
+        end_minute = time_to_minute(end_time)
+        if start_minute is None or end_minute is None:
+            raise ValueError(f"Invalid time range {start_time}-{end_time}")
         
-        while current_time < end_time_obj:
-            self.time_slots[date_key].append(current_time.strftime('%H:%M'))
-            current_time += timedelta(minutes=slot_duration)
+        day = self.calendar.day(date.date(), create=True)
+        day.offer(start_minute, end_minute, slot_duration)
+    
+    @staticmethod
+    def _slot_minute(time: str) -> Optional[int]:
+        """Minute of day for a slot time, which must be written exactly as the schedule lists it ('HH:MM')"""
+        minute = time_to_minute(time)
+        if minute is None or minute_to_time(minute) != time:
+            return None
+        return minute
     
     def book_slot(self, date: datetime, time: str) -> bool:
         """Book a time slot"""
-        date_key = date.date()
-        if date_key in self.time_slots and time in self.time_slots[date_key]:
-            if date_key not in self.booked_slots:
-                self.booked_slots[date_key] = []
-            if time not in self.booked_slots[date_key]:
-                self.booked_slots[date_key].append(time)
-                return True
-        return False
+        day = self.calendar.day(date.date())
+        minute = self._slot_minute(time)
+        if day is None or minute is None:
+            return False
+        return day.book(minute)
+    
+    def release_slot(self, date: datetime, time: str) -> bool:
+        """Release a booked time slot"""
+        day = self.calendar.day(date.date())
+        minute = self._slot_minute(time)
+        if day is None or minute is None:
+            return False
+        return day.release(minute)
     
     def get_available_slots(self, date: datetime) -> List[str]:
         """Get available time slots for a date"""
-        date_key = date.date()
-        if date_key not in self.time_slots:
+        day = self.calendar.day(date.date())
+        if day is None:
             return []
-        
-        booked = self.booked_slots.get(date_key, [])
-        return [slot for slot in self.time_slots[date_key] if slot not in booked]
+        return [minute_to_time(minute) for minute in iter_minutes(day.free)]
+    
+    def get_booked_slots(self, date: datetime) -> List[str]:
+        """Get booked time slots for a date"""
+        day = self.calendar.day(date.date())
+        if day is None:
+            return []
+        return [minute_to_time(minute) for minute in iter_minutes(day.booked)]
+    
+    def count_available_slots(self, date: datetime) -> int:
+        """Count available time slots for a date"""
+        day = self.calendar.day(date.date())
+        return day.free_count() if day else 0
+    
+    def get_available_slots_between(self, start_date: datetime, end_date: datetime) -> Dict:
+        """Get available time slots for every scheduled day in a date range"""
+        return {
+            date_key: [minute_to_time(minute) for minute in iter_minutes(day.free)]
+            for date_key, day in self.calendar.days_between(start_date.date(), end_date.date())
+        }
+    
+    def count_available_slots_between(self, start_date: datetime, end_date: datetime) -> int:
+        """Count available time slots across a date range"""
+        return self.calendar.free_count_between(start_date.date(), end_date.date())
+    
+    def iter_free_slots(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Yield the start time of each free slot in [start, end) in chronological order"""
+        start_minute = start.hour * 60 + start.minute + (1 if start.second or start.microsecond else 0)
+        for date_key, minute in self.calendar.iter_free(start.date(), start_minute, end.date()):
+            slot = datetime.combine(date_key, datetime.min.time().replace(hour=minute // 60, minute=minute % 60))
+            if slot >= end:
+                return
+            yield slot
+    
+    @property
+    def time_slots(self) -> Dict:
+        """All offered time slots keyed by date"""
+        return {
+            date_key: [minute_to_time(minute) for minute in iter_minutes(day.offered)]
+            for date_key, day in self.calendar.days.items()
+        }
+    
+    @property
+    def booked_slots(self) -> Dict:
+        """All booked time slots keyed by date"""
+        return {
+            date_key: [minute_to_time(minute) for minute in iter_minutes(day.booked)]
+            for date_key, day in self.calendar.days.items()
+        }
 
 class Doctor(User):
+    __slots__ = ("specialization", "license_number", "years_experience", "schedule", "assigned_patients",
+                 "repository", "consultation_fee", "rating", "reviews", "qualifications", "hospital_id")
+    
     def __init__(self, user_id: str, name: str, email: str, password: str,
                  specialization: str, license_number: str, years_experience: int):
         super().__init__(user_id, name, email, password, "Doctor")
@@ -55,13 +115,21 @@ class Doctor(User):
         self.years_experience = years_experience
         self.schedule = Schedule()
         self.assigned_patients: List[str] = []  # List of patient IDs
-        self.appointments: List[Appointment] = []
+        self.repository: AppointmentRepository = appointment_repository
         self.consultation_fee = 0.0
         self.rating = 0.0
         self.reviews = []
         self.qualifications = []
         self.hospital_id = None
     
+    @property
+    def appointments(self) -> List[Appointment]:
+        """This doctor's appointments in booking order"""
+        return self.repository.for_doctor(self.user_id)
+    
+    def count_appointments(self) -> int:
+        return self.repository.count_for_doctor(self.user_id)
+    
     def add_qualification(self, qualification: str, institution: str, year: int):
         """Add a qualification to doctor's profile"""
         self.qualifications.append({
@@ -69,10 +137,12 @@ class Doctor(User):
             'institution': institution,
             'year': year
         })
+        self._notify("qualification_added")
     
     def set_availability(self, date: datetime, start_time: str, end_time: str):
         """Set availability for a specific date"""
         self.schedule.add_availability(date, start_time, end_time)
+        self._notify("availability_changed", date=date)
     
     def view_schedule(self, date: datetime = None) -> Dict:
         """View schedule for a specific date or all dates"""
@@ -81,7 +151,7 @@ class Doctor(User):
             return {
                 date_key: {
                     'available_slots': self.schedule.get_available_slots(date),
-                    'booked_slots': self.schedule.booked_slots.get(date_key, [])
+                    'booked_slots': self.schedule.get_booked_slots(date)
                 }
             }
         return {
@@ -93,16 +163,18 @@ class Doctor(User):
         """Assign a patient to this doctor"""
         if patient_id not in self.assigned_patients:
             self.assigned_patients.append(patient_id)
+            self._notify("patient_assigned", patient_id=patient_id)
     
     def remove_patient(self, patient_id: str):
         """Remove a patient from doctor's list"""
         if patient_id in self.assigned_patients:
             self.assigned_patients.remove(patient_id)
+            self._notify("patient_removed", patient_id=patient_id)
     
     def add_diagnosis(self, patient_id: str, diagnosis: str, treatment: str, 
                      medications: List[Dict] = None) -> str:
         """Add diagnosis and create medical record"""
-        record_id = f"MR_{datetime.now().strftime('%Y%m%d')}_{len(self.assigned_patients):03d}"
+        record_id = new_id(f"MR_{datetime.now().strftime('%Y%m%d')}_")
         record = MedicalRecord(record_id, patient_id, self.user_id, diagnosis, treatment, datetime.now())
         
         if medications:
@@ -113,9 +185,9 @@ class Doctor(User):
     
     def manage_appointment(self, appointment_id: str, action: str, **kwargs) -> bool:
         """Manage appointment (complete, cancel, reschedule)"""
-        appointment = next((apt for apt in self.appointments if apt.appointment_id == appointment_id), None)
+        appointment = self.repository.get(appointment_id)
         
-        if not appointment:
+        if not appointment or appointment.doctor_id != self.user_id:
             return False
         
         if action == "complete":
@@ -130,7 +202,7 @@ class Doctor(User):
         elif action == "reschedule":
             new_date = kwargs.get('new_date')
             if new_date:
-                appointment.date = new_date
+                appointment.reschedule(new_date)
                 return True
         
         return False
@@ -143,21 +215,35 @@ class Doctor(User):
     
     def add_appointment(self, appointment: Appointment):
         """Add an appointment to doctor's schedule"""
-        self.appointments.append(appointment)
+        if appointment.appointment_id not in self.repository:
+            self.repository.add(appointment)
         # Book the time slot
         self.schedule.book_slot(appointment.date, appointment.date.strftime('%H:%M'))
     
+    def iter_free_slots(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Yield free slots in [start, end) in time order, skipping those an appointment already holds
+
+        Bookings made through Patient.book_appointment only reach the
+        repository, not the schedule, so scheduled appointments are merged
+        in here; like add_appointment, one holds the slot starting at its
+        hour and minute.
+        """
+        booked = (date.replace(second=0, microsecond=0)
+                  for date in self.repository.dates_for_owner(self.user_id, "scheduled", start, end))
+        taken = next(booked, None)
+        for slot in self.schedule.iter_free_slots(start, end):
+            while taken is not None and taken < slot:
+                taken = next(booked, None)
+            if taken != slot:
+                yield slot
+    
+    @cached_result
     def get_dashboard_data(self) -> Dict:
         """Return doctor dashboard data"""
-        today = datetime.now().date()
-        today_appointments = [apt for apt in self.appointments 
-                            if apt.date.date() == today and apt.status == "scheduled"]
-        
-        pending_appointments = [apt for apt in self.appointments 
-                              if apt.status == "scheduled" and apt.date > datetime.now()]
-        
-        completed_today = [apt for apt in self.appointments 
-                         if apt.date.date() == today and apt.status == "completed"]
+        now = datetime.now()
+        today = datetime.combine(now.date(), datetime.min.time())
+        tomorrow = today + timedelta(days=1)
+        repository = self.repository
         
         return {
             "user_info": {
@@ -166,13 +252,21 @@ class Doctor(User):
                 "experience": f"{self.years_experience} years",
                 "rating": self.rating
             },
-            "today_appointments": len(today_appointments),
-            "pending_appointments": len(pending_appointments),
-            "completed_today": len(completed_today),
+            "today_appointments": repository.count_for_owner(self.user_id, "scheduled", today, tomorrow),
+            "pending_appointments": repository.count_for_owner(self.user_id, "scheduled", now),
+            "completed_today": repository.count_for_owner(self.user_id, "completed", today, tomorrow),
             "total_patients": len(self.assigned_patients),
-            "next_appointment": today_appointments[0] if today_appointments else None,
+            "next_appointment": repository.next_for_owner(self.user_id, "scheduled", now, tomorrow),
             "consultation_fee": self.consultation_fee
         }
     
+    def page_appointments(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                          status: Optional[str] = None) -> Page[Appointment]:
+        """One page of this doctor's appointments in booking order; pass next_cursor back for more"""
+        return self.repository.page_for_owner(self.user_id, cursor, limit, status)
+    
+    def cache_version(self):
+        return self.version, self.repository.version_of(self.user_id)
+    
     def __str__(self):
         return f"Dr. {self.name} - {self.specialization} (ID: {self.user_id})"
@@ -0,0 +1,58 @@
+import weakref
+from itertools import count
+
+_versions = count(1)
+
+def next_version() -> int:
+    """Return a version number never handed out before in this process"""
+    return next(_versions)
+
+class Observable:
+    """Mixin for model objects that tell observers about their own mutations
+
+    Observers implement on_model_event(source, event, **details). Every
+    notification also gives the object a fresh version, which result caches
+    use to detect stale entries. Subclasses must set self._observers = ()
+    and self.version in __init__; objects whose results are cached must start
+    from next_version(). Observers are kept in a tuple so objects that are
+    never observed share the empty tuple.
+    """
+    __slots__ = ()
+
+    def subscribe(self, observer):
+        """Start notifying an observer about changes to this object"""
+        if observer not in self._observers:
+            self._observers += (observer,)
+
+    def unsubscribe(self, observer):
+        """Stop notifying an observer"""
+        self._observers = tuple(o for o in self._observers if o is not observer)
+
+    def touch(self):
+        """Record a change made by assigning attributes directly"""
+        self._notify("changed")
+
+    def _notify(self, event: str, **details):
+        """Give the object a new version and send an event to every observer"""
+        self.version = next_version()
+        for observer in self._observers:
+            observer.on_model_event(self, event, **details)
+
+class WeakObserver:
+    """Forwards events to a bound on_model_event-style method without keeping its object alive
+
+    Long-lived observables such as the appointment repository would
+    otherwise hold on to every object that ever subscribed. Once the
+    method's object is gone, the next event unsubscribes this forwarder.
+    """
+    __slots__ = ("_method",)
+
+    def __init__(self, method):
+        self._method = weakref.WeakMethod(method)
+
+    def on_model_event(self, source, event: str, **details):
+        method = self._method()
+        if method is None:
+            source.unsubscribe(self)
+        else:
+            method(source, event, **details)
@@ -1,34 +1,120 @@
-from datetime import datetime
-from typing import List, Dict, Optional
+import heapq
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterator, List, Dict, Optional, Union
 from .user import User
-from .patient import Patient
+from .patient import Patient, Appointment
 from .doctor import Doctor
+from .reports import ReportEngine
+from .analytics import AnalyticsStore, numpy_available
+from .cache import cached_result
+from .events import WeakObserver
+from .appointment_repository import AppointmentRepository, appointment_repository
+from .pagination import Page, SortedIndex, decode_cursor, encode_cursor, page_size
 
 class HospitalStats:
+    """Running hospital counters, kept current by model events instead of recounting"""
+    
+    NEW_PATIENT_WINDOW = timedelta(days=8)  # "this week" means (now - created_at).days <= 7
+    
     def __init__(self):
         self.total_patients = 0
         self.total_doctors = 0
         self.total_appointments = 0
-        self.departments = {}
+        self.departments = {}  # specialization -> doctor count
+        self.appointment_status = {"scheduled": 0, "completed": 0, "cancelled": 0}
+        self.daily_appointments = {}  # date -> {status: count}
         self.monthly_revenue = 0.0
         self.bed_occupancy = 0
         self.total_beds = 0
+        self._recent_registrations: List[datetime] = []  # sorted created_at values inside the window
+        self._patient_ids = set()  # patients whose appointments are counted
     
     def update_stats(self, patients: List[Patient], doctors: List[Doctor]):
-        """Update hospital statistics"""
-        self.total_patients = len(patients)
-        self.total_doctors = len(doctors)
-        
-        # Count appointments
-        self.total_appointments = sum(len(patient.appointments) for patient in patients)
-        
-        # Count doctors by department/specialization
+        """Rebuild all counters from scratch"""
+        self.total_patients = 0
+        self.total_doctors = 0
+        self.total_appointments = 0
         self.departments = {}
+        self.appointment_status = {"scheduled": 0, "completed": 0, "cancelled": 0}
+        self.daily_appointments = {}
+        self._recent_registrations = []
+        self._patient_ids = set()
+        
         for doctor in doctors:
-            spec = doctor.specialization
-            if spec not in self.departments:
-                self.departments[spec] = 0
-            self.departments[spec] += 1
+            self.on_doctor_added(doctor)
+        for patient in patients:
+            self._count_patient(patient)
+    
+    def on_doctor_added(self, doctor: Doctor):
+        """Count a doctor joining the hospital"""
+        self.total_doctors += 1
+        spec = doctor.specialization
+        self.departments[spec] = self.departments.get(spec, 0) + 1
+    
+    def on_doctor_removed(self, doctor: Doctor):
+        """Count a doctor leaving the hospital"""
+        self.total_doctors -= 1
+        spec = doctor.specialization
+        self.departments[spec] = self.departments.get(spec, 0) - 1
+        if self.departments[spec] <= 0:
+            del self.departments[spec]
+    
+    def on_doctor_specialization_changed(self, old: str, new: str):
+        """Move a doctor between department counts"""
+        self.departments[old] = self.departments.get(old, 0) - 1
+        if self.departments[old] <= 0:
+            del self.departments[old]
+        self.departments[new] = self.departments.get(new, 0) + 1
+    
+    def on_patient_added(self, patient: Patient):
+        """Count a newly registered patient and their existing appointments"""
+        self._count_patient(patient)
+    
+    def _count_patient(self, patient: Patient):
+        self._patient_ids.add(patient.user_id)
+        self.total_patients += 1
+        if datetime.now() - patient.created_at < self.NEW_PATIENT_WINDOW:
+            insort(self._recent_registrations, patient.created_at)
+        for appointment in patient.appointments:
+            self._count_appointment(appointment.date, appointment.status, 1)
+    
+    def on_model_event(self, source, event: str, **details):
+        """Apply an appointment change reported by the appointment repository"""
+        appointment = details.get("appointment")
+        if appointment is None or appointment.patient_id not in self._patient_ids:
+            return
+        
+        if event == "appointment_booked":
+            self._count_appointment(appointment.date, appointment.status, 1)
+        elif event == "appointment_status_changed":
+            self._count_appointment(appointment.date, details["old_status"], -1, total=False)
+            self._count_appointment(appointment.date, details["new_status"], 1, total=False)
+        elif event == "appointment_rescheduled":
+            self._count_appointment(details["old_date"], appointment.status, -1, total=False)
+            self._count_appointment(details["new_date"], appointment.status, 1, total=False)
+    
+    def _count_appointment(self, date: datetime, status: str, delta: int, total: bool = True):
+        if total:
+            self.total_appointments += delta
+        self.appointment_status[status] = self.appointment_status.get(status, 0) + delta
+        day = self.daily_appointments.setdefault(date.date(), {})
+        day[status] = day.get(status, 0) + delta
+    
+    def appointments_on(self, date: datetime, status: str = None) -> int:
+        """Number of appointments on a date, optionally with a given status"""
+        day = self.daily_appointments.get(date.date(), {})
+        return day.get(status, 0) if status else sum(day.values())
+    
+    def new_patients_this_week(self) -> int:
+        """Number of patients registered within the last week"""
+        cutoff = datetime.now() - self.NEW_PATIENT_WINDOW
+        expired = bisect_right(self._recent_registrations, cutoff)
+        if expired:
+            # Time only moves forward, so expired registrations never count again
+            del self._recent_registrations[:expired]
+        return len(self._recent_registrations)
 
 class HospitalAdmin(User):
     def __init__(self, user_id: str, name: str, email: str, password: str, 
@@ -37,10 +123,31 @@ class HospitalAdmin(User):
         self.admin_level = admin_level  # junior, senior, super
         self.managed_doctors: List[Doctor] = []
         self.managed_patients: List[Patient] = []
+        self._doctor_index: SortedIndex[Doctor] = SortedIndex()  # by user ID, for lookups and paging
+        self._patient_index: SortedIndex[Patient] = SortedIndex()
+        self._doctors_by_specialization: Dict[str, Dict[str, Doctor]] = {}  # lowercased specialization -> {doctor_id: doctor}
+        self._filed_specializations: Dict[str, str] = {}  # doctor_id -> specialization the doctor is filed under
+        self.repository: AppointmentRepository = appointment_repository
         self.hospital_stats = HospitalStats()
+        self.analytics: Optional[AnalyticsStore] = None  # columnar mirror, see enable_analytics()
+        # Weak, so the repository and managed users do not keep a dropped admin alive
+        self._observer = WeakObserver(self.on_model_event)  # subscribed to every managed doctor and patient
+        self._repository_observers = [WeakObserver(self.hospital_stats.on_model_event),
+                                      WeakObserver(self._on_appointment_event)]
+        for observer in self._repository_observers:
+            self.repository.subscribe(observer)
         self.permissions = self._set_permissions()
         self.departments_managed = []
     
+    def use_repository(self, repository: AppointmentRepository):
+        """Move the admin's stats and analytics subscriptions to another repository"""
+        if repository is self.repository:
+            return
+        for observer in self._repository_observers:
+            self.repository.unsubscribe(observer)
+            repository.subscribe(observer)
+        self.repository = repository
+    
     def _set_permissions(self) -> Dict[str, bool]:
         """Set permissions based on admin level"""
         base_permissions = {
@@ -77,9 +184,12 @@ class HospitalAdmin(User):
             print("Access denied: Insufficient permissions to add doctors")
             return False
         
-        if doctor not in self.managed_doctors:
-            self.managed_doctors.append(doctor)
-            doctor.hospital_id = "HOSP_001"  # Placeholder hospital ID
+        if doctor.user_id not in self._doctor_index:
+            self._attach_doctor(doctor)
+            self.hospital_stats.on_doctor_added(doctor)
+            if self.analytics:
+                self.analytics.add_doctor(doctor)
+            self._notify("doctor_added", doctor=doctor)
             print(f"Doctor {doctor.name} added successfully")
             return True
         return False
@@ -92,19 +202,169 @@ class HospitalAdmin(User):
         
         doctor = self.find_doctor_by_id(doctor_id)
         if doctor:
-            self.managed_doctors.remove(doctor)
+            self._detach_doctor(doctor)
+            self.hospital_stats.on_doctor_removed(doctor)
+            if self.analytics:
+                self.analytics.remove_doctor(doctor)
+            self._notify("doctor_removed", doctor=doctor)
             print(f"Doctor {doctor.name} removed successfully")
             return True
         return False
     
     def add_patient(self, patient: Patient) -> bool:
         """Register a new patient"""
-        if patient not in self.managed_patients:
-            self.managed_patients.append(patient)
+        if patient.user_id not in self._patient_index:
+            self._attach_patient(patient)
+            self.hospital_stats.on_patient_added(patient)
+            if self.analytics:
+                self.analytics.add_patient(patient)
+            self._notify("patient_added", patient=patient)
             print(f"Patient {patient.name} registered successfully")
             return True
         return False
     
+    def add_doctors(self, doctors: List[Doctor]) -> int:
+        """Add many doctors quietly, e.g. from a bulk import; returns how many were new"""
+        if not self.permissions.get("add_doctor", False):
+            print("Access denied: Insufficient permissions to add doctors")
+            return 0
+        
+        added, seen = [], set()
+        for doctor in doctors:
+            if doctor.user_id not in self._doctor_index and doctor.user_id not in seen:
+                seen.add(doctor.user_id)
+                added.append(doctor)
+        self._attach_doctors(added)
+        for doctor in added:
+            self.hospital_stats.on_doctor_added(doctor)
+            if self.analytics:
+                self.analytics.add_doctor(doctor)
+        if added:
+            self._notify("doctors_added", doctors=added)
+        return len(added)
+    
+    def add_patients(self, patients: List[Patient]) -> int:
+        """Register many patients quietly, e.g. from a bulk import; returns how many were new"""
+        added, seen = [], set()
+        for patient in patients:
+            if patient.user_id not in self._patient_index and patient.user_id not in seen:
+                seen.add(patient.user_id)
+                added.append(patient)
+        self._attach_patients(added)
+        for patient in added:
+            self.hospital_stats.on_patient_added(patient)
+            if self.analytics:
+                self.analytics.add_patient(patient)
+        if added:
+            self._notify("patients_added", patients=added)
+        return len(added)
+    
+    def restore(self, doctors: List[Doctor], patients: List[Patient]):
+        """Make the managed doctors and patients match lists loaded from storage
+        
+        Doctors missing from the list are detached; patients are only ever
+        added, as nothing removes them. Skips permission checks and per-user
+        messages, and rebuilds the stats once at the end.
+        """
+        keep = {doctor.user_id for doctor in doctors}
+        for doctor in [doctor for doctor in self.managed_doctors if doctor.user_id not in keep]:
+            self._detach_doctor(doctor)
+            if self.analytics:
+                self.analytics.remove_doctor(doctor)
+        for doctor in doctors:
+            if doctor.user_id not in self._doctor_index:
+                self._attach_doctor(doctor)
+                if self.analytics:
+                    self.analytics.add_doctor(doctor)
+        for patient in patients:
+            if patient.user_id not in self._patient_index:
+                self._attach_patient(patient)
+                if self.analytics:
+                    self.analytics.add_patient(patient)
+        self.hospital_stats.update_stats(self.managed_patients, self.managed_doctors)
+        self.touch()
+    
+    def _attach_doctor(self, doctor: Doctor):
+        self.managed_doctors.append(doctor)
+        self._doctor_index.add(doctor.user_id, doctor)
+        self._file_doctor(doctor)
+        doctor.hospital_id = "HOSP_001"  # Placeholder hospital ID
+        doctor.subscribe(self._observer)
+    
+    def _detach_doctor(self, doctor: Doctor):
+        self.managed_doctors.remove(doctor)
+        self._doctor_index.remove(doctor.user_id)
+        self._unfile_doctor(doctor.user_id)
+        doctor.unsubscribe(self._observer)
+    
+    def _file_doctor(self, doctor: Doctor):
+        self._doctors_by_specialization.setdefault(doctor.specialization.lower(), {})[doctor.user_id] = doctor
+        self._filed_specializations[doctor.user_id] = doctor.specialization
+    
+    def _unfile_doctor(self, doctor_id: str) -> Optional[str]:
+        """Take a doctor out of the specialization index; returns the specialization they were filed under"""
+        specialization = self._filed_specializations.pop(doctor_id, None)
+        if specialization is not None:
+            bucket = self._doctors_by_specialization.get(specialization.lower(), {})
+            bucket.pop(doctor_id, None)
+            if not bucket:
+                self._doctors_by_specialization.pop(specialization.lower(), None)
+        return specialization
+    
+    def _attach_patient(self, patient: Patient):
+        self.managed_patients.append(patient)
+        self._patient_index.add(patient.user_id, patient)
+        patient.subscribe(self._observer)
+    
+    def _attach_doctors(self, doctors: List[Doctor]):
+        self.managed_doctors.extend(doctors)
+        self._doctor_index.add_many((doctor.user_id, doctor) for doctor in doctors)
+        for doctor in doctors:
+            self._file_doctor(doctor)
+            doctor.hospital_id = "HOSP_001"  # Placeholder hospital ID
+            doctor.subscribe(self._observer)
+    
+    def _attach_patients(self, patients: List[Patient]):
+        self.managed_patients.extend(patients)
+        self._patient_index.add_many((patient.user_id, patient) for patient in patients)
+        for patient in patients:
+            patient.subscribe(self._observer)
+    
+    def enable_analytics(self) -> bool:
+        """Mirror managed patients, doctors and appointments into NumPy columns for reporting"""
+        if not numpy_available():
+            print("NumPy is not installed; reports will use the pure-Python engine")
+            return False
+        
+        if not self.analytics:
+            self.analytics = AnalyticsStore()
+            for doctor in self.managed_doctors:
+                self.analytics.add_doctor(doctor)
+            for patient in self.managed_patients:
+                self.analytics.add_patient(patient)
+            observer = WeakObserver(self.analytics.on_model_event)
+            self._repository_observers.append(observer)
+            self.repository.subscribe(observer)
+        return True
+    
+    def on_model_event(self, source: User, event: str, **details):
+        """A managed doctor or patient changed, so our cached views are stale"""
+        if isinstance(source, Doctor):
+            filed = self._filed_specializations.get(source.user_id)
+            if filed is not None and filed != source.specialization:
+                # Set directly, e.g. by shared-state sync, so re-file the doctor
+                self._unfile_doctor(source.user_id)
+                self._file_doctor(source)
+                self.hospital_stats.on_doctor_specialization_changed(filed, source.specialization)
+        self._notify("managed_entity_changed", entity=source, change=event)
+    
+    def _on_appointment_event(self, source: AppointmentRepository, event: str, **details):
+        """An appointment changed; only those of our own patients or doctors make our views stale"""
+        appointment = details.get("appointment")
+        if appointment is not None and (appointment.patient_id in self._patient_index
+                                        or appointment.doctor_id in self._doctor_index):
+            self._notify("managed_entity_changed", entity=appointment, change=event)
+    
     def assign_doctor_to_patient(self, patient_id: str, doctor_id: str) -> bool:
         """Assign a doctor to a patient"""
         if not self.permissions.get("assign_patients", False):
@@ -122,157 +382,175 @@ class HospitalAdmin(User):
     
     def find_doctor_by_id(self, doctor_id: str) -> Optional[Doctor]:
         """Find a doctor by their ID"""
-        return next((doc for doc in self.managed_doctors if doc.user_id == doctor_id), None)
+        return self._doctor_index.get(doctor_id)
     
     def find_patient_by_id(self, patient_id: str) -> Optional[Patient]:
         """Find a patient by their ID"""
-        return next((pat for pat in self.managed_patients if pat.user_id == patient_id), None)
+        return self._patient_index.get(patient_id)
+    
+    def page_doctors(self, cursor: Optional[str] = None, limit: Optional[int] = None) -> Page[Doctor]:
+        """One page of managed doctors ordered by ID; pass next_cursor back for more"""
+        doctors, last = self._doctor_index.page(decode_cursor("doctors", cursor), page_size(limit))
+        return Page(doctors, encode_cursor("doctors", last) if last is not None else None)
+    
+    def page_patients(self, cursor: Optional[str] = None, limit: Optional[int] = None) -> Page[Patient]:
+        """One page of managed patients ordered by ID; pass next_cursor back for more"""
+        patients, last = self._patient_index.page(decode_cursor("patients", cursor), page_size(limit))
+        return Page(patients, encode_cursor("patients", last) if last is not None else None)
+    
+    def page_appointments(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                          status: Optional[str] = None) -> Page[Appointment]:
+        """One page of all appointments in booking order; pass next_cursor back for more"""
+        return self.repository.page(cursor, limit, status)
+    
+    # ---- Exports ----
+    # Generators for auditors' exports: they walk the indexes a chunk at a
+    # time, so memory stays flat however many rows are written.
+    
+    EXPORT_CHUNK = 500
+    
+    def export_appointments(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            status: Optional[str] = None) -> Iterator[Appointment]:
+        """Yield appointments with start <= date < end in date order, optionally with one status"""
+        for appointment in self.repository.scan(start, end, self.EXPORT_CHUNK):
+            if status is None or appointment.status == status:
+                yield appointment
+    
+    def export_patients(self, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> Iterator[Patient]:
+        """Yield managed patients by ID, optionally only those registered with start <= created_at < end"""
+        after = None
+        while True:
+            patients, after = self._patient_index.page(after, self.EXPORT_CHUNK)
+            for patient in patients:
+                if (start is None or patient.created_at >= start) and (end is None or patient.created_at < end):
+                    yield patient
+            if after is None:
+                return
+    
+    def export_doctor_utilization(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                  status: Optional[str] = None) -> Iterator[Dict]:
+        """Yield the doctor utilization report one doctor at a time
+
+        Appointments are counted over start <= date < end and, if given,
+        one status, straight from the per-doctor timelines.
+        """
+        statuses = [status] if status else list(self.hospital_stats.appointment_status)
+        after = None
+        while True:
+            doctors, after = self._doctor_index.page(after, self.EXPORT_CHUNK)
+            for doctor in doctors:
+                if start is None and end is None and status is None:
+                    appointments = doctor.count_appointments()
+                else:
+                    appointments = sum(self.repository.count_for_owner(doctor.user_id, s, start, end)
+                                       for s in statuses)
+                yield {
+                    "doctor_id": doctor.user_id,
+                    "name": doctor.name,
+                    "specialization": doctor.specialization,
+                    "total_patients": len(doctor.assigned_patients),
+                    "appointments": appointments
+                }
+            if after is None:
+                return
     
     def find_doctor_by_specialization(self, specialization: str) -> List[Doctor]:
         """Find doctors by specialization"""
-        return [doc for doc in self.managed_doctors if doc.specialization.lower() == specialization.lower()]
+        return list(self._doctors_by_specialization.get(specialization.lower(), {}).values())
+    
+    def find_earliest_available_slots(self, specialization: str, limit: int = 10, days: int = 14,
+                                      start: datetime = None) -> List[Dict]:
+        """Find the earliest free slots across all doctors of a specialization"""
+        start = start or datetime.now()
+        end = start + timedelta(days=days)
+        
+        # Each doctor's free slots are already in time order, so a k-way merge
+        # only has to pull as many slots as we return
+        streams = [
+            self._tagged_free_slots(doctor, start, end)
+            for doctor in self.find_doctor_by_specialization(specialization)
+        ]
+        
+        return [
+            {
+                "doctor_id": doctor_id,
+                "doctor_name": doctor.name,
+                "date": slot.strftime('%Y-%m-%d'),
+                "time": slot.strftime('%H:%M'),
+                "consultation_fee": doctor.consultation_fee
+            }
+            for slot, doctor_id, doctor in islice(heapq.merge(*streams), limit)
+        ]
+    
+    @staticmethod
+    def _tagged_free_slots(doctor: Doctor, start: datetime, end: datetime):
+        """Yield (slot, doctor_id, doctor) for a doctor's free slots in time order"""
+        for slot in doctor.iter_free_slots(start, end):
+            yield slot, doctor.user_id, doctor
     
+    @cached_result
     def view_hospital_data(self) -> Dict:
         """View comprehensive hospital data"""
         if not self.permissions.get("view_reports", False):
             print("Access denied: Insufficient permissions to view hospital data")
             return {}
         
-        self.hospital_stats.update_stats(self.managed_patients, self.managed_doctors)
-        
-        # Calculate appointment statistics
-        total_appointments = sum(len(patient.appointments) for patient in self.managed_patients)
-        completed_appointments = sum(
-            len([apt for apt in patient.appointments if apt.status == "completed"]) 
-            for patient in self.managed_patients
-        )
+        stats = self.hospital_stats
         
         # Doctor utilization
         doctor_utilization = {}
         for doctor in self.managed_doctors:
             doctor_utilization[doctor.name] = {
                 "total_patients": len(doctor.assigned_patients),
-                "appointments": len(doctor.appointments),
+                "appointments": doctor.count_appointments(),
                 "specialization": doctor.specialization
             }
         
         return {
             "hospital_stats": {
-                "total_patients": len(self.managed_patients),
-                "total_doctors": len(self.managed_doctors),
-                "total_appointments": total_appointments,
-                "completed_appointments": completed_appointments,
-                "departments": self.hospital_stats.departments
+                "total_patients": stats.total_patients,
+                "total_doctors": stats.total_doctors,
+                "total_appointments": stats.total_appointments,
+                "completed_appointments": stats.appointment_status.get("completed", 0),
+                "departments": dict(stats.departments)
             },
             "doctor_utilization": doctor_utilization,
             "recent_registrations": [
                 {"name": p.name, "date": p.created_at.strftime('%Y-%m-%d')} 
-                for p in sorted(self.managed_patients, key=lambda x: x.created_at, reverse=True)[:5]
+                for p in self._newest_patients(5)
             ]
         }
     
-    def generate_report(self, report_type: str, **kwargs) -> Dict:
-        """Generate various types of reports"""
+    def _newest_patients(self, count: int) -> List[Patient]:
+        """Most recently registered patients, newest first"""
+        if self.analytics:
+            return self.analytics.newest_patients(count)
+        return heapq.nlargest(count, self.managed_patients, key=lambda x: x.created_at)
+    
+    @cached_result
+    def generate_report(self, report_type: Union[str, List[str]], **kwargs) -> Dict:
+        """Generate one report, or several at once when given a list of report types"""
         if not self.permissions.get("view_reports", False):
             print("Access denied: Insufficient permissions to generate reports")
             return {}
         
-        reports = {
-            "patient_summary": self._generate_patient_report,
-            "doctor_performance": self._generate_doctor_report,
-            "appointment_analytics": self._generate_appointment_report,
-            "department_analysis": self._generate_department_report
-        }
-        
-        if report_type in reports:
-            return reports[report_type](**kwargs)
-        return {"error": "Invalid report type"}
-    
-    def _generate_patient_report(self, **kwargs) -> Dict:
-        """Generate patient summary report"""
-        age_groups = {"0-18": 0, "19-35": 0, "36-50": 0, "51-65": 0, "65+": 0}
-        gender_distribution = {"Male": 0, "Female": 0, "Other": 0}
-        
-        for patient in self.managed_patients:
-            # Age grouping
-            if patient.age <= 18:
-                age_groups["0-18"] += 1
-            elif patient.age <= 35:
-                age_groups["19-35"] += 1
-            elif patient.age <= 50:
-                age_groups["36-50"] += 1
-            elif patient.age <= 65:
-                age_groups["51-65"] += 1
-            else:
-                age_groups["65+"] += 1
-            
-            # Gender distribution
-            gender_distribution[patient.gender] = gender_distribution.get(patient.gender, 0) + 1
-        
-        return {
-            "total_patients": len(self.managed_patients),
-            "age_distribution": age_groups,
-            "gender_distribution": gender_distribution,
-            "patients_with_allergies": len([p for p in self.managed_patients if p.allergies])
-        }
-    
-    def _generate_doctor_report(self, **kwargs) -> Dict:
-        """Generate doctor performance report"""
-        return {
-            "total_doctors": len(self.managed_doctors),
-            "specializations": list(set(doc.specialization for doc in self.managed_doctors)),
-            "average_experience": sum(doc.years_experience for doc in self.managed_doctors) / len(self.managed_doctors) if self.managed_doctors else 0,
-            "doctors_by_specialization": {
-                spec: len([doc for doc in self.managed_doctors if doc.specialization == spec])
-                for spec in set(doc.specialization for doc in self.managed_doctors)
-            }
-        }
-    
-    def _generate_appointment_report(self, **kwargs) -> Dict:
-        """Generate appointment analytics report"""
-        all_appointments = []
-        for patient in self.managed_patients:
-            all_appointments.extend(patient.appointments)
-        
-        status_count = {"scheduled": 0, "completed": 0, "cancelled": 0}
-        for apt in all_appointments:
-            status_count[apt.status] = status_count.get(apt.status, 0) + 1
-        
-        return {
-            "total_appointments": len(all_appointments),
-            "appointment_status": status_count,
-            "completion_rate": (status_count["completed"] / len(all_appointments) * 100) if all_appointments else 0
-        }
-    
-    def _generate_department_report(self, **kwargs) -> Dict:
-        """Generate department analysis report"""
-        departments = {}
-        for doctor in self.managed_doctors:
-            dept = doctor.specialization
-            if dept not in departments:
-                departments[dept] = {
-                    "doctors": 0,
-                    "patients": 0,
-                    "appointments": 0
-                }
-            
-            departments[dept]["doctors"] += 1
-            departments[dept]["patients"] += len(doctor.assigned_patients)
-            departments[dept]["appointments"] += len(doctor.appointments)
+        report_types = [report_type] if isinstance(report_type, str) else list(report_type)
+        try:
+            engine = self.analytics or ReportEngine(self.managed_patients, self.managed_doctors)
+            reports = engine.generate(report_types)
+        except ValueError:
+            return {"error": "Invalid report type"}
         
-        return {"departments": departments}
+        if isinstance(report_type, str):
+            return reports[report_type]
+        return reports
     
+    @cached_result
     def get_dashboard_data(self) -> Dict:
         """Return admin dashboard data"""
-        self.hospital_stats.update_stats(self.managed_patients, self.managed_doctors)
-        
-        today = datetime.now().date()
-        today_appointments = []
-        for patient in self.managed_patients:
-            today_appointments.extend([
-                apt for apt in patient.appointments 
-                if apt.date.date() == today
-            ])
+        stats = self.hospital_stats
+        now = datetime.now()
         
         return {
             "user_info": {
@@ -281,15 +559,14 @@ class HospitalAdmin(User):
                 "departments_managed": len(self.departments_managed)
             },
             "hospital_overview": {
-                "total_patients": len(self.managed_patients),
-                "total_doctors": len(self.managed_doctors),
-                "today_appointments": len(today_appointments),
-                "departments": len(set(doc.specialization for doc in self.managed_doctors))
+                "total_patients": stats.total_patients,
+                "total_doctors": stats.total_doctors,
+                "today_appointments": stats.appointments_on(now),
+                "departments": len(stats.departments)
             },
             "recent_activity": {
-                "new_patients_this_week": len([p for p in self.managed_patients 
-                                             if (datetime.now() - p.created_at).days <= 7]),
-                "appointments_today": len([apt for apt in today_appointments if apt.status == "scheduled"])
+                "new_patients_this_week": stats.new_patients_this_week(),
+                "appointments_today": stats.appointments_on(now, "scheduled")
             }
         }
     
@@ -0,0 +1,10 @@
+import uuid
+
+# Every new user, appointment and medical record ID comes from here. IDs
+# are random (uuid4) rather than counted from the number of objects a
+# worker knows about, so two workers, or a worker and a bulk import, never
+# hand out the same ID for different objects.
+
+def new_id(prefix: str) -> str:
+    """Return a fresh ID such as PAT3f0c9a...; unique across workers and restarts"""
+    return f"{prefix}{uuid.uuid4().hex}"
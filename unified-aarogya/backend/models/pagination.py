@@ -0,0 +1,94 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class Page(Generic[T]):
+    """One page of results and the cursor for the next one (None on the last page)"""
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: List[T], next_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+def encode_cursor(kind: str, key) -> str:
+    """Opaque cursor for resuming a listing of `kind` after `key`"""
+    raw = json.dumps([kind, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(kind: str, cursor: Optional[str]):
+    """The key inside a cursor from encode_cursor, or None for the first page"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, key = json.loads(raw)
+    except (ValueError, TypeError):  # bad base64 or JSON, or not a [kind, key] pair
+        raise ValueError("Invalid cursor")
+    if cursor_kind != kind or not isinstance(key, str):
+        raise ValueError("Invalid cursor")
+    return key
+
+def page_size(limit: Optional[int]) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    return DEFAULT_PAGE_SIZE if limit is None else min(max(int(limit), 1), MAX_PAGE_SIZE)
+
+class SortedIndex(Generic[T]):
+    """Objects kept in order of a unique key, for keyset pagination
+
+    Keys live in a sorted list next to a key -> object dict, so a page
+    starting after any key is one bisect plus a slice of the page size,
+    however deep into the listing it is.
+    """
+    __slots__ = ("keys", "items")
+
+    def __init__(self):
+        self.keys: List[Hashable] = []
+        self.items: Dict[Hashable, T] = {}
+
+    def add(self, key, obj: T):
+        if key not in self.items:
+            self.keys.insert(bisect_left(self.keys, key), key)
+        self.items[key] = obj
+
+    def add_many(self, pairs: Iterable[Tuple[Hashable, T]]):
+        """Add many (key, object) pairs with one sort instead of one list insert each"""
+        new_keys = []
+        for key, obj in pairs:
+            if key not in self.items:
+                new_keys.append(key)
+            self.items[key] = obj
+        if new_keys:
+            self.keys.extend(new_keys)
+            self.keys.sort()  # timsort merges the existing sorted run with the new keys
+
+    def remove(self, key):
+        if self.items.pop(key, None) is not None:
+            del self.keys[bisect_left(self.keys, key)]
+
+    def get(self, key) -> Optional[T]:
+        return self.items.get(key)
+
+    def page(self, after, limit: int) -> Tuple[List[T], Optional[Hashable]]:
+        """Up to limit objects with keys after `after`, and the last key if more follow"""
+        start = bisect_right(self.keys, after) if after is not None else 0
+        keys = self.keys[start:start + limit]
+        more = start + limit < len(self.keys)
+        return [self.items[key] for key in keys], (keys[-1] if keys and more else None)
+
+    def __contains__(self, key) -> bool:
+        return key in self.items
+
+    def __len__(self) -> int:
+        return len(self.keys)
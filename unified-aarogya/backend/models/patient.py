@@ -1,8 +1,19 @@
+import time
+from collections.abc import Mapping
 from datetime import datetime
+from types import MappingProxyType
 from typing import List, Dict, Optional
+from .events import Observable
+from .ids import new_id
+from .cache import cached_result
+from .appointment_repository import AppointmentRepository, appointment_repository
+from .pagination import Page
 from .user import User
 
-class Appointment:
+class Appointment(Observable):
+    __slots__ = ("appointment_id", "patient_id", "doctor_id", "date", "reason", "status",
+                 "diagnosis", "prescription", "notes", "_observers", "version")
+    
     def __init__(self, appointment_id: str, patient_id: str, doctor_id: str, 
                  date: datetime, reason: str, status: str = "scheduled"):
         self.appointment_id = appointment_id
@@ -14,22 +25,92 @@ class Appointment:
         self.diagnosis = None
         self.prescription = None
         self.notes = None
+        self._observers = ()
+        self.version = 0  # appointment results are never cached directly
     
     def complete_appointment(self, diagnosis: str, prescription: str = None, notes: str = None):
         """Mark appointment as completed with medical details"""
+        old_status = self.status
         self.status = "completed"
         self.diagnosis = diagnosis
         self.prescription = prescription
         self.notes = notes
+        self._notify("status_changed", old_status=old_status, new_status=self.status)
     
     def cancel_appointment(self):
         """Cancel the appointment"""
+        old_status = self.status
         self.status = "cancelled"
+        self._notify("status_changed", old_status=old_status, new_status=self.status)
+    
+    def reschedule(self, new_date: datetime):
+        """Move the appointment to a new date and time"""
+        old_date = self.date
+        self.date = new_date
+        self._notify("rescheduled", old_date=old_date, new_date=new_date)
     
     def __str__(self):
         return f"Appointment {self.appointment_id}: {self.date.strftime('%Y-%m-%d %H:%M')} - {self.status}"
 
+class RecordEntry(Mapping):
+    """Read-only, slotted replacement for the per-entry dicts on a MedicalRecord
+
+    Entries still support entry['field'], .get(), .items() and dict(entry).
+    The timestamp is kept as an epoch float and turned back into a datetime
+    on access.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+class Medication(RecordEntry):
+    __slots__ = ("medication", "dosage", "duration", "_prescribed_at")
+    FIELDS = ("medication", "dosage", "duration", "prescribed_date")
+    
+    def __init__(self, medication: str, dosage: str, duration: str, prescribed_at: float):
+        self.medication = medication
+        self.dosage = dosage
+        self.duration = duration
+        self._prescribed_at = prescribed_at
+    
+    @property
+    def prescribed_date(self) -> datetime:
+        return datetime.fromtimestamp(self._prescribed_at)
+
+class LabResult(RecordEntry):
+    __slots__ = ("result", "normal_range", "_tested_at")
+    FIELDS = ("result", "normal_range", "test_date")
+    
+    def __init__(self, result: str, normal_range: Optional[str], tested_at: float):
+        self.result = result
+        self.normal_range = normal_range
+        self._tested_at = tested_at
+    
+    @property
+    def test_date(self) -> datetime:
+        return datetime.fromtimestamp(self._tested_at)
+
+# Shared placeholders so records without medications or lab results allocate nothing
+NO_MEDICATIONS = ()
+NO_LAB_RESULTS = MappingProxyType({})
+
 class MedicalRecord:
+    __slots__ = ("record_id", "patient_id", "doctor_id", "diagnosis", "treatment", "date",
+                 "medications", "lab_results")
+    
     def __init__(self, record_id: str, patient_id: str, doctor_id: str, 
                  diagnosis: str, treatment: str, date: datetime):
         self.record_id = record_id
@@ -38,30 +119,28 @@ class MedicalRecord:
         self.diagnosis = diagnosis
         self.treatment = treatment
         self.date = date
-        self.medications = []
-        self.lab_results = {}
+        self.medications = NO_MEDICATIONS
+        self.lab_results = NO_LAB_RESULTS
     
     def add_medication(self, medication: str, dosage: str, duration: str):
         """Add medication to the record"""
-        self.medications.append({
-            'medication': medication,
-            'dosage': dosage,
-            'duration': duration,
-            'prescribed_date': datetime.now()
-        })
+        if self.medications is NO_MEDICATIONS:
+            self.medications = []
+        self.medications.append(Medication(medication, dosage, duration, time.time()))
     
     def add_lab_result(self, test_name: str, result: str, normal_range: str = None):
         """Add lab test result"""
-        self.lab_results[test_name] = {
-            'result': result,
-            'normal_range': normal_range,
-            'test_date': datetime.now()
-        }
+        if self.lab_results is NO_LAB_RESULTS:
+            self.lab_results = {}
+        self.lab_results[test_name] = LabResult(result, normal_range, time.time())
     
     def __str__(self):
         return f"Medical Record {self.record_id}: {self.diagnosis} on {self.date.strftime('%Y-%m-%d')}"
 
 class Patient(User):
+    __slots__ = ("age", "gender", "phone", "address", "medical_history", "repository",
+                 "emergency_contact", "insurance_info", "blood_type", "allergies")
+    
     def __init__(self, user_id: str, name: str, email: str, password: str, 
                  age: int, gender: str, phone: str, address: str):
         super().__init__(user_id, name, email, password, "Patient")
@@ -70,17 +149,25 @@ class Patient(User):
         self.phone = phone
         self.address = address
         self.medical_history: List[MedicalRecord] = []
-        self.appointments: List[Appointment] = []
+        self.repository: AppointmentRepository = appointment_repository
         self.emergency_contact = None
         self.insurance_info = None
         self.blood_type = None
         self.allergies = []
     
+    @property
+    def appointments(self) -> List[Appointment]:
+        """This patient's appointments in booking order"""
+        return self.repository.for_patient(self.user_id)
+    
+    def count_appointments(self) -> int:
+        return self.repository.count_for_patient(self.user_id)
+    
     def book_appointment(self, doctor_id: str, date: datetime, reason: str) -> str:
         """Book an appointment with a doctor"""
-        appointment_id = f"APT_{len(self.appointments) + 1:04d}_{self.user_id}"
+        appointment_id = new_id("APT_")
         appointment = Appointment(appointment_id, self.user_id, doctor_id, date, reason)
-        self.appointments.append(appointment)
+        self.repository.add(appointment)
         return appointment_id
     
     def view_appointments(self, status: str = None) -> List[Appointment]:
@@ -96,22 +183,28 @@ class Patient(User):
     def add_medical_record(self, record: MedicalRecord):
         """Add a medical record to patient's history"""
         self.medical_history.append(record)
+        self._notify("medical_record_added", record=record)
     
     def update_personal_info(self, **kwargs):
         """Update personal information"""
+        changed = {}
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
+                changed[key] = value
+        if changed:
+            self._notify("info_updated", fields=changed)
     
     def add_allergy(self, allergy: str):
         """Add an allergy to patient's record"""
         if allergy not in self.allergies:
             self.allergies.append(allergy)
+            self._notify("allergy_added", allergy=allergy)
     
+    @cached_result
     def get_dashboard_data(self) -> Dict:
         """Return patient dashboard data"""
-        upcoming_appointments = [apt for apt in self.appointments 
-                               if apt.status == "scheduled" and apt.date > datetime.now()]
+        now = datetime.now()
         recent_records = sorted(self.medical_history, key=lambda x: x.date, reverse=True)[:5]
         
         return {
@@ -121,12 +214,20 @@ class Patient(User):
                 "blood_type": self.blood_type,
                 "allergies": self.allergies
             },
-            "upcoming_appointments": len(upcoming_appointments),
-            "total_appointments": len(self.appointments),
+            "upcoming_appointments": self.repository.count_for_owner(self.user_id, "scheduled", now),
+            "total_appointments": self.count_appointments(),
             "medical_records_count": len(self.medical_history),
             "recent_records": [str(record) for record in recent_records],
-            "next_appointment": upcoming_appointments[0] if upcoming_appointments else None
+            "next_appointment": self.repository.next_for_owner(self.user_id, "scheduled", now)
         }
     
+    def page_appointments(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                          status: Optional[str] = None) -> Page[Appointment]:
+        """One page of this patient's appointments in booking order; pass next_cursor back for more"""
+        return self.repository.page_for_owner(self.user_id, cursor, limit, status)
+    
+    def cache_version(self):
+        return self.version, self.repository.version_of(self.user_id)
+    
     def __str__(self):
         return f"Patient: {self.name} (Age: {self.age}, ID: {self.user_id})"
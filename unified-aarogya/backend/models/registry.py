@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from .appointment_repository import AppointmentRepository
+from .events import Observable, next_version
+from .user import User
+
+class UserRegistry(Observable):
+    """In-memory user store indexed by user ID, email and role
+
+    Observers are told about "user_added", "users_added" (bulk imports)
+    and "user_removed". Every user added is switched to the registry's
+    appointment repository, so each system keeps its own appointments.
+    """
+
+    def __init__(self, repository: Optional[AppointmentRepository] = None):
+        self.repository = repository if repository is not None else AppointmentRepository()
+        self._by_id: Dict[str, User] = {}  # user_id -> user object
+        self._by_email: Dict[str, User] = {}  # case-folded email -> user object
+        self._by_role: Dict[str, Dict[str, User]] = {}  # role -> {user_id: user object}
+        self._observers = ()
+        self.version = next_version()
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """Return the lookup key used for an email address"""
+        return email.strip().casefold() if email else ""
+
+    def add(self, user: User) -> bool:
+        """Index a user; fails if the ID or email is already taken"""
+        email_key = self.normalize_email(user.email)
+        if user.user_id in self._by_id or email_key in self._by_email:
+            return False
+
+        self._by_id[user.user_id] = user
+        self._by_email[email_key] = user
+        self._by_role.setdefault(user.role, {})[user.user_id] = user
+        user.use_repository(self.repository)
+        self._notify("user_added", user=user)
+        return True
+
+    def add_many(self, users: Iterable[User]) -> List[User]:
+        """Index many users with one "users_added" event; users whose ID or email is taken are skipped"""
+        added = []
+        for user in users:
+            email_key = self.normalize_email(user.email)
+            if user.user_id in self._by_id or email_key in self._by_email:
+                continue
+            self._by_id[user.user_id] = user
+            self._by_email[email_key] = user
+            self._by_role.setdefault(user.role, {})[user.user_id] = user
+            user.use_repository(self.repository)
+            added.append(user)
+        if added:
+            self._notify("users_added", users=added)
+        return added
+
+    def change_email(self, user: User, email: str) -> bool:
+        """Give an indexed user a new email; fails if another user has it"""
+        email_key = self.normalize_email(email)
+        holder = self._by_email.get(email_key)
+        if holder is not None and holder is not user:
+            return False
+
+        self._by_email.pop(self.normalize_email(user.email), None)
+        user.email = email
+        self._by_email[email_key] = user
+        return True
+
+    def remove(self, user_id: str) -> Optional[User]:
+        """Remove a user from every index"""
+        user = self._by_id.pop(user_id, None)
+        if user:
+            self._by_email.pop(self.normalize_email(user.email), None)
+            self._by_role.get(user.role, {}).pop(user_id, None)
+            self._notify("user_removed", user=user)
+        return user
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Find a user by their ID"""
+        return self._by_id.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """Find a user by email, ignoring case and surrounding whitespace"""
+        return self._by_email.get(self.normalize_email(email))
+
+    def has_email(self, email: str) -> bool:
+        """Check whether an email is already registered"""
+        return self.normalize_email(email) in self._by_email
+
+    def by_role(self, role: str) -> List[User]:
+        """Return all users with the given role"""
+        return list(self._by_role.get(role, {}).values())
+
+    def first_with_role(self, role: str) -> Optional[User]:
+        """Return the earliest registered user with the given role"""
+        return next(iter(self._by_role.get(role, {}).values()), None)
+
+    def values(self) -> List[User]:
+        """Return all registered users"""
+        return list(self._by_id.values())
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._by_id
+
+    def __iter__(self) -> Iterator[User]:
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, List
+from .patient import Patient
+from .doctor import Doctor
+
+REPORT_TYPES = ("patient_summary", "doctor_performance", "appointment_analytics", "department_analysis")
+
+def age_group(age: int) -> str:
+    """Return the report age bucket for an age"""
+    if age <= 18:
+        return "0-18"
+    elif age <= 35:
+        return "19-35"
+    elif age <= 50:
+        return "36-50"
+    elif age <= 65:
+        return "51-65"
+    return "65+"
+
+class ReportEngine:
+    """Builds any subset of the admin reports in one pass over patients and one over doctors"""
+
+    def __init__(self, patients: List[Patient], doctors: List[Doctor]):
+        self.patients = patients
+        self.doctors = doctors
+
+    def generate(self, report_types: Iterable[str]) -> Dict[str, Dict]:
+        """Return {report_type: report} for the requested report types"""
+        wanted = set(report_types)
+        invalid = wanted.difference(REPORT_TYPES)
+        if invalid:
+            raise ValueError(f"Invalid report type: {', '.join(sorted(invalid))}")
+
+        reports = {}
+        if wanted & {"patient_summary", "appointment_analytics"}:
+            reports.update(self._scan_patients(wanted))
+        if wanted & {"doctor_performance", "department_analysis"}:
+            reports.update(self._scan_doctors(wanted))
+        return reports
+
+    def _scan_patients(self, wanted: set) -> Dict[str, Dict]:
+        want_patients = "patient_summary" in wanted
+        want_appointments = "appointment_analytics" in wanted
+
+        age_groups = {"0-18": 0, "19-35": 0, "36-50": 0, "51-65": 0, "65+": 0}
+        gender_distribution = {"Male": 0, "Female": 0, "Other": 0}
+        with_allergies = 0
+        status_count = {"scheduled": 0, "completed": 0, "cancelled": 0}
+        total_appointments = 0
+
+        for patient in self.patients:
+            if want_patients:
+                age_groups[age_group(patient.age)] += 1
+                gender_distribution[patient.gender] = gender_distribution.get(patient.gender, 0) + 1
+                if patient.allergies:
+                    with_allergies += 1
+
+            if want_appointments:
+                appointments = patient.appointments
+                total_appointments += len(appointments)
+                for apt in appointments:
+                    status_count[apt.status] = status_count.get(apt.status, 0) + 1
+
+        reports = {}
+        if want_patients:
+            reports["patient_summary"] = {
+                "total_patients": len(self.patients),
+                "age_distribution": age_groups,
+                "gender_distribution": gender_distribution,
+                "patients_with_allergies": with_allergies
+            }
+        if want_appointments:
+            reports["appointment_analytics"] = {
+                "total_appointments": total_appointments,
+                "appointment_status": status_count,
+                "completion_rate": (status_count["completed"] / total_appointments * 100) if total_appointments else 0
+            }
+        return reports
+
+    def _scan_doctors(self, wanted: set) -> Dict[str, Dict]:
+        doctors_by_specialization = {}
+        departments = {}
+        total_experience = 0
+
+        for doctor in self.doctors:
+            spec = doctor.specialization
+            doctors_by_specialization[spec] = doctors_by_specialization.get(spec, 0) + 1
+            total_experience += doctor.years_experience
+
+            if "department_analysis" in wanted:
+                dept = departments.setdefault(spec, {"doctors": 0, "patients": 0, "appointments": 0})
+                dept["doctors"] += 1
+                dept["patients"] += len(doctor.assigned_patients)
+                dept["appointments"] += doctor.count_appointments()
+
+        reports = {}
+        if "doctor_performance" in wanted:
+            reports["doctor_performance"] = {
+                "total_doctors": len(self.doctors),
+                "specializations": list(doctors_by_specialization),
+                "average_experience": total_experience / len(self.doctors) if self.doctors else 0,
+                "doctors_by_specialization": doctors_by_specialization
+            }
+        if "department_analysis" in wanted:
+            reports["department_analysis"] = {"departments": departments}
+        return reports
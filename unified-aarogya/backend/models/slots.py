@@ -0,0 +1,111 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as Date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    def popcount(mask: int) -> int:
+        """Count the set bits in a slot mask"""
+        return mask.bit_count()
+else:
+    def popcount(mask: int) -> int:
+        """Count the set bits in a slot mask"""
+        return bin(mask).count("1")
+
+def time_to_minute(time_str: str) -> Optional[int]:
+    """Convert an 'HH:MM' string to a minute of the day, or None if invalid"""
+    try:
+        hour, minute = map(int, time_str.split(':'))
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour * 60 + minute
+
+def minute_to_time(minute: int) -> str:
+    """Convert a minute of the day to an 'HH:MM' string"""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+def iter_minutes(mask: int) -> Iterator[int]:
+    """Yield the minutes set in a mask in ascending order"""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+class DaySlots:
+    """Offered and booked slots for one day as bitsets indexed by minute of day"""
+    __slots__ = ("offered", "booked")
+
+    def __init__(self):
+        self.offered = 0  # bit m set -> a slot starts at minute m
+        self.booked = 0   # bit m set -> that slot is taken
+
+    def offer(self, start_minute: int, end_minute: int, slot_duration: int):
+        """Offer slots starting every slot_duration minutes in [start, end)"""
+        for minute in range(max(start_minute, 0), min(end_minute, MINUTES_PER_DAY), slot_duration):
+            self.offered |= 1 << minute
+
+    def book(self, minute: int) -> bool:
+        """Book the slot starting at minute if it is offered and free"""
+        bit = 1 << minute
+        if not self.offered & bit or self.booked & bit:
+            return False
+        self.booked |= bit
+        return True
+
+    def release(self, minute: int) -> bool:
+        """Free a previously booked slot"""
+        bit = 1 << minute
+        if not self.booked & bit:
+            return False
+        self.booked &= ~bit
+        return True
+
+    @property
+    def free(self) -> int:
+        return self.offered & ~self.booked
+
+    def free_count(self) -> int:
+        return popcount(self.free)
+
+    def free_minutes(self, from_minute: int = 0) -> Iterator[int]:
+        """Yield free slot minutes at or after from_minute in ascending order"""
+        mask = self.free
+        if from_minute > 0:
+            mask &= ~((1 << from_minute) - 1)
+        return iter_minutes(mask)
+
+class SlotCalendar:
+    """Per-day slot bitsets for one doctor, with dates kept sorted for range queries"""
+
+    def __init__(self):
+        self.days: Dict[Date, DaySlots] = {}
+        self.dates: List[Date] = []  # sorted keys of self.days
+
+    def day(self, date_key: Date, create: bool = False) -> Optional[DaySlots]:
+        """Return the slots for a date, creating an empty day if requested"""
+        day = self.days.get(date_key)
+        if day is None and create:
+            day = self.days[date_key] = DaySlots()
+            insort(self.dates, date_key)
+        return day
+
+    def days_between(self, start: Date, end: Date) -> Iterator[Tuple[Date, DaySlots]]:
+        """Yield (date, slots) for every scheduled day in [start, end]"""
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        for date_key in self.dates[lo:hi]:
+            yield date_key, self.days[date_key]
+
+    def iter_free(self, start: Date, start_minute: int, end: Date) -> Iterator[Tuple[Date, int]]:
+        """Yield (date, minute) for every free slot from start/start_minute through end in time order"""
+        for date_key, day in self.days_between(start, end):
+            from_minute = start_minute if date_key == start else 0
+            for minute in day.free_minutes(from_minute):
+                yield date_key, minute
+
+    def free_count_between(self, start: Date, end: Date) -> int:
+        """Count free slots across a date range"""
+        return sum(day.free_count() for _, day in self.days_between(start, end))
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List, Dict, Optional
+from .events import Observable, next_version
 
-class User(ABC):
+class User(Observable, ABC):
     """Abstract base class for all user types"""
+    __slots__ = ("user_id", "name", "email", "password", "role", "created_at", "last_login",
+                 "_observers", "version")
     
     def __init__(self, user_id: str, name: str, email: str, password: str, role: str):
         self.user_id = user_id
@@ -13,12 +16,22 @@ class User(ABC):
         self.role = role
         self.created_at = datetime.now()
         self.last_login = None
+        self._observers = ()
+        self.version = next_version()
     
     @abstractmethod
     def get_dashboard_data(self) -> Dict:
         """Return role-specific dashboard data"""
         pass
     
+    def use_repository(self, repository):
+        """Keep this user's appointments in a repository; the registry a user joins passes its own"""
+        self.repository = repository
+    
+    def cache_version(self):
+        """Version that cached results of this user are validated against"""
+        return self.version
+    
     def login(self) -> bool:
         """Simulate login process"""
         self.last_login = datetime.now()
@@ -0,0 +1,87 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 260_000
+SALT_BYTES = 16
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+def is_hashed(stored: Optional[str]) -> bool:
+    """Check whether a stored password is a hash rather than legacy plaintext"""
+    return bool(stored) and stored.startswith(ALGORITHM + "$")
+
+def hash_password(password: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """Return 'pbkdf2_sha256$iterations$salt$hash' for a password with a fresh salt"""
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """Check a password against a stored hash, or against legacy plaintext"""
+    if not stored or password is None:
+        return False
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode(), stored.encode())
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), _unb64(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate, _unb64(digest))
+
+class PasswordHasher:
+    """Salted PBKDF2 hashing with a tunable work factor, run on a bounded thread pool
+
+    hash() and verify() block the calling thread until the pool is done,
+    so they only help when the server has other threads to run meanwhile:
+    the Procfile and Dockerfile run gunicorn's gthread workers for that.
+    hashlib releases the GIL while it hashes, so those threads keep
+    serving requests, and max_workers caps how many cores a burst of
+    logins can take.
+    """
+
+    def __init__(self, iterations: Optional[int] = None, max_workers: Optional[int] = None):
+        self.iterations = iterations or int(os.getenv("PASSWORD_HASH_ITERATIONS", DEFAULT_ITERATIONS))
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_THREADS", min(4, os.cpu_count() or 1)))
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._pool
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the pool and wait for the result"""
+        return self.pool.submit(hash_password, password, self.iterations).result()
+
+    def verify(self, password: str, stored: Optional[str]) -> bool:
+        """Verify a password on the pool and wait for the result"""
+        return self.pool.submit(verify_password, password, stored).result()
+
+    def needs_rehash(self, stored: Optional[str]) -> bool:
+        """True for plaintext and for hashes made with a different work factor"""
+        if not is_hashed(stored):
+            return True
+        try:
+            return int(stored.split("$")[1]) != self.iterations
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+# Shared by every AuthenticationSystem in this process
+default_hasher = PasswordHasher()
@@ -4,43 +4,70 @@ from models.patient import Patient
 from models.doctor import Doctor
 from models.hospital_admin import HospitalAdmin
 from models.user import User
+from models.registry import UserRegistry
+from models.appointment_repository import AppointmentRepository
+from passwords import PasswordHasher, default_hasher, is_hashed
+from throttle import LoginThrottle
+from auth_tokens import TokenSigner
 
 class AuthenticationSystem:
-    def __init__(self):
-        self.users = {}  # email -> user object
-        self.current_user = None
-        self.login_attempts = {}  # email -> attempt count
-        self.max_attempts = 3
+    def __init__(self, hasher: PasswordHasher = None, throttle: LoginThrottle = None,
+                 tokens: TokenSigner = None):
+        self.appointments = AppointmentRepository()  # this system's appointments, shared by its users
+        self.users = UserRegistry(self.appointments)  # indexed by user ID, email and role
+        self.hasher = hasher or default_hasher  # salted PBKDF2 on a bounded thread pool
+        self.tokens = tokens or TokenSigner()  # signed bearer tokens, no per-process sessions
+        self.login_throttle = throttle or LoginThrottle()  # failed logins per email, bounded and expiring
     
     def register_user(self, user: User) -> bool:
         """Register a new user in the system"""
-        if user.email in self.users:
-            print(f"User with email {user.email} already exists")
+        if user.user_id in self.users or self.users.has_email(user.email):
+            print(f"User with email {user.email} or ID {user.user_id} already exists")
+            return False
+        
+        if not is_hashed(user.password):
+            user.password = self.hasher.hash(user.password)
+        if not self.users.add(user):
+            print(f"User with email {user.email} or ID {user.user_id} already exists")
             return False
         
-        self.users[user.email] = user
         print(f"User {user.name} registered successfully as {user.role}")
         return True
     
+    def register_users(self, users: List[User]) -> List[User]:
+        """Register many users quietly, e.g. from a bulk import; returns those that were new
+        
+        Passwords should already be hashed (see bulk_import); any plaintext
+        ones are hashed here.
+        """
+        for user in users:
+            if not is_hashed(user.password):
+                user.password = self.hasher.hash(user.password)
+        return self.users.add_many(users)
+    
     def login(self, email: str, password: str) -> Optional[User]:
         """Authenticate user and return user object if successful"""
+        email = self.users.normalize_email(email)
+        
         # Check if account is locked
-        if email in self.login_attempts and self.login_attempts[email] >= self.max_attempts:
+        if self.login_throttle.is_locked(email):
             print("Account locked due to too many failed attempts")
             return None
         
-        if email not in self.users:
+        user = self.users.get_by_email(email)
+        if not user:
             print("User not found")
             self._record_failed_attempt(email)
             return None
         
-        user = self.users[email]
-        if user.password == password:
-            self.current_user = user
+        if self.hasher.verify(password, user.password):
+            if self.hasher.needs_rehash(user.password):
+                # Plaintext from before hashing, or an old work factor
+                user.password = self.hasher.hash(password)
+                user.touch()
             user.login()
             # Reset failed attempts on successful login
-            if email in self.login_attempts:
-                del self.login_attempts[email]
+            self.login_throttle.reset(email)
             print(f"Welcome, {user.name}!")
             return user
         else:
@@ -50,32 +77,39 @@ class AuthenticationSystem:
     
     def _record_failed_attempt(self, email: str):
         """Record a failed login attempt"""
-        if email not in self.login_attempts:
-            self.login_attempts[email] = 0
-        self.login_attempts[email] += 1
-        
-        remaining = self.max_attempts - self.login_attempts[email]
+        remaining = self.login_throttle.record_failure(email)
         if remaining > 0:
             print(f"Login failed. {remaining} attempts remaining.")
         else:
             print("Account locked due to too many failed attempts")
     
-    def logout(self):
-        """Logout current user"""
-        if self.current_user:
-            print(f"Goodbye, {self.current_user.name}!")
-            self.current_user = None
+    def logout(self, user: Optional[User]):
+        """Logout a user"""
+        if user:
+            print(f"Goodbye, {user.name}!")
         else:
             print("No user currently logged in")
     
-    def get_current_user(self) -> Optional[User]:
-        """Get currently logged in user"""
-        return self.current_user
+    def issue_token(self, user: User) -> str:
+        """Create a signed bearer token for a logged-in user"""
+        return self.tokens.issue(user)
+    
+    def authenticate(self, token: Optional[str]) -> Optional[User]:
+        """Resolve a bearer token to its user, or None if it is invalid or expired"""
+        claims = self.tokens.verify(token)
+        if claims is None:
+            return None
+        user = self.users.get(claims["user_id"])
+        if user is None or user.role != claims["role"]:
+            return None
+        return user
     
     def reset_password(self, email: str, new_password: str) -> bool:
         """Reset user password (simplified version)"""
-        if email in self.users:
-            self.users[email].password = new_password
+        user = self.users.get_by_email(email)
+        if user:
+            user.password = self.hasher.hash(new_password)
+            user.touch()
             print("Password reset successfully")
             return True
         print("User not found")
@@ -84,6 +118,7 @@ class AuthenticationSystem:
 class HospitalPortalSystem:
     def __init__(self):
         self.auth_system = AuthenticationSystem()
+        self.current_user = None  # the CLI's logged-in user
         self.appointment_counter = 0
         self.record_counter = 0
     
@@ -172,7 +207,7 @@ class HospitalPortalSystem:
         print("="*50)
         
         while True:
-            if not self.auth_system.current_user:
+            if not self.current_user:
                 self._show_login_menu()
             else:
                 self._show_user_menu()
@@ -209,11 +244,17 @@ class HospitalPortalSystem:
         
         user = self.auth_system.login(email, password)
         if user:
+            self.current_user = user
             self._show_dashboard(user)
     
+    def _logout(self):
+        """Log the CLI user out"""
+        self.auth_system.logout(self.current_user)
+        self.current_user = None
+    
     def _show_user_menu(self):
         """Show menu based on user role"""
-        user = self.auth_system.current_user
+        user = self.current_user
         
         print(f"\n" + "="*50)
         print(f"WELCOME, {user.name.upper()} ({user.role.upper()})")
@@ -278,7 +319,7 @@ class HospitalPortalSystem:
         choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == "1":
-            self._show_dashboard(self.auth_system.current_user)
+            self._show_dashboard(self.current_user)
         elif choice == "2":
             self._book_appointment()
         elif choice == "3":
@@ -288,7 +329,7 @@ class HospitalPortalSystem:
         elif choice == "5":
             self._update_patient_info()
         elif choice == "6":
-            self.auth_system.logout()
+            self._logout()
         else:
             print("Invalid choice. Please try again.")
     
@@ -307,7 +348,7 @@ class HospitalPortalSystem:
         choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == "1":
-            self._show_dashboard(self.auth_system.current_user)
+            self._show_dashboard(self.current_user)
         elif choice == "2":
             self._view_doctor_schedule()
         elif choice == "3":
@@ -321,7 +362,7 @@ class HospitalPortalSystem:
         elif choice == "7":
             self._set_availability()
         elif choice == "8":
-            self.auth_system.logout()
+            self._logout()
         else:
             print("Invalid choice. Please try again.")
     
@@ -340,7 +381,7 @@ class HospitalPortalSystem:
         choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == "1":
-            self._show_dashboard(self.auth_system.current_user)
+            self._show_dashboard(self.current_user)
         elif choice == "2":
             self._view_hospital_data()
         elif choice == "3":
@@ -354,13 +395,13 @@ class HospitalPortalSystem:
         elif choice == "7":
             self._view_all_appointments()
         elif choice == "8":
-            self.auth_system.logout()
+            self._logout()
         else:
             print("Invalid choice. Please try again.")
     
     def _book_appointment(self):
         """Handle appointment booking"""
-        patient = self.auth_system.current_user
+        patient = self.current_user
         
         print("\n" + "-"*30)
         print("BOOK APPOINTMENT")
@@ -400,29 +441,51 @@ class HospitalPortalSystem:
     
     def _view_patient_appointments(self):
         """View patient's appointments"""
-        patient = self.auth_system.current_user
+        patient = self.current_user
         
         print("\n" + "-"*30)
         print("YOUR APPOINTMENTS")
         print("-"*30)
         
-        appointments = patient.view_appointments()
-        if not appointments:
+        self._page_through(patient.page_appointments, self._print_appointment)
+    
+    def _print_appointment(self, apt):
+        print(f"ID: {apt.appointment_id}")
+        print(f"Date: {apt.date.strftime('%Y-%m-%d %H:%M')}")
+        print(f"Reason: {apt.reason}")
+        print(f"Status: {apt.status}")
+        if apt.diagnosis:
+            print(f"Diagnosis: {apt.diagnosis}")
+        print("-" * 20)
+    
+    def _page_through(self, fetch_page, show, page_size: int = 10):
+        """Print a listing one page at a time, fetching each page from its cursor"""
+        page = fetch_page(None, page_size)
+        if not page.items:
             print("No appointments found")
             return
+        while True:
+            for item in page:
+                show(item)
+            if page.next_cursor is None:
+                return
+            if input("Press Enter for more, or q to stop: ").strip().lower() == "q":
+                return
+            page = fetch_page(page.next_cursor, page_size)
+    
+    def _view_all_appointments(self):
+        """View every appointment in the hospital (admin only)"""
+        admin = self.current_user
+        
+        print("\n" + "-"*30)
+        print("ALL APPOINTMENTS")
+        print("-"*30)
         
-        for apt in appointments:
-            print(f"ID: {apt.appointment_id}")
-            print(f"Date: {apt.date.strftime('%Y-%m-%d %H:%M')}")
-            print(f"Reason: {apt.reason}")
-            print(f"Status: {apt.status}")
-            if apt.diagnosis:
-                print(f"Diagnosis: {apt.diagnosis}")
-            print("-" * 20)
+        self._page_through(admin.page_appointments, self._print_appointment)
     
     def _view_medical_records(self):
         """View patient's medical records"""
-        patient = self.auth_system.current_user
+        patient = self.current_user
         
         print("\n" + "-"*30)
         print("MEDICAL RECORDS")
@@ -446,7 +509,7 @@ class HospitalPortalSystem:
     
     def _update_patient_info(self):
         """Update patient information"""
-        patient = self.auth_system.current_user
+        patient = self.current_user
         
         print("\n" + "-"*30)
         print("UPDATE PERSONAL INFO")
@@ -477,17 +540,14 @@ class HospitalPortalSystem:
     
     def _get_admin(self) -> Optional[HospitalAdmin]:
         """Get the first admin from the system"""
-        for user in self.auth_system.users.values():
-            if isinstance(user, HospitalAdmin):
-                return user
-        return None
+        return self.auth_system.users.first_with_role("Hospital Admin")
     
     # Additional methods for doctor and admin functionality would go here...
     # (Truncated for brevity, but can be expanded with full implementations)
     
     def _view_doctor_schedule(self):
         """View doctor's schedule"""
-        doctor = self.auth_system.current_user
+        doctor = self.current_user
         tomorrow = datetime.now() + timedelta(days=1)
         schedule = doctor.view_schedule(tomorrow)
         
@@ -502,7 +562,7 @@ class HospitalPortalSystem:
     
     def _view_hospital_data(self):
         """View hospital data (admin only)"""
-        admin = self.auth_system.current_user
+        admin = self.current_user
         data = admin.view_hospital_data()
         
         print("\n" + "-"*30)
@@ -0,0 +1,129 @@
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from models.patient import Patient, Appointment, MedicalRecord
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+
+try:
+    import orjson
+except ImportError:  # optional; the standard json module is used instead
+    orjson = None
+
+# Fields each model may expose, in output order. Passwords, schedules and
+# back-references are deliberately absent.
+FIELDS: Dict[type, Tuple[str, ...]] = {
+    Appointment: ("appointment_id", "patient_id", "doctor_id", "date", "reason", "status",
+                  "diagnosis", "prescription", "notes"),
+    MedicalRecord: ("record_id", "patient_id", "doctor_id", "diagnosis", "treatment", "date",
+                    "medications", "lab_results"),
+    Patient: ("user_id", "name", "email", "role", "created_at", "last_login", "age", "gender",
+              "phone", "address", "emergency_contact", "insurance_info", "blood_type", "allergies"),
+    Doctor: ("user_id", "name", "email", "role", "created_at", "last_login", "specialization",
+             "license_number", "years_experience", "consultation_fee", "rating", "qualifications",
+             "hospital_id"),
+    HospitalAdmin: ("user_id", "name", "email", "role", "created_at", "last_login", "admin_level",
+                    "departments_managed", "permissions")
+}
+
+# Fields that need more than an attribute read
+CONVERTERS: Dict[Tuple[type, str], Callable[[Any], Any]] = {
+    (MedicalRecord, "medications"): lambda medications: [dict(entry) for entry in medications],
+    (MedicalRecord, "lab_results"): lambda results: {name: dict(entry) for name, entry in results.items()}
+}
+
+# Selections come from query strings, so only this many are kept compiled
+MAX_CACHED_SELECTIONS = 1024
+
+_encoders: Dict[Tuple[type, Tuple[str, ...]], Callable[[Any], Dict]] = {}
+_defaults: Dict[Tuple, Callable[[Any], Any]] = {}
+_lock = Lock()
+
+def _compile(cls: type, fields: Tuple[str, ...]) -> Callable[[Any], Dict]:
+    """Generate `def encode(obj): return {...}` for one class and field selection"""
+    namespace: Dict[str, Any] = {}
+    items = []
+    for index, field in enumerate(fields):
+        converter = CONVERTERS.get((cls, field))
+        if converter is None:
+            items.append(f"{field!r}: obj.{field}")
+        else:
+            namespace[f"_convert{index}"] = converter
+            items.append(f"{field!r}: _convert{index}(obj.{field})")
+    source = f"def encode(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<encoder {cls.__name__}>", "exec"), namespace)
+    return namespace["encode"]
+
+def encoder(cls: type, fields: Optional[Sequence[str]] = None) -> Callable[[Any], Dict]:
+    """Encoder turning a cls instance into a dict of the selected fields, compiled once"""
+    allowed = FIELDS.get(cls)
+    if allowed is None:
+        raise TypeError(f"No serializer for {cls.__name__}")
+    selected = allowed if fields is None else tuple(fields)
+    key = (cls, selected)
+    encode = _encoders.get(key)
+    if encode is None:
+        unknown = [field for field in selected if field not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown {cls.__name__} fields: {', '.join(unknown)}")
+        encode = _compile(cls, selected)
+        if len(_encoders) < MAX_CACHED_SELECTIONS:
+            with _lock:
+                encode = _encoders.setdefault(key, encode)
+    return encode
+
+def to_dict(obj, fields: Optional[Sequence[str]] = None) -> Dict:
+    """One model object as a dict of JSON-ready and datetime values"""
+    return encoder(type(obj), fields)(obj)
+
+def _default_hook(selection: Optional[Dict[type, Sequence[str]]]) -> Callable[[Any], Any]:
+    """The `default` callback for one field selection, built once per selection"""
+    key = tuple(sorted((cls.__name__, tuple(fields)) for cls, fields in selection.items())) if selection else ()
+    hook = _defaults.get(key)
+    if hook is not None:
+        return hook
+    encoders = {cls: encoder(cls, (selection or {}).get(cls)) for cls in FIELDS}
+
+    def default(obj):
+        encode = encoders.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if isinstance(obj, Mapping):
+            return dict(obj)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        return str(obj)
+
+    if len(_defaults) >= MAX_CACHED_SELECTIONS:
+        return default
+    with _lock:
+        return _defaults.setdefault(key, default)
+
+def dumper(fields: Optional[Dict[type, Sequence[str]]] = None) -> Callable[[Any], bytes]:
+    """A dumps() bound to one field selection, for serializing many payloads in a row"""
+    default = _default_hook(fields)
+    if orjson is not None:
+        return lambda payload: orjson.dumps(payload, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return lambda payload: json.dumps(payload, default=default, separators=(",", ":")).encode()
+
+def dumps(payload, fields: Optional[Dict[type, Sequence[str]]] = None) -> bytes:
+    """Serialize a payload that may contain model objects straight to JSON bytes
+
+    Model objects anywhere in the payload are encoded by their compiled
+    encoder; fields optionally narrows the output per class, e.g.
+    {Appointment: ("appointment_id", "date", "status")}. Uses orjson when
+    it is installed.
+    """
+    return dumper(fields)(payload)
+
+def parse_fields(cls: type, value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """A '?fields=a,b' query value as a field selection for cls, or None for all fields"""
+    if not value:
+        return None
+    fields = tuple(field.strip() for field in value.split(",") if field.strip())
+    encoder(cls, fields)  # validates the names
+    return fields
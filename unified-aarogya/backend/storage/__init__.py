@@ -0,0 +1,4 @@
+# MongoDB persistence, write-behind batching and cross-worker shared state for the in-memory models
+from .mongo import MongoStore, connect
+from .shared_state import SharedState, StateBackend, SQLiteStateBackend, open_state_backend
+from .write_behind import WriteBehindQueue
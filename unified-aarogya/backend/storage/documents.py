@@ -0,0 +1,193 @@
+from datetime import date as Date
+from typing import Dict, List
+from models.patient import Patient, Appointment, MedicalRecord, Medication, LabResult
+from models.doctor import Doctor, Schedule
+from models.hospital_admin import HospitalAdmin
+
+# Convert models to and from MongoDB documents. Each document uses the
+# model's ID as _id. Slot bitsets do not fit in a 64-bit BSON integer, so
+# they are stored as hex strings. The update_* functions copy a document
+# onto an object that already exists, e.g. one changed by another worker.
+
+def _user_fields(user) -> Dict:
+    return {
+        "_id": user.user_id,
+        "name": user.name,
+        "email": user.email,
+        "password": user.password,
+        "created_at": user.created_at,
+        "last_login": user.last_login
+    }
+
+def _update_user_fields(user, doc: Dict):
+    user.name = doc["name"]
+    user.password = doc["password"]
+    user.created_at = doc.get("created_at", user.created_at)
+    user.last_login = doc.get("last_login")
+
+def patient_to_document(patient: Patient) -> Dict:
+    doc = _user_fields(patient)
+    doc.update({
+        "age": patient.age,
+        "gender": patient.gender,
+        "phone": patient.phone,
+        "address": patient.address,
+        "emergency_contact": patient.emergency_contact,
+        "insurance_info": patient.insurance_info,
+        "blood_type": patient.blood_type,
+        "allergies": list(patient.allergies)
+    })
+    return doc
+
+def patient_from_document(doc: Dict) -> Patient:
+    patient = Patient(doc["_id"], doc["name"], doc["email"], doc["password"],
+                      doc["age"], doc["gender"], doc["phone"], doc["address"])
+    update_patient(patient, doc)
+    return patient
+
+def update_patient(patient: Patient, doc: Dict):
+    _update_user_fields(patient, doc)
+    patient.age = doc["age"]
+    patient.gender = doc["gender"]
+    patient.phone = doc["phone"]
+    patient.address = doc["address"]
+    patient.emergency_contact = doc.get("emergency_contact")
+    patient.insurance_info = doc.get("insurance_info")
+    patient.blood_type = doc.get("blood_type")
+    patient.allergies = list(doc.get("allergies", []))
+
+def doctor_to_document(doctor: Doctor) -> Dict:
+    doc = _user_fields(doctor)
+    doc.update({
+        "specialization": doctor.specialization,
+        "license_number": doctor.license_number,
+        "years_experience": doctor.years_experience,
+        "assigned_patients": list(doctor.assigned_patients),
+        "consultation_fee": doctor.consultation_fee,
+        "rating": doctor.rating,
+        "reviews": list(doctor.reviews),
+        "qualifications": list(doctor.qualifications),
+        "hospital_id": doctor.hospital_id,
+        "schedule": [
+            {"date": date_key.isoformat(), "offered": f"{day.offered:x}", "booked": f"{day.booked:x}"}
+            for date_key, day in doctor.schedule.calendar.days.items()
+        ]
+    })
+    return doc
+
+def doctor_from_document(doc: Dict) -> Doctor:
+    doctor = Doctor(doc["_id"], doc["name"], doc["email"], doc["password"],
+                    doc["specialization"], doc["license_number"], doc["years_experience"])
+    update_doctor(doctor, doc)
+    return doctor
+
+def update_doctor(doctor: Doctor, doc: Dict):
+    _update_user_fields(doctor, doc)
+    doctor.specialization = doc["specialization"]
+    doctor.license_number = doc["license_number"]
+    doctor.years_experience = doc["years_experience"]
+    doctor.assigned_patients = list(doc.get("assigned_patients", []))
+    doctor.consultation_fee = doc.get("consultation_fee", 0.0)
+    doctor.rating = doc.get("rating", 0.0)
+    doctor.reviews = list(doc.get("reviews", []))
+    doctor.qualifications = list(doc.get("qualifications", []))
+    doctor.hospital_id = doc.get("hospital_id")
+    doctor.schedule = Schedule()
+    for entry in doc.get("schedule", []):
+        day = doctor.schedule.calendar.day(Date.fromisoformat(entry["date"]), create=True)
+        day.offered = int(entry["offered"], 16)
+        day.booked = int(entry["booked"], 16)
+
+def admin_to_document(admin: HospitalAdmin) -> Dict:
+    doc = _user_fields(admin)
+    doc.update({
+        "admin_level": admin.admin_level,
+        "managed_doctors": [doctor.user_id for doctor in admin.managed_doctors],
+        "managed_patients": [patient.user_id for patient in admin.managed_patients],
+        "departments_managed": list(admin.departments_managed)
+    })
+    return doc
+
+def admin_from_document(doc: Dict) -> HospitalAdmin:
+    """Rebuild an admin; managed doctors and patients are linked by the caller"""
+    admin = HospitalAdmin(doc["_id"], doc["name"], doc["email"], doc["password"],
+                          doc.get("admin_level", "senior"))
+    update_admin(admin, doc)
+    return admin
+
+def update_admin(admin: HospitalAdmin, doc: Dict):
+    """Copy an admin's own fields; managed doctors and patients are linked by the caller"""
+    _update_user_fields(admin, doc)
+    admin.departments_managed = list(doc.get("departments_managed", []))
+
+def appointment_to_document(appointment: Appointment) -> Dict:
+    return {
+        "_id": appointment.appointment_id,
+        "patient_id": appointment.patient_id,
+        "doctor_id": appointment.doctor_id,
+        "date": appointment.date,
+        "reason": appointment.reason,
+        "status": appointment.status,
+        "diagnosis": appointment.diagnosis,
+        "prescription": appointment.prescription,
+        "notes": appointment.notes
+    }
+
+def appointment_from_document(doc: Dict) -> Appointment:
+    appointment = Appointment(doc["_id"], doc["patient_id"], doc["doctor_id"],
+                              doc["date"], doc["reason"], doc.get("status", "scheduled"))
+    appointment.diagnosis = doc.get("diagnosis")
+    appointment.prescription = doc.get("prescription")
+    appointment.notes = doc.get("notes")
+    return appointment
+
+def update_appointment(appointment: Appointment, doc: Dict):
+    """Apply a stored date and status through the Appointment methods so observers see them"""
+    if appointment.date != doc["date"]:
+        appointment.reschedule(doc["date"])
+    status = doc.get("status", "scheduled")
+    if status != appointment.status:
+        if status == "completed":
+            appointment.complete_appointment(doc.get("diagnosis"), doc.get("prescription"), doc.get("notes"))
+        elif status == "cancelled":
+            appointment.cancel_appointment()
+    appointment.reason = doc["reason"]
+    appointment.diagnosis = doc.get("diagnosis")
+    appointment.prescription = doc.get("prescription")
+    appointment.notes = doc.get("notes")
+
+def medical_record_to_document(record: MedicalRecord) -> Dict:
+    return {
+        "_id": record.record_id,
+        "patient_id": record.patient_id,
+        "doctor_id": record.doctor_id,
+        "diagnosis": record.diagnosis,
+        "treatment": record.treatment,
+        "date": record.date,
+        "medications": [
+            {"medication": med.medication, "dosage": med.dosage, "duration": med.duration,
+             "prescribed_date": med.prescribed_date}
+            for med in record.medications
+        ],
+        "lab_results": {
+            test_name: {"result": lab.result, "normal_range": lab.normal_range, "test_date": lab.test_date}
+            for test_name, lab in record.lab_results.items()
+        }
+    }
+
+def medical_record_from_document(doc: Dict) -> MedicalRecord:
+    record = MedicalRecord(doc["_id"], doc["patient_id"], doc["doctor_id"],
+                           doc["diagnosis"], doc["treatment"], doc["date"])
+    medications: List[Medication] = [
+        Medication(med["medication"], med["dosage"], med["duration"], med["prescribed_date"].timestamp())
+        for med in doc.get("medications", [])
+    ]
+    if medications:
+        record.medications = medications
+    lab_results = {
+        test_name: LabResult(lab["result"], lab.get("normal_range"), lab["test_date"].timestamp())
+        for test_name, lab in doc.get("lab_results", {}).items()
+    }
+    if lab_results:
+        record.lab_results = lab_results
+    return record
@@ -0,0 +1,246 @@
+import os
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from pymongo import ASCENDING, MongoClient, DeleteOne, InsertOne, ReplaceOne
+from pymongo.database import Database
+from models.patient import Patient, Appointment, MedicalRecord
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from .documents import (
+    patient_to_document, patient_from_document,
+    doctor_to_document, doctor_from_document,
+    admin_to_document, admin_from_document,
+    appointment_to_document, appointment_from_document,
+    medical_record_to_document, medical_record_from_document
+)
+
+MOCK_SCHEME = "mongomock://"
+
+# Fields needed by list views, so they do not pull whole documents
+PATIENT_SUMMARY_FIELDS = ("name", "email", "age", "gender", "phone")
+DOCTOR_SUMMARY_FIELDS = ("name", "email", "specialization", "years_experience", "consultation_fee", "rating")
+APPOINTMENT_SUMMARY_FIELDS = ("patient_id", "doctor_id", "date", "status")
+
+def connect(uri: str, db_name: str, max_pool_size: Optional[int] = None,
+            min_pool_size: Optional[int] = None) -> Database:
+    """Open a database, sizing the connection pool from the arguments or the environment
+
+    Pool sizes default to MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE. A
+    mongomock:// URI returns an in-process stand-in for tests and
+    benchmarks, which needs the mongomock package.
+    """
+    if uri.startswith(MOCK_SCHEME):
+        import mongomock
+        return mongomock.MongoClient()[db_name]
+
+    if max_pool_size is None:
+        max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    if min_pool_size is None:
+        min_pool_size = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    client = MongoClient(uri, maxPoolSize=max_pool_size, minPoolSize=min_pool_size)
+    return client[db_name]
+
+def _projection(fields: Optional[Iterable[str]]) -> Optional[Dict[str, int]]:
+    return {field: 1 for field in fields} if fields is not None else None
+
+class MongoStore:
+    """Persists patients, doctors, admins, appointments and medical records
+
+    Writes are upserts keyed on the model ID, sent with unordered
+    bulk_write in batches of batch_size; pass upsert=False for plain
+    inserts when loading into empty collections. Reads take an optional
+    list of fields that becomes a projection.
+    """
+
+    def __init__(self, db: Database, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+        self.patients = db.patients
+        self.doctors = db.doctors
+        self.admins = db.admins
+        self.appointments = db.appointments
+        self.medical_records = db.medical_records
+        self._converters = (
+            (HospitalAdmin, self.admins, admin_to_document),
+            (Doctor, self.doctors, doctor_to_document),
+            (Patient, self.patients, patient_to_document),
+            (Appointment, self.appointments, appointment_to_document),
+            (MedicalRecord, self.medical_records, medical_record_to_document)
+        )
+
+    def ensure_indexes(self):
+        """Create the indexes the read methods rely on"""
+        for collection in (self.patients, self.doctors, self.admins):
+            collection.create_index("email", unique=True)
+        self.doctors.create_index("specialization")
+        self.appointments.create_index([("patient_id", ASCENDING), ("date", ASCENDING)])
+        self.appointments.create_index([("doctor_id", ASCENDING), ("date", ASCENDING)])
+        self.appointments.create_index([("status", ASCENDING), ("date", ASCENDING)])
+        self.medical_records.create_index([("patient_id", ASCENDING), ("date", ASCENDING)])
+
+    # ---- Writes ----
+
+    def _bulk_write(self, collection, objects: Iterable, to_document: Callable, upsert: bool = True) -> int:
+        """Write objects in batches and return how many were written"""
+        written = 0
+        batch: List = []
+        for obj in objects:
+            document = to_document(obj)
+            if upsert:
+                batch.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+            else:
+                batch.append(InsertOne(document))
+            if len(batch) >= self.batch_size:
+                collection.bulk_write(batch, ordered=False)
+                written += len(batch)
+                batch = []
+        if batch:
+            collection.bulk_write(batch, ordered=False)
+            written += len(batch)
+        return written
+
+    def save_patients(self, patients: Iterable[Patient], upsert: bool = True) -> int:
+        return self._bulk_write(self.patients, patients, patient_to_document, upsert)
+
+    def save_doctors(self, doctors: Iterable[Doctor], upsert: bool = True) -> int:
+        return self._bulk_write(self.doctors, doctors, doctor_to_document, upsert)
+
+    def save_admins(self, admins: Iterable[HospitalAdmin], upsert: bool = True) -> int:
+        return self._bulk_write(self.admins, admins, admin_to_document, upsert)
+
+    def save_appointments(self, appointments: Iterable[Appointment], upsert: bool = True) -> int:
+        return self._bulk_write(self.appointments, appointments, appointment_to_document, upsert)
+
+    def save_medical_records(self, records: Iterable[MedicalRecord], upsert: bool = True) -> int:
+        return self._bulk_write(self.medical_records, records, medical_record_to_document, upsert)
+
+    def _group(self, objects: Iterable) -> Dict[str, tuple]:
+        """Group model objects by collection as {name: (collection, to_document, objects)}"""
+        groups: Dict[str, tuple] = {}
+        for obj in objects:
+            for model_class, collection, to_document in self._converters:
+                if isinstance(obj, model_class):
+                    groups.setdefault(collection.name, (collection, to_document, []))[2].append(obj)
+                    break
+            else:
+                raise TypeError(f"Cannot store {type(obj).__name__} objects")
+        return groups
+
+    def to_document(self, obj) -> Tuple[str, Dict]:
+        """The collection name and document for a model object"""
+        for model_class, collection, to_document in self._converters:
+            if isinstance(obj, model_class):
+                return collection.name, to_document(obj)
+        raise TypeError(f"Cannot store {type(obj).__name__} objects")
+
+    def save_documents(self, documents: Iterable[Tuple[str, Dict]]) -> int:
+        """Upsert (collection name, document) pairs from to_document, one bulk_write per collection"""
+        groups: Dict[str, List[Dict]] = {}
+        for name, document in documents:
+            groups.setdefault(name, []).append(document)
+        return sum(self._bulk_write(self.db[name], group, lambda document: document)
+                   for name, group in groups.items())
+
+    def save(self, *objects) -> int:
+        """Upsert any mix of model objects, one bulk_write per collection"""
+        return sum(self._bulk_write(collection, group, to_document)
+                   for collection, to_document, group in self._group(objects).values())
+
+    def delete(self, *objects) -> int:
+        """Delete any mix of model objects by ID"""
+        deleted = 0
+        for collection, to_document, group in self._group(objects).values():
+            ops = [DeleteOne({"_id": to_document(obj)["_id"]}) for obj in group]
+            deleted += collection.bulk_write(ops, ordered=False).deleted_count
+        return deleted
+
+    def save_system(self, system) -> Dict[str, int]:
+        """Write every user, appointment and medical record of a HospitalPortalSystem"""
+        users = system.auth_system.users
+        patients = users.by_role("Patient")
+        appointments = chain.from_iterable(patient.appointments for patient in patients)
+        records = chain.from_iterable(patient.medical_history for patient in patients)
+        return {
+            "admins": self.save_admins(users.by_role("Hospital Admin")),
+            "doctors": self.save_doctors(users.by_role("Doctor")),
+            "patients": self.save_patients(patients),
+            "appointments": self.save_appointments(appointments),
+            "medical_records": self.save_medical_records(records)
+        }
+
+    # ---- Reads ----
+
+    def find(self, collection, query: Optional[Dict] = None, fields: Optional[Iterable[str]] = None,
+             sort: Optional[List] = None, limit: int = 0):
+        """Run a query returning only the requested fields (plus _id)"""
+        cursor = collection.find(query or {}, _projection(fields), batch_size=self.batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    def patient_summaries(self, fields: Iterable[str] = PATIENT_SUMMARY_FIELDS):
+        return self.find(self.patients, fields=fields)
+
+    def doctors_by_specialization(self, specialization: str, fields: Iterable[str] = DOCTOR_SUMMARY_FIELDS):
+        return self.find(self.doctors, {"specialization": specialization}, fields)
+
+    def appointments_for_patient(self, patient_id: str, fields: Optional[Iterable[str]] = APPOINTMENT_SUMMARY_FIELDS):
+        """A patient's appointments in date order"""
+        return self.find(self.appointments, {"patient_id": patient_id}, fields, [("date", ASCENDING)])
+
+    def appointments_for_doctor(self, doctor_id: str, fields: Optional[Iterable[str]] = APPOINTMENT_SUMMARY_FIELDS):
+        """A doctor's appointments in date order"""
+        return self.find(self.appointments, {"doctor_id": doctor_id}, fields, [("date", ASCENDING)])
+
+    def appointments_between(self, start: datetime, end: datetime, status: Optional[str] = None,
+                             fields: Optional[Iterable[str]] = APPOINTMENT_SUMMARY_FIELDS):
+        """Appointments with start <= date < end in date order, optionally with one status"""
+        query: Dict = {"date": {"$gte": start, "$lt": end}}
+        if status:
+            query["status"] = status
+        return self.find(self.appointments, query, fields, [("date", ASCENDING)])
+
+    def medical_records_for(self, patient_id: str, fields: Optional[Iterable[str]] = None):
+        """A patient's medical records in date order"""
+        return self.find(self.medical_records, {"patient_id": patient_id}, fields, [("date", ASCENDING)])
+
+    def load_into(self, system) -> Dict[str, int]:
+        """Rebuild every stored user, appointment and medical record inside a HospitalPortalSystem"""
+        registry = system.auth_system.users
+        patients = {doc["_id"]: patient_from_document(doc) for doc in self.find(self.patients)}
+        doctors = {doc["_id"]: doctor_from_document(doc) for doc in self.find(self.doctors)}
+        admin_docs = list(self.find(self.admins))
+        admins = [admin_from_document(doc) for doc in admin_docs]
+
+        for user in chain(admins, doctors.values(), patients.values()):
+            registry.add(user)
+
+        records = 0
+        for doc in self.find(self.medical_records, sort=[("date", ASCENDING)]):
+            patient = patients.get(doc["patient_id"])
+            if patient:
+                patient.medical_history.append(medical_record_from_document(doc))
+                records += 1
+
+        appointments = 0
+        repository = registry.repository
+        for doc in self.find(self.appointments):
+            if repository.add(appointment_from_document(doc)):
+                appointments += 1
+
+        for admin, doc in zip(admins, admin_docs):
+            admin.restore(
+                [doctors[user_id] for user_id in doc.get("managed_doctors", []) if user_id in doctors],
+                [patients[user_id] for user_id in doc.get("managed_patients", []) if user_id in patients]
+            )
+
+        return {
+            "admins": len(admins),
+            "doctors": len(doctors),
+            "patients": len(patients),
+            "appointments": appointments,
+            "medical_records": records
+        }
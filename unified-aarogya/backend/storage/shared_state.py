@@ -0,0 +1,321 @@
+import json
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.patient import Patient, Appointment, MedicalRecord
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.appointment_repository import AppointmentRepository
+from .documents import (
+    patient_to_document, patient_from_document, update_patient,
+    doctor_to_document, doctor_from_document, update_doctor,
+    admin_to_document, admin_from_document, update_admin,
+    appointment_to_document, appointment_from_document, update_appointment,
+    medical_record_to_document, medical_record_from_document
+)
+
+# (sequence, kind, key, document or None once deleted)
+Change = Tuple[int, str, str, Optional[Dict]]
+
+USER_KINDS = {
+    "patient": (patient_from_document, update_patient),
+    "doctor": (doctor_from_document, update_doctor),
+    "admin": (admin_from_document, update_admin)
+}
+
+CONVERTERS = (
+    (HospitalAdmin, "admin", admin_to_document),
+    (Doctor, "doctor", doctor_to_document),
+    (Patient, "patient", patient_to_document),
+    (Appointment, "appointment", appointment_to_document),
+    (MedicalRecord, "medical_record", medical_record_to_document)
+)
+
+MODEL_CLASSES = {kind: model_class for model_class, kind, _ in CONVERTERS}
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+def _decode_object(obj: Dict):
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+def encode_document(document: Dict) -> str:
+    return json.dumps(document, default=_encode_value, separators=(",", ":"))
+
+def decode_document(body: str) -> Dict:
+    return json.loads(body, object_hook=_decode_object)
+
+class StateBackend:
+    """Storage shared by every worker process
+
+    Each write takes the next value of a global change sequence, so a
+    worker can fetch everything written since the last sequence it saw.
+    """
+
+    def put_many(self, entries: Iterable[Tuple[str, str, Optional[Dict]]]) -> int:
+        """Write (kind, key, document) entries, None deleting; return the last sequence used"""
+        raise NotImplementedError
+
+    def put(self, kind: str, key: str, document: Dict) -> int:
+        return self.put_many([(kind, key, document)])
+
+    def delete(self, kind: str, key: str) -> int:
+        return self.put_many([(kind, key, None)])
+
+    def sequence(self) -> int:
+        """The sequence of the latest write"""
+        raise NotImplementedError
+
+    def changes_since(self, sequence: int) -> List[Change]:
+        """The latest version of every document written after sequence, oldest first"""
+        raise NotImplementedError
+
+class SQLiteStateBackend(StateBackend):
+    """Shared state in a SQLite file in WAL mode, for workers on one host
+
+    WAL lets every worker read while one writes. Each thread gets its own
+    connection. Only the latest version of a document is kept, and deletes
+    leave a row with no body so other workers see them.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                body TEXT,
+                PRIMARY KEY (kind, key)
+            );
+            CREATE INDEX IF NOT EXISTS documents_seq ON documents (seq);
+            CREATE TABLE IF NOT EXISTS change_sequence (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO change_sequence (id, value) VALUES (0, 0);
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def put_many(self, entries: Iterable[Tuple[str, str, Optional[Dict]]]) -> int:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            sequence = connection.execute("SELECT value FROM change_sequence WHERE id = 0").fetchone()[0]
+            for kind, key, document in entries:
+                sequence += 1
+                body = encode_document(document) if document is not None else None
+                connection.execute(
+                    "INSERT OR REPLACE INTO documents (kind, key, seq, body) VALUES (?, ?, ?, ?)",
+                    (kind, key, sequence, body))
+            connection.execute("UPDATE change_sequence SET value = ? WHERE id = 0", (sequence,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return sequence
+
+    def sequence(self) -> int:
+        return self._connection().execute("SELECT value FROM change_sequence WHERE id = 0").fetchone()[0]
+
+    def changes_since(self, sequence: int) -> List[Change]:
+        rows = self._connection().execute(
+            "SELECT seq, kind, key, body FROM documents WHERE seq > ? ORDER BY seq", (sequence,))
+        return [(seq, kind, key, decode_document(body) if body is not None else None)
+                for seq, kind, key, body in rows]
+
+def open_state_backend(url: str) -> StateBackend:
+    """Open a backend from a URL such as sqlite:////var/lib/aarogya/state.db"""
+    if url.startswith("sqlite:///"):
+        return SQLiteStateBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported shared state backend: {url}")
+
+class SharedState:
+    """Keeps one worker's HospitalPortalSystem in step with a StateBackend
+
+    Once attached, local changes are published as they happen: this object
+    observes the user registry, every user and the appointment repository.
+    Call sync() before handling a request to apply what other workers
+    wrote; while the change sequence has not moved that is one small read.
+    Changes are applied through the model objects, so their versions move
+    and this worker's cached results for them are dropped. A user document
+    that would replace a different local user with the same ID, or take an
+    email another user already has, is not applied; it is printed and kept
+    in conflicts.
+    """
+
+    MAX_CONFLICTS = 100
+
+    def __init__(self, system, backend: StateBackend, repository: Optional[AppointmentRepository] = None):
+        self.system = system
+        self.backend = backend
+        self.repository = repository if repository is not None else system.auth_system.appointments
+        self.last_sequence = 0
+        self._applying_thread = None  # thread currently applying remote changes
+        self.conflicts = deque(maxlen=self.MAX_CONFLICTS)  # (kind, key, reason), newest last
+        self._lock = threading.RLock()
+
+    @property
+    def applying(self) -> bool:
+        """True while the calling thread is applying changes from other workers"""
+        return self._applying_thread == threading.get_ident()
+
+    def attach(self):
+        """Start publishing local changes"""
+        registry = self.system.auth_system.users
+        registry.subscribe(self)
+        for user in registry:
+            user.subscribe(self)
+        self.repository.subscribe(self)
+
+    # ---- Publishing ----
+
+    def on_model_event(self, source, event: str, **details):
+        """Publish the object behind a local change"""
+        if event == "user_added":
+            details["user"].subscribe(self)
+        elif event == "users_added":
+            for user in details["users"]:
+                user.subscribe(self)
+        elif event == "user_removed":
+            details["user"].unsubscribe(self)
+        if self.applying or event == "managed_entity_changed":  # admins forward changes we already see
+            return
+
+        if event == "user_removed":
+            self._publish(details["user"], deleted=True)
+        elif event == "user_added":
+            self._publish(details["user"])
+        elif event == "users_added":
+            self._publish_many(details["users"])
+        elif event.startswith("appointment_"):
+            self._publish(details["appointment"])
+        elif event == "medical_record_added":
+            self._publish(details["record"])
+        else:
+            self._publish(source)
+
+    def _publish(self, obj, deleted: bool = False):
+        self._publish_many([obj], deleted)
+
+    def _publish_many(self, objects, deleted: bool = False):
+        """Write objects in one transaction, e.g. a batch of imported users"""
+        entries = []
+        for obj in objects:
+            for model_class, kind, to_document in CONVERTERS:
+                if isinstance(obj, model_class):
+                    document = to_document(obj)
+                    entries.append((kind, document["_id"], None if deleted else document))
+                    break
+        if not entries:
+            return
+
+        with self._lock:
+            sequence = self.backend.put_many(entries)
+            if sequence == self.last_sequence + len(entries):  # nobody else wrote in between
+                self.last_sequence = sequence
+
+    # ---- Applying ----
+
+    def sync(self) -> int:
+        """Apply changes written by other workers; return how many were applied"""
+        with self._lock:
+            if self.backend.sequence() == self.last_sequence:
+                return 0
+            changes = self.backend.changes_since(self.last_sequence)
+            if not changes:
+                return 0
+
+            self._applying_thread = threading.get_ident()
+            try:
+                self._apply(changes)
+            finally:
+                self._applying_thread = None
+            self.last_sequence = changes[-1][0]
+            return len(changes)
+
+    def _apply(self, changes: List[Change]):
+        by_kind: Dict[str, List[Tuple[str, Optional[Dict]]]] = {}
+        for _, kind, key, document in changes:
+            by_kind.setdefault(kind, []).append((key, document))
+
+        # Users first, so admins, appointments and records can link to them
+        registry = self.system.auth_system.users
+        skipped = set()
+        for kind in ("patient", "doctor", "admin"):
+            from_document, update = USER_KINDS[kind]
+            for key, document in by_kind.get(kind, ()):
+                user = registry.get(key)
+                if document is None:
+                    if user:
+                        registry.remove(key)
+                elif user is None:
+                    if not registry.add(from_document(document)):
+                        skipped.add(key)
+                        self._conflict(kind, key, f"email {document['email']} belongs to another user")
+                elif not self._same_user(user, kind, document):
+                    skipped.add(key)
+                    self._conflict(kind, key, "ID belongs to a different local user")
+                elif not registry.change_email(user, document["email"]):
+                    skipped.add(key)
+                    self._conflict(kind, key, f"email {document['email']} belongs to another user")
+                else:
+                    update(user, document)
+                    user.touch()
+
+        for key, document in by_kind.get("admin", ()):
+            if key in skipped:
+                continue
+            admin = registry.get(key)
+            if document and isinstance(admin, HospitalAdmin):
+                admin.restore(
+                    [registry.get(user_id) for user_id in document.get("managed_doctors", []) if user_id in registry],
+                    [registry.get(user_id) for user_id in document.get("managed_patients", []) if user_id in registry]
+                )
+
+        for key, document in by_kind.get("appointment", ()):
+            if document is None:
+                continue  # appointments are cancelled, never deleted
+            appointment = self.repository.get(key)
+            if appointment:
+                update_appointment(appointment, document)
+            else:
+                self.repository.add(appointment_from_document(document))
+
+        for key, document in by_kind.get("medical_record", ()):
+            patient = registry.get(document["patient_id"]) if document else None
+            if isinstance(patient, Patient) and all(record.record_id != key for record in patient.medical_history):
+                patient.add_medical_record(medical_record_from_document(document))
+
+    @staticmethod
+    def _same_user(user, kind: str, document: Dict) -> bool:
+        """Whether a document describes this user rather than another one given the same ID
+
+        Creation times never change; MongoDB keeps them to the millisecond,
+        so a worker that loaded the user from there may hold a rounded copy.
+        """
+        if MODEL_CLASSES[kind] is not type(user):
+            return False
+        created_at = document.get("created_at")
+        return created_at is None or abs(created_at - user.created_at) < timedelta(milliseconds=1)
+
+    def _conflict(self, kind: str, key: str, reason: str):
+        self.conflicts.append((kind, key, reason))
+        print(f"Shared state: skipped {kind} {key} from another worker: {reason}")
@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+from pymongo.errors import ConnectionFailure
+from models.appointment_repository import AppointmentRepository
+from .mongo import MongoStore
+
+Key = Tuple[str, str]  # (collection name, document _id)
+
+class WriteBehindQueue:
+    """Persists model changes from a background thread in coalesced batches
+
+    The queue observes the user registry, every user and the appointment
+    repository, so bookings, status changes, medical records, allergies and
+    personal-info updates are queued as they happen and the request returns
+    straight away. Each object is converted to a document when it is
+    queued, on the thread that changed it, so the flusher never reads an
+    object another thread is changing. Pending documents are keyed by
+    collection and ID, so ten changes to one patient are still one write.
+
+    A flush happens every flush_interval seconds, or as soon as batch_size
+    documents are pending. When max_backlog documents are pending (e.g. the
+    database is down), callers wait until a flush makes room. A batch that
+    fails because the database is unreachable stays queued and is retried.
+    A batch that fails for any other reason is retried one document at a
+    time. A document that fails max_attempts times in a row is dropped to
+    dead_letters and printed once, so one bad document cannot hold up the
+    rest.
+    """
+
+    MAX_DEAD_LETTERS = 1000
+
+    def __init__(self, store: MongoStore, flush_interval: float = 1.0, batch_size: int = 500,
+                 max_backlog: int = 10000, max_attempts: int = 3,
+                 skip_when: Optional[Callable[[], bool]] = None):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_backlog = max_backlog
+        self.max_attempts = max_attempts
+        self.skip_when = skip_when  # e.g. while changes from another worker are applied
+        self._pending: Dict[Key, Dict] = {}
+        self._attempts: Dict[Key, int] = {}  # failed writes of the pending document
+        self.dead_letters = deque(maxlen=self.MAX_DEAD_LETTERS)  # (collection, document, error)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)  # signalled when a flush is due
+        self._room = threading.Condition(self._lock)  # signalled when the backlog shrinks
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self._unreachable = False
+
+    def attach(self, registry, repository: Optional[AppointmentRepository] = None):
+        """Start queueing changes to the registry's users and appointments (or another repository's)"""
+        registry.subscribe(self)
+        for user in registry:
+            user.subscribe(self)
+        (repository if repository is not None else registry.repository).subscribe(self)
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush what is pending and stop the background thread"""
+        with self._lock:
+            self._stopping = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    # ---- Queueing ----
+
+    def on_model_event(self, source, event: str, **details):
+        """Queue the object behind a model change"""
+        if event == "user_added":
+            details["user"].subscribe(self)
+        elif event == "users_added":
+            for user in details["users"]:
+                user.subscribe(self)
+        elif event == "user_removed":
+            details["user"].unsubscribe(self)
+        if event == "managed_entity_changed" or (self.skip_when and self.skip_when()):
+            return
+
+        if event == "user_removed":
+            return  # nothing removes users from storage
+        elif event == "user_added":
+            self.enqueue(details["user"])
+        elif event == "users_added":
+            for user in details["users"]:
+                self.enqueue(user)
+        elif event.startswith("appointment_"):
+            self.enqueue(details["appointment"])
+        elif event == "medical_record_added":
+            self.enqueue(details["record"])
+        else:
+            self.enqueue(source)
+
+    def enqueue(self, obj):
+        """Queue a model object to be written with its state now"""
+        name, document = self.store.to_document(obj)
+        key = (name, document["_id"])
+        with self._lock:
+            while (key not in self._pending and len(self._pending) >= self.max_backlog
+                   and self._thread is not None and not self._stopping):
+                self._wake.notify()
+                self._room.wait()
+            self._pending[key] = document
+            self._attempts.pop(key, None)  # a new version gets a fresh set of attempts
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    # ---- Flushing ----
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._wake.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything pending now; return how many documents were written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._room.notify_all()
+            if not batch:
+                return 0
+
+            try:
+                written = self.store.save_documents((name, document) for (name, _), document in batch.items())
+            except ConnectionFailure as e:
+                self._database_unreachable(batch, e)
+                return 0
+            except Exception:
+                self.failures += 1
+                written = self._flush_each(batch)
+            else:
+                self._reachable()
+
+            self.flushed += written
+            self.batches += 1
+            return written
+
+    def _flush_each(self, batch: Dict[Key, Dict]) -> int:
+        """Write a failed batch document by document, keeping or dropping the ones that fail"""
+        written = 0
+        items = list(batch.items())
+        for index, (key, document) in enumerate(items):
+            try:
+                self.store.save_documents([(key[0], document)])
+            except ConnectionFailure as e:
+                self._database_unreachable(dict(items[index:]), e)
+                break
+            except Exception as e:
+                self._failed(key, document, e)
+            else:
+                written += 1
+        return written
+
+    def _failed(self, key: Key, document: Dict, error: Exception):
+        """Queue a failed document for another attempt, or drop it to dead_letters after max_attempts"""
+        with self._lock:
+            if key in self._pending:
+                return  # a newer version was queued meanwhile
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts < self.max_attempts:
+                self._pending[key] = document
+                self._attempts[key] = attempts
+                return
+            self._attempts.pop(key, None)
+            self.dead_letters.append((key[0], document, str(error)))
+        print(f"Write-behind gave up on {key[0]} {key[1]} after {attempts} attempts: {error}")
+
+    def _database_unreachable(self, batch: Dict[Key, Dict], error: Exception):
+        """Keep a batch queued while the database cannot be reached"""
+        self.failures += 1
+        if not self._unreachable:
+            self._unreachable = True
+            print(f"Write-behind cannot reach the database, keeping {len(batch)} documents queued: {error}")
+        with self._lock:
+            for key, document in batch.items():
+                self._pending.setdefault(key, document)  # keep anything newer queued meanwhile
+        time.sleep(min(self.flush_interval, 1.0))  # back off before the next attempt
+
+    def _reachable(self):
+        if self._unreachable:
+            self._unreachable = False
+            print("Write-behind reached the database again")
+
+    def stats(self) -> Dict:
+        """Counters for monitoring"""
+        return {
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dead_letters": len(self.dead_letters)
+        }
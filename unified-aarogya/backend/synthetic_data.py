@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic hospital data at configurable scale
+Builds doctors, patients, schedules, appointments and medical records from
+a seed, so a benchmark run in-process and a load test against MongoDB see
+exactly the same hospital. The same seed, sizes and anchor date always
+give the same data; the anchor ("today" for the dataset) defaults to the
+current date.
+
+    python synthetic_data.py --scale small
+    python synthetic_data.py --scale large --seed 7 --anchor 2025-01-06 --save
+    python synthetic_data.py --doctors 500 --patients 50000 --appointments 400000 --records 100000
+
+From Python:
+
+    from synthetic_data import generate_hospital
+    report = generate_hospital(system, scale="medium", seed=42)
+
+Specializations, ages, blood types, allergies, shifts and appointment
+statuses follow weighted mixes (see the tables below). Appointments fall
+on offered schedule slots, so a doctor is never double-booked, and a
+doctor's share of them follows a skewed popularity. Every user shares one
+password (DEFAULT_PASSWORD), hashed once. Appointments are added in date
+order, which keeps the repository's timelines append-only.
+"""
+
+import argparse
+import os
+import random
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.patient import Patient, Appointment, MedicalRecord, Medication, LabResult
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.slots import minute_to_time, time_to_minute
+
+DEFAULT_PASSWORD = "synthetic123"
+ADMIN_EMAIL = "admin@synthetic.example"
+
+# Dataset sizes by name; any of them can be overridden individually
+SCALES: Dict[str, Dict[str, int]] = {
+    "tiny": dict(doctors=20, patients=1_000, appointments=10_000, records=2_500, past_days=60, future_days=14),
+    "small": dict(doctors=200, patients=20_000, appointments=200_000, records=50_000,
+                  past_days=120, future_days=30),
+    "medium": dict(doctors=2_000, patients=200_000, appointments=2_000_000, records=500_000,
+                   past_days=180, future_days=30),
+    "large": dict(doctors=10_000, patients=1_000_000, appointments=20_000_000, records=5_000_000,
+                  past_days=365, future_days=30)
+}
+
+# (specialization, share of doctors, base consultation fee)
+SPECIALIZATIONS = [
+    ("General Medicine", 18, 100), ("Pediatrics", 10, 120), ("Obstetrics & Gynecology", 7, 180),
+    ("Cardiology", 7, 250), ("Orthopedics", 7, 200), ("Dermatology", 5, 150), ("Psychiatry", 5, 180),
+    ("Neurology", 4, 250), ("ENT", 4, 130), ("Ophthalmology", 4, 140), ("Gastroenterology", 4, 220),
+    ("Pulmonology", 3, 200), ("Endocrinology", 3, 200), ("Oncology", 3, 300), ("Nephrology", 3, 220),
+    ("Urology", 3, 200), ("Radiology", 3, 160), ("Emergency Medicine", 3, 150)
+]
+
+# Reasons for a visit and (diagnosis, treatment, medication) seen at one, by specialization
+VISITS = {
+    "General Medicine": (["Fever", "Annual checkup", "Cough and cold", "Fatigue", "Follow-up visit"],
+                         [("Viral fever", "Rest and fluids", "Paracetamol"),
+                          ("Upper respiratory infection", "Symptomatic care", "Cetirizine"),
+                          ("Vitamin D deficiency", "Supplementation", "Cholecalciferol")]),
+    "Pediatrics": (["Vaccination", "Child wellness visit", "Fever", "Ear pain"],
+                   [("Otitis media", "Antibiotics", "Amoxicillin"),
+                    ("Gastroenteritis", "Oral rehydration", "ORS"),
+                    ("Routine immunization", "Vaccine administered", None)]),
+    "Obstetrics & Gynecology": (["Prenatal visit", "Annual exam", "Pelvic pain"],
+                                [("Normal pregnancy", "Prenatal vitamins", "Folic acid"),
+                                 ("PCOS", "Lifestyle changes and medication", "Metformin")]),
+    "Cardiology": (["Chest pain", "Palpitations", "Hypertension follow-up", "Shortness of breath"],
+                   [("Hypertension", "Lifestyle changes and medication", "Amlodipine"),
+                    ("Stable angina", "Medication and stress test", "Aspirin"),
+                    ("Atrial fibrillation", "Rate control", "Metoprolol")]),
+    "Orthopedics": (["Back pain", "Knee pain", "Sports injury", "Fracture follow-up"],
+                    [("Lumbar strain", "Physiotherapy", "Ibuprofen"),
+                     ("Osteoarthritis of the knee", "Exercise and analgesics", "Diclofenac"),
+                     ("Ankle sprain", "Rest, ice and compression", None)]),
+    "Dermatology": (["Skin rash", "Acne", "Mole check"],
+                    [("Atopic dermatitis", "Emollients and topical steroids", "Hydrocortisone"),
+                     ("Acne vulgaris", "Topical retinoid", "Adapalene")]),
+    "Psychiatry": (["Anxiety", "Low mood", "Sleep problems"],
+                   [("Generalized anxiety disorder", "Therapy and medication", "Sertraline"),
+                    ("Insomnia", "Sleep hygiene counselling", None)]),
+    "Neurology": (["Headache", "Dizziness", "Numbness"],
+                  [("Migraine", "Trigger avoidance and medication", "Sumatriptan"),
+                   ("Peripheral neuropathy", "Nerve pain management", "Gabapentin")]),
+    "Endocrinology": (["Diabetes follow-up", "Thyroid check"],
+                      [("Type 2 diabetes", "Diet and medication", "Metformin"),
+                       ("Hypothyroidism", "Hormone replacement", "Levothyroxine")]),
+    "Pulmonology": (["Breathing difficulty", "Chronic cough"],
+                    [("Asthma", "Inhaled therapy", "Salbutamol"),
+                     ("COPD", "Bronchodilators", "Tiotropium")])
+}
+GENERIC_VISITS = (["Consultation", "Follow-up visit", "Second opinion"],
+                  [("Under evaluation", "Further tests advised", None),
+                   ("Condition stable", "Continue current treatment", None)])
+LAB_TESTS = [("Complete blood count", "Normal", "Normal"), ("Fasting glucose", "104 mg/dL", "70-99 mg/dL"),
+             ("HbA1c", "6.1%", "<5.7%"), ("Lipid panel", "LDL 142 mg/dL", "LDL <100 mg/dL"),
+             ("TSH", "2.1 mIU/L", "0.4-4.0 mIU/L"), ("Blood pressure", "138/88", "120/80")]
+
+# (allergy, weight) and the share of patients with 0, 1, 2 or 3 allergies
+ALLERGIES = [("Penicillin", 10), ("Pollen", 8), ("Dust mites", 6), ("Peanuts", 5), ("Sulfa drugs", 4),
+             ("Aspirin", 4), ("Shellfish", 4), ("Pet dander", 4), ("Tree nuts", 3), ("Milk", 3),
+             ("Latex", 2), ("Eggs", 2), ("Bee stings", 2), ("Codeine", 2)]
+ALLERGY_COUNTS = [65, 22, 9, 4]
+BLOOD_TYPES = [("O+", 37.4), ("A+", 35.7), ("B+", 8.5), ("O-", 6.6), ("A-", 6.3), ("AB+", 3.4),
+               ("B-", 1.5), ("AB-", 0.6)]
+AGE_BANDS = [((0, 17), 20), ((18, 39), 30), ((40, 64), 32), ((65, 95), 18)]
+GENDERS = [("Female", 51), ("Male", 48), ("Other", 1)]
+
+# Shifts (start, end) and working weeks (weekday numbers, Monday = 0)
+SHIFTS = [(("09:00", "17:00"), 40), (("08:00", "16:00"), 30), (("10:00", "18:00"), 20), (("09:00", "13:00"), 10)]
+WORK_WEEKS = [((0, 1, 2, 3, 4), 80), ((0, 1, 2, 3, 4, 5), 15), ((1, 2, 3, 4, 5), 5)]
+SLOT_MINUTES = 30
+
+# Statuses for appointments before and after the anchor
+PAST_STATUSES = [("completed", 82), ("cancelled", 15), ("scheduled", 3)]
+FUTURE_STATUSES = [("scheduled", 92), ("cancelled", 8)]
+
+FIRST_NAMES = ["Aarav", "Aditi", "Alice", "Amit", "Ananya", "Arjun", "Carlos", "Chen", "Deepa", "Emily",
+               "Fatima", "Grace", "Hiro", "Isabel", "Ishaan", "James", "Kavya", "Leila", "Maria", "Michael",
+               "Neha", "Noah", "Olivia", "Priya", "Rahul", "Ravi", "Sara", "Sofia", "Tanvi", "Vikram"]
+LAST_NAMES = ["Agarwal", "Bose", "Chen", "Das", "Davis", "Fernandes", "Garcia", "Gupta", "Iyer", "Johnson",
+              "Kapoor", "Khan", "Kumar", "Mehta", "Menon", "Nair", "Patel", "Reddy", "Rodriguez", "Shah",
+              "Sharma", "Singh", "Smith", "Verma", "Wilson"]
+STREETS = ["Main St", "MG Road", "Park Avenue", "Lake View Rd", "Station Road", "Hill Street", "Oak Ave"]
+INSURERS = ["Star Health", "HDFC Ergo", "ICICI Lombard", "Niva Bupa", "Care Health"]
+
+def _picker(rng: random.Random, table: Sequence[Tuple[object, float]]):
+    """A function drawing one value from a (value, weight) table"""
+    values = [value for value, _ in table]
+    cum_weights = list(accumulate(weight for _, weight in table))
+    total = cum_weights[-1]
+    return lambda: values[bisect_right(cum_weights, rng.random() * total)]
+
+def _allocate(total: int, weights: List[float], capacity: List[int]) -> List[int]:
+    """Split total in proportion to weights without exceeding any capacity"""
+    counts = [0] * len(weights)
+    open_rows = [row for row, room in enumerate(capacity) if room > 0]
+    remaining = total
+    while remaining > 0 and open_rows:
+        weight_sum = sum(weights[row] for row in open_rows)
+        handed_out = 0
+        for row in open_rows:
+            share = min(int(remaining * weights[row] / weight_sum), capacity[row] - counts[row])
+            counts[row] += share
+            handed_out += share
+        if handed_out == 0:  # too little left to split proportionally; one each in order
+            for row in open_rows[:remaining]:
+                counts[row] += 1
+                handed_out += 1
+        remaining -= handed_out
+        open_rows = [row for row in open_rows if counts[row] < capacity[row]]
+    return counts
+
+class GenerationReport:
+    """Counts from one generate_hospital run"""
+
+    def __init__(self):
+        self.counts = {"doctors": 0, "patients": 0, "appointments": 0, "medical_records": 0}
+        self.statuses = {"scheduled": 0, "completed": 0, "cancelled": 0}
+        self.requested = {}
+        self.seconds = 0.0
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{count:,} {name.replace('_', ' ')}" for name, count in self.counts.items())
+        statuses = ", ".join(f"{count:,} {status}" for status, count in self.statuses.items())
+        return f"Generated {counts} in {self.seconds:.1f}s (appointments: {statuses})"
+
+    def shortfalls(self) -> Dict[str, int]:
+        """Requested counts that did not fit, e.g. more appointments than schedule slots"""
+        return {name: wanted - self.counts[name] for name, wanted in self.requested.items()
+                if wanted > self.counts[name]}
+
+class SyntheticHospital:
+    """A seeded description of a hospital that can populate a HospitalPortalSystem
+
+    Each part of the data (doctors, patients, appointments, records) draws
+    from its own random stream, so changing one size leaves the others'
+    values alone. Populate a fresh system: appointments go into its
+    appointment repository.
+    """
+
+    def __init__(self, seed: int = 42, doctors: int = 200, patients: int = 20_000, appointments: int = 200_000,
+                 records: int = 50_000, anchor: Optional[date] = None, past_days: int = 120,
+                 future_days: int = 30, password: str = DEFAULT_PASSWORD):
+        self.seed = seed
+        self.sizes = {"doctors": doctors, "patients": patients, "appointments": appointments,
+                      "medical_records": records}
+        self.anchor = datetime.combine(anchor or date.today(), datetime.min.time())
+        self.past_days = past_days
+        self.future_days = future_days
+        self.password = password
+
+    @classmethod
+    def from_scale(cls, scale: str, **overrides) -> "SyntheticHospital":
+        """A hospital of one of the SCALES sizes, with any argument overridden"""
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale {scale!r}; choose from {', '.join(SCALES)}")
+        options = dict(SCALES[scale])
+        options.update({name: value for name, value in overrides.items() if value is not None})
+        return cls(**options)
+
+    def _rng(self, part: str) -> random.Random:
+        return random.Random(f"{self.seed}:{part}")
+
+    def populate(self, system) -> GenerationReport:
+        """Register the admin, doctors and patients, then fill schedules, appointments and records"""
+        report = GenerationReport()
+        report.requested = dict(self.sizes)
+        started = time.perf_counter()
+
+        password_hash = system.auth_system.hasher.hash(self.password)
+        admin = HospitalAdmin("ADM_SYNTHETIC", "Synthetic Administrator", ADMIN_EMAIL, password_hash, "super")
+        doctors = self.build_doctors(password_hash)
+        patients = self.build_patients(password_hash)
+        system.auth_system.register_users([admin] + doctors + patients)
+        admin.add_doctors(doctors)
+        admin.add_patients(patients)
+        self.assign_primary_doctors(doctors, patients)
+        report.counts["doctors"] = len(doctors)
+        report.counts["patients"] = len(patients)
+
+        completed = self.book_appointments(doctors, patients, report)
+        report.counts["medical_records"] = self.write_records(completed, patients)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    # ---- Users ----
+
+    def _id_width(self, count: int) -> int:
+        return max(6, len(str(count)))
+
+    def build_doctors(self, password_hash: str) -> List[Doctor]:
+        rng = self._rng("doctors")
+        specialization = _picker(rng, [((name, fee), share) for name, share, fee in SPECIALIZATIONS])
+        width = self._id_width(self.sizes["doctors"])
+        doctors = []
+        for number in range(1, self.sizes["doctors"] + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            name, base_fee = specialization()
+            years = min(int(rng.triangular(1, 40, 10)), 40)
+            doctor = Doctor(f"DOC{number:0{width}d}", f"Dr. {first} {last}",
+                            f"dr.{first}.{last}.{number}@synthetic.example".lower(), password_hash,
+                            name, f"MD{number:0{width}d}", years)
+            doctor.consultation_fee = float(round(base_fee * (1 + years / 40) / 10) * 10)
+            doctor.rating = round(min(5.0, max(2.5, rng.gauss(4.3, 0.4))), 1)
+            doctor.qualifications.append({"qualification": "MD", "institution": "Synthetic Medical College",
+                                          "year": self.anchor.year - years})
+            doctor.created_at = self.anchor - timedelta(days=rng.randint(30, 3650))
+            doctors.append(doctor)
+        return doctors
+
+    def build_patients(self, password_hash: str) -> List[Patient]:
+        rng = self._rng("patients")
+        age_band, gender, blood_type = _picker(rng, AGE_BANDS), _picker(rng, GENDERS), _picker(rng, BLOOD_TYPES)
+        allergy, allergy_count = _picker(rng, ALLERGIES), _picker(rng, list(enumerate(ALLERGY_COUNTS)))
+        width = self._id_width(self.sizes["patients"])
+        patients = []
+        for number in range(1, self.sizes["patients"] + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            patient = Patient(f"PAT{number:0{width}d}", f"{first} {last}",
+                              f"{first}.{last}.{number}@synthetic.example".lower(), password_hash,
+                              rng.randint(*age_band()), gender(), f"555-{rng.randint(0, 9_999_999):07d}",
+                              f"{rng.randint(1, 999)} {rng.choice(STREETS)}")
+            patient.blood_type = blood_type()
+            count = allergy_count()
+            while len(patient.allergies) < count:
+                name = allergy()
+                if name not in patient.allergies:
+                    patient.allergies.append(name)
+            patient.emergency_contact = f"{rng.choice(FIRST_NAMES)} {last} - 555-{rng.randint(0, 9_999_999):07d}"
+            if rng.random() < 0.7:
+                patient.insurance_info = f"{rng.choice(INSURERS)} #{rng.randint(10**7, 10**8 - 1)}"
+            patient.created_at = self.anchor - timedelta(days=rng.random() * 3 * 365)
+            patients.append(patient)
+        return patients
+
+    def assign_primary_doctors(self, doctors: List[Doctor], patients: List[Patient]):
+        """Give every patient a primary doctor: a pediatrician for children, else a general physician"""
+        rng = self._rng("assignments")
+        by_specialization: Dict[str, List[Doctor]] = {}
+        for doctor in doctors:
+            by_specialization.setdefault(doctor.specialization, []).append(doctor)
+        adults = by_specialization.get("General Medicine") or doctors
+        children = by_specialization.get("Pediatrics") or adults
+        if not adults:
+            return
+        for patient in patients:
+            doctor = rng.choice(children if patient.age < 18 else adults)
+            doctor.assigned_patients.append(patient.user_id)
+
+    # ---- Schedules and appointments ----
+
+    def book_appointments(self, doctors: List[Doctor], patients: List[Patient],
+                          report: GenerationReport) -> List[Appointment]:
+        """Offer each doctor's shifts over the window and book appointments on them in date order
+
+        Each doctor's total is fixed up front (popularity-weighted, capped
+        by their slots); selection sampling over their slots in time order
+        then books exactly that many. Returns the completed appointments.
+        """
+        if not doctors or not patients:
+            return []
+        rng = self._rng("appointments")
+        shift, work_week = _picker(rng, SHIFTS), _picker(rng, WORK_WEEKS)
+        past_status, future_status = _picker(rng, PAST_STATUSES), _picker(rng, FUTURE_STATUSES)
+        first_day = self.anchor - timedelta(days=self.past_days)
+        days = [first_day + timedelta(days=offset) for offset in range(self.past_days + self.future_days)]
+
+        plans = []  # per doctor: (start, end, slot minutes, working weekdays)
+        capacity = []
+        for doctor in doctors:
+            start, end = shift()
+            minutes = list(range(time_to_minute(start), time_to_minute(end), SLOT_MINUTES))
+            weekdays = work_week()
+            plans.append((start, end, minutes, weekdays))
+            capacity.append(len(minutes) * sum(1 for day in days if day.weekday() in weekdays))
+        popularity = [rng.lognormvariate(0, 0.5) * slots for slots in capacity]
+        wanted = _allocate(self.sizes["appointments"], popularity, capacity)
+        slots_left = list(capacity)
+
+        # Patients visit with skewed frequency; pediatricians see children and obstetricians women
+        visit_weight = [rng.expovariate(1.0) for _ in patients]
+        pools = {"all": list(range(len(patients)))}
+        pools["Pediatrics"] = [row for row in pools["all"] if patients[row].age < 18] or pools["all"]
+        pools["Obstetrics & Gynecology"] = [row for row in pools["all"] if patients[row].gender == "Female"
+                                            and patients[row].age >= 18] or pools["all"]
+        pools = {name: (rows, list(accumulate(visit_weight[row] for row in rows))) for name, rows in pools.items()}
+
+        repository = patients[0].repository
+        booked_per_patient: Dict[str, int] = {}
+        completed = []
+        for day in days:
+            weekday = day.weekday()
+            todays = []  # (minute, doctor row)
+            for row, (start, end, minutes, weekdays) in enumerate(plans):
+                if weekday not in weekdays:
+                    continue
+                doctors[row].schedule.add_availability(day, start, end, SLOT_MINUTES)
+                for minute in minutes:
+                    if wanted[row] and rng.random() * slots_left[row] < wanted[row]:
+                        todays.append((minute, row))
+                        wanted[row] -= 1
+                    slots_left[row] -= 1
+            todays.sort()
+
+            for minute, row in todays:
+                doctor = doctors[row]
+                rows, cum_weights = pools.get(doctor.specialization, pools["all"])
+                patient = patients[rows[bisect_right(cum_weights, rng.random() * cum_weights[-1])]]
+                when = day + timedelta(minutes=minute)
+                number = booked_per_patient.get(patient.user_id, 0) + 1
+                booked_per_patient[patient.user_id] = number
+                reasons, outcomes = VISITS.get(doctor.specialization, GENERIC_VISITS)
+                status = past_status() if when < self.anchor else future_status()
+                appointment = Appointment(f"APT_{number:04d}_{patient.user_id}", patient.user_id,
+                                          doctor.user_id, when, rng.choice(reasons), status)
+                if status != "cancelled":
+                    doctor.schedule.book_slot(when, minute_to_time(minute))
+                if status == "completed":
+                    diagnosis, treatment, medication = rng.choice(outcomes)
+                    appointment.diagnosis = diagnosis
+                    appointment.prescription = medication
+                    appointment.notes = treatment
+                    completed.append(appointment)
+                repository.add(appointment)
+                report.statuses[status] += 1
+        report.counts["appointments"] = sum(report.statuses.values())
+        return completed
+
+    # ---- Medical records ----
+
+    def write_records(self, completed: List[Appointment], patients: List[Patient]) -> int:
+        """Write a medical record for a random subset of completed appointments, oldest first"""
+        rng = self._rng("records")
+        by_id = {patient.user_id: patient for patient in patients}
+        chosen = sorted(rng.sample(range(len(completed)), min(self.sizes["medical_records"], len(completed))))
+        width = len(str(len(chosen)))
+        for number, index in enumerate(chosen, 1):
+            appointment = completed[index]
+            record = MedicalRecord(f"MR_{appointment.date:%Y%m%d}_{number:0{width}d}", appointment.patient_id,
+                                   appointment.doctor_id, appointment.diagnosis, appointment.notes,
+                                   appointment.date)
+            stamp = appointment.date.timestamp()
+            if appointment.prescription:
+                record.medications = [Medication(appointment.prescription, rng.choice(["5mg", "10mg", "500mg"]),
+                                                 rng.choice(["5 days", "14 days", "30 days", "90 days"]), stamp)]
+            if rng.random() < 0.4:
+                test, result, normal_range = rng.choice(LAB_TESTS)
+                record.lab_results = {test: LabResult(result, normal_range, stamp)}
+            by_id[appointment.patient_id].medical_history.append(record)
+        return len(chosen)
+
+def generate_hospital(system, scale: str = "small", seed: int = 42, **options) -> GenerationReport:
+    """Populate a fresh HospitalPortalSystem with a synthetic hospital; see SyntheticHospital for options"""
+    return SyntheticHospital.from_scale(scale, seed=seed, **options).populate(system)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic hospital")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, help="the dataset's 'today', YYYY-MM-DD")
+    for name in ("doctors", "patients", "appointments", "records", "past-days", "future-days"):
+        parser.add_argument(f"--{name}", type=int, help="override the scale's value")
+    parser.add_argument("--save", action="store_true", help="write the hospital to MongoDB (MONGO_URI, DB_NAME)")
+    args = parser.parse_args()
+
+    from portal_system import HospitalPortalSystem
+    system = HospitalPortalSystem()
+    report = generate_hospital(system, args.scale, args.seed, anchor=args.anchor, doctors=args.doctors,
+                               patients=args.patients, appointments=args.appointments, records=args.records,
+                               past_days=args.past_days, future_days=args.future_days)
+    print(report.summary())
+    for name, missing in report.shortfalls().items():
+        print(f"  {missing:,} fewer {name.replace('_', ' ')} than requested; widen --past-days/--future-days")
+    print(f"Every user's password is {DEFAULT_PASSWORD!r}; admin login: {ADMIN_EMAIL}")
+
+    if args.save:
+        from dotenv import load_dotenv
+        from storage import MongoStore, connect
+        load_dotenv()
+        if not os.getenv("MONGO_URI") or not os.getenv("DB_NAME"):
+            parser.error("MONGO_URI and DB_NAME must be set to --save")
+        store = MongoStore(connect(os.getenv("MONGO_URI"), os.getenv("DB_NAME")))
+        store.ensure_indexes()
+        saved = store.save_system(system)
+        print("Saved " + ", ".join(f"{count:,} {name.replace('_', ' ')}" for name, count in saved.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Cheap hashes keep registration fast; must be set before passwords.py builds its default hasher
+os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+
+# Add the backend directory to the path so the tests can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from portal_system import HospitalPortalSystem
+
+@pytest.fixture
+def demo_system():
+    """A HospitalPortalSystem with the CLI demo data: one admin, three doctors, three patients"""
+    system = HospitalPortalSystem()
+    system.initialize_demo_data()
+    return system
+
+@pytest.fixture(scope="module")
+def small_hospital():
+    """A seeded synthetic hospital, shared by the tests of one module; (system, admin)"""
+    from datetime import date
+    from synthetic_data import ADMIN_EMAIL, SyntheticHospital
+
+    system = HospitalPortalSystem()
+    SyntheticHospital(seed=7, doctors=12, patients=300, appointments=3_000, records=300,
+                      anchor=date(2025, 6, 2), past_days=30, future_days=14).populate(system)
+    return system, system.auth_system.users.get_by_email(ADMIN_EMAIL)
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The Flask app module, importable once against an in-process mongomock database, with demo data"""
+    pytest.importorskip("mongomock")
+    os.environ.setdefault("MONGO_URI", "mongomock://localhost")
+    os.environ.setdefault("DB_NAME", "aarogya_app_test")
+    os.environ.setdefault("AUTH_TOKEN_SECRET", "test-secret")
+    import app
+    app.app.testing = True
+    app.portal_system.initialize_demo_data()
+    return app
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+@pytest.fixture
+def login_headers(client):
+    """Authorization headers for a demo user, by email and password"""
+    def login_headers(email: str, password: str):
+        response = client.post("/login", json={"email": email, "password": password})
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.get_json()['token']}"}
+    return login_headers
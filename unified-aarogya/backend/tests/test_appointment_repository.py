@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from models.patient import Appointment
+from portal_system import HospitalPortalSystem
+
+def _booking_order(repository):
+    """Every appointment in booking order, read a page at a time"""
+    appointments, cursor = [], None
+    while True:
+        page = repository.page(cursor, 500)
+        appointments.extend(page.items)
+        if page.next_cursor is None:
+            return appointments
+        cursor = page.next_cursor
+
+def test_indexes_match_linear_scans(small_hospital):
+    system, admin = small_hospital
+    repository = system.auth_system.appointments
+    everything = _booking_order(repository)
+    assert len(everything) == len(repository)
+
+    for doctor in admin.managed_doctors[:4]:
+        assert repository.for_doctor(doctor.user_id) == [a for a in everything if a.doctor_id == doctor.user_id]
+    for patient in admin.managed_patients[:40]:
+        assert patient.appointments == [a for a in everything if a.patient_id == patient.user_id]
+    for status in ("scheduled", "completed", "cancelled"):
+        assert list(repository.with_status(status)) == [a for a in everything if a.status == status]
+
+    start, end = everything[100].date, everything[100].date + timedelta(days=5)
+    assert list(repository.between(start, end)) == sorted(
+        (a for a in everything if start <= a.date < end), key=lambda a: a.date)
+
+def test_owner_counts_follow_changes(small_hospital):
+    system, admin = small_hospital
+    repository = system.auth_system.appointments
+    doctor = admin.managed_doctors[2]
+
+    def by_scan(status, start, end):
+        return [a for a in repository.for_doctor(doctor.user_id) if a.status == status and start <= a.date < end]
+
+    appointments = repository.for_doctor(doctor.user_id)
+    appointments[0].reschedule(appointments[0].date + timedelta(days=2))
+    appointments[1].cancel_appointment()
+    appointments[2].complete_appointment("Done")
+    start = min(a.date for a in appointments)
+    for days in (1, 7, 60):
+        end = start + timedelta(days=days)
+        for status in ("scheduled", "completed", "cancelled"):
+            expected = sorted(by_scan(status, start, end), key=lambda a: a.date)
+            assert repository.count_for_owner(doctor.user_id, status, start, end) == len(expected)
+            assert list(repository.dates_for_owner(doctor.user_id, status, start, end)) == [a.date for a in expected]
+            assert repository.next_for_owner(doctor.user_id, status, start, end) in (expected[:1] or [None])
+
+def test_duplicate_id_is_rejected(small_hospital):
+    repository = small_hospital[0].auth_system.appointments
+    existing = next(repository.with_status("completed"))
+    count = len(repository)
+
+    assert not repository.add(Appointment(existing.appointment_id, "PAT_X", "DOC_X", datetime.now(), "Copy"))
+    assert len(repository) == count and repository.get(existing.appointment_id) is existing
+
+def test_each_system_keeps_its_own_appointments():
+    first, second = HospitalPortalSystem(), HospitalPortalSystem()
+    first.initialize_demo_data()
+    second.initialize_demo_data()
+    alice = first.auth_system.users.get("PAT001")
+    alice.book_appointment("DOC002", datetime.now() + timedelta(days=3), "Second opinion")
+
+    assert len(first.auth_system.appointments) == 3
+    assert len(second.auth_system.appointments) == 2
+    assert len(second.auth_system.users.get("PAT001").appointments) == 1
+    assert [a.reason for a in first.auth_system.users.get("DOC002").appointments] == \
+        ["Child vaccination", "Second opinion"]
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from async_api import AsyncReadAPI
+from models.pagination import MAX_PAGE_SIZE
+
+async def _fallback(scope, receive, send):
+    await send({"type": "http.response.start", "status": 418, "headers": []})
+    await send({"type": "http.response.body", "body": b"flask"})
+
+def _get(api, path, query="", token=None):
+    """Send one GET through the ASGI app; returns (status, parsed JSON or raw body)"""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(api(scope, receive, send))
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], (json.loads(body) if path.startswith("/async/") else body)
+
+@pytest.fixture
+def api(demo_system):
+    flask_app = Flask(__name__)
+    flask_app.secret_key = "test"
+    return AsyncReadAPI(flask_app, demo_system, _fallback)
+
+@pytest.fixture
+def alice(demo_system):
+    """Alice with 30 extra appointments, every third one cancelled"""
+    alice = demo_system.auth_system.users.get("PAT001")
+    start = datetime.now() + timedelta(days=10)
+    for number in range(30):
+        appointment_id = alice.book_appointment("DOC00" + str(number % 3 + 1), start + timedelta(hours=number),
+                                                f"Visit {number}")
+        if number % 3 == 0:
+            alice.repository.get(appointment_id).cancel_appointment()
+    return alice
+
+def _token(demo_system, user_id):
+    return demo_system.auth_system.issue_token(demo_system.auth_system.users.get(user_id))
+
+def test_patient_listing_matches_the_history(api, demo_system, alice):
+    token = _token(demo_system, "PAT001")
+    history = alice.appointments
+
+    for query, expected in [("", history[:100]),
+                            ("limit=5", history[:5]),
+                            ("status=cancelled&limit=4", [a for a in history if a.status == "cancelled"][:4]),
+                            ("status=scheduled", [a for a in history if a.status == "scheduled"])]:
+        status, body = _get(api, "/async/appointments", query, token)
+        assert status == 200
+        assert [a["appointment_id"] for a in body["appointments"]] == [a.appointment_id for a in expected], query
+
+def test_limit_is_capped_at_the_page_size(api, demo_system, alice):
+    token = _token(demo_system, "PAT001")
+    for number in range(MAX_PAGE_SIZE):
+        alice.book_appointment("DOC001", datetime(2031, 1, 1) + timedelta(hours=number), "Bulk")
+
+    _, body = _get(api, "/async/appointments", f"limit={MAX_PAGE_SIZE * 2}", token)
+    assert len(body["appointments"]) == MAX_PAGE_SIZE
+    assert body["appointments"][0].keys() == {"appointment_id", "patient_id", "doctor_id", "date", "reason", "status"}
+
+def test_admin_listing_reads_a_date_window(api, demo_system, alice):
+    token = _token(demo_system, "ADM001")
+    start = datetime.now() + timedelta(days=10)
+    end = start + timedelta(hours=12)
+    query = f"start={start.isoformat()}&end={end.isoformat()}&status=scheduled&limit=6"
+
+    _, body = _get(api, "/async/appointments", query, token)
+    expected = [a for a in alice.appointments if start <= a.date < end and a.status == "scheduled"][:6]
+    assert [a["appointment_id"] for a in body["appointments"]] == [a.appointment_id for a in expected]
+
+def test_dashboard_and_doctors(api, demo_system):
+    status, body = _get(api, "/async/dashboard", token=_token(demo_system, "DOC002"))
+    assert status == 200 and body["role"] == "Doctor"
+    dashboard = demo_system.auth_system.users.get("DOC002").get_dashboard_data()
+    assert body["dashboard"]["user_info"] == dashboard["user_info"]
+    assert body["dashboard"]["pending_appointments"] == dashboard["pending_appointments"] == 1
+
+    _, body = _get(api, "/async/doctors", "specialization=cardiology", _token(demo_system, "PAT002"))
+    assert [doctor["user_id"] for doctor in body["doctors"]] == ["DOC001"]
+
+def test_errors_and_fallback(api, demo_system):
+    assert _get(api, "/async/dashboard")[0] == 401
+    assert _get(api, "/async/dashboard", token="forged")[0] == 401
+    assert _get(api, "/async/nothing", token=_token(demo_system, "PAT001"))[0] == 404
+    assert _get(api, "/async/appointments", "limit=lots", _token(demo_system, "PAT001"))[0] == 400
+    assert _get(api, "/patient/dashboard") == (418, b"flask")
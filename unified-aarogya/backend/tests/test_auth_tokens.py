@@ -0,0 +1,85 @@
+import base64
+import hashlib
+import json
+
+import pytest
+from itsdangerous import URLSafeTimedSerializer
+from itsdangerous.timed import TimestampSigner
+
+from auth_tokens import TokenSigner, bearer_token
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Set the signing clock with clock["now"]"""
+    clock = {"now": 1_700_000_000}
+    monkeypatch.setattr(TimestampSigner, "get_timestamp", lambda self: clock["now"])
+    return clock
+
+@pytest.fixture
+def patient(demo_system):
+    return demo_system.auth_system.users.get("PAT001")
+
+def test_token_round_trip(patient):
+    signer = TokenSigner("secret")
+
+    assert signer.verify(signer.issue(patient)) == {"user_id": "PAT001", "role": "Patient"}
+
+def test_token_expires_after_max_age(clock, patient):
+    signer = TokenSigner("secret", max_age=60)
+    token = signer.issue(patient)
+
+    clock["now"] += 60
+    assert signer.verify(token) is not None
+    clock["now"] += 1
+    assert signer.verify(token) is None
+
+def test_token_needs_the_same_secret(patient):
+    token = TokenSigner("secret").issue(patient)
+
+    assert TokenSigner("secret").verify(token) is not None  # another worker with the shared secret
+    assert TokenSigner("other").verify(token) is None
+    assert TokenSigner("secret").verify(token[:-2] + "xx") is None
+    assert TokenSigner("secret").verify(None) is None
+
+def test_authenticate_checks_user_and_role(clock, demo_system, patient):
+    auth = demo_system.auth_system
+    auth.tokens = TokenSigner("secret", max_age=60)
+    token = auth.issue_token(patient)
+
+    assert auth.authenticate(token) is patient
+    patient.role = "Doctor"
+    assert auth.authenticate(token) is None
+    patient.role = "Patient"
+    clock["now"] += 61
+    assert auth.authenticate(token) is None
+
+@pytest.mark.parametrize("header, token", [
+    ("Bearer abc.def", "abc.def"),
+    ("bearer  abc.def ", "abc.def"),
+    ("Basic abc", None),
+    ("Bearer", None),
+    (None, None)
+])
+def test_bearer_token(header, token):
+    assert bearer_token(header) == token
+
+def test_token_is_signed_with_hmac_sha256(patient):
+    token = TokenSigner("secret").issue(patient)
+    signature = token.rsplit(".", 1)[1]
+
+    assert len(base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))) == hashlib.sha256().digest_size
+    sha1 = URLSafeTimedSerializer("secret", salt=TokenSigner.SALT)
+    assert TokenSigner("secret").verify(sha1.dumps({"uid": "PAT001", "role": "Patient"})) is None
+
+def test_tampered_payload_is_rejected(patient):
+    signer = TokenSigner("secret")
+    _, rest = signer.issue(patient).split(".", 1)
+    forged = base64.urlsafe_b64encode(json.dumps({"uid": "ADM001", "role": "Hospital Admin"}).encode())
+
+    assert signer.verify(forged.decode().rstrip("=") + "." + rest) is None
+
+def test_wrong_salt_is_rejected():
+    other_salt = URLSafeTimedSerializer("secret", salt="another-purpose",
+                                        signer_kwargs={"digest_method": hashlib.sha256})
+
+    assert TokenSigner("secret").verify(other_salt.dumps({"uid": "ADM001", "role": "Hospital Admin"})) is None
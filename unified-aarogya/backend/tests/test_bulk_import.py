@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from bulk_import import bulk_import
+from models.doctor import Doctor
+from models.patient import Patient
+from passwords import hash_password
+from portal_system import HospitalPortalSystem
+
+PATIENTS = [
+    {"name": "Dan Brown", "email": "dan@example.com", "password": "pw1", "age": "41", "gender": "Male",
+     "phone": "555-0101", "address": "1 Main St", "blood_type": "A+", "allergies": "Peanuts;Dust"},
+    {"name": "Eve Stone", "email": "eve@example.com", "password": "pw2", "age": "29", "gender": "Female",
+     "phone": "555-0102", "address": "", "blood_type": "", "allergies": ""},
+    {"name": "Finn Lee", "email": "finn@example.com", "password": "pw3", "age": "7", "gender": "Male",
+     "phone": "555-0103", "address": "3 Elm St", "blood_type": "O-", "allergies": "Latex"}
+]
+COMPARED = ("name", "email", "role", "age", "gender", "phone", "address", "blood_type", "allergies",
+            "specialization", "license_number", "years_experience", "consultation_fee")
+
+def write_csv(path, rows, columns):
+    lines = [",".join(columns)] + [",".join(str(row.get(column, "")) for column in columns) for row in rows]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def profile(user):
+    return {field: getattr(user, field) for field in COMPARED if hasattr(user, field)}
+
+def test_matches_sequential_registration(demo_system, tmp_path):
+    path = write_csv(tmp_path / "patients.csv", PATIENTS, list(PATIENTS[0]))
+    report = bulk_import(demo_system, path, role="Patient", workers=1)
+    assert report.imported == {"Patient": 3, "Doctor": 0} and report.duplicates == report.invalid == 0
+
+    reference = HospitalPortalSystem()
+    reference.initialize_demo_data()
+    admin = reference.auth_system.users.get("ADM001")
+    for row in PATIENTS:
+        patient = Patient(row["email"], row["name"], row["email"], row["password"], int(row["age"]),
+                          row["gender"], row["phone"], row["address"])
+        patient.blood_type = row["blood_type"] or None
+        patient.allergies = [allergy for allergy in row["allergies"].split(";") if allergy]
+        reference.auth_system.register_user(patient)
+        admin.add_patient(patient)
+
+    imported = demo_system.auth_system.users
+    for row in PATIENTS:
+        user = imported.get_by_email(row["email"])
+        assert profile(user) == profile(reference.auth_system.users.get_by_email(row["email"]))
+        assert user.user_id.startswith("PAT")
+        assert demo_system.auth_system.login(row["email"], row["password"]) is user
+    assert len(demo_system.auth_system.users.get("ADM001").managed_patients) == \
+        len(admin.managed_patients)
+
+def test_duplicates_and_invalid_rows_are_skipped(demo_system, tmp_path):
+    rows = PATIENTS + [
+        dict(PATIENTS[0], name="Dan Again", email="DAN@example.com"),  # same email, other case
+        dict(PATIENTS[1], email="alice@email.com"),  # already registered
+        dict(PATIENTS[2], email="not-an-email"),
+        dict(PATIENTS[2], email="kid@example.com", age="200")
+    ]
+    path = write_csv(tmp_path / "patients.csv", rows, list(PATIENTS[0]))
+    before = len(demo_system.auth_system.users)
+
+    report = bulk_import(demo_system, path, role="Patient", workers=1)
+    assert (report.rows, report.imported["Patient"], report.duplicates, report.invalid) == (7, 3, 2, 2)
+    assert [line for line, _ in report.errors] == [7, 8]
+    assert len(demo_system.auth_system.users) == before + 3
+    assert demo_system.auth_system.users.get_by_email("dan@example.com").name == "Dan Brown"
+    assert demo_system.auth_system.users.get_by_email("alice@email.com").name == "Alice Smith"
+
+def test_batches_and_ids(demo_system, tmp_path):
+    rows = [dict(PATIENTS[0], email=f"p{index}@example.com", user_id=user_id)
+            for index, user_id in enumerate(["PAT001", "PAT_NEW", "PAT_NEW", "", "PAT_LAST"])]
+    path = write_csv(tmp_path / "patients.csv", rows, list(PATIENTS[0]) + ["user_id"])
+    batches = []
+
+    report = bulk_import(demo_system, path, role="Patient", workers=1, chunk_size=3, batch_size=2,
+                         on_batch=lambda users: batches.append([user.user_id for user in users]))
+    assert report.imported["Patient"] == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    ids = [user_id for batch in batches for user_id in batch]
+    assert len(set(ids)) == 5 and all(user_id.startswith("PAT") for user_id in ids)
+    assert ids[1] == "PAT_NEW" and ids[2] != "PAT_NEW" and ids[4] == "PAT_LAST"
+    assert ids[0] != "PAT001" and demo_system.auth_system.users.get("PAT001").name == "Alice Smith"
+
+def test_ndjson_doctors_with_worker_processes(demo_system, tmp_path):
+    hashed = hash_password("doc-pw", 1000)
+    doctors = [{"role": "doctor", "name": f"Dr. Test {index}", "email": f"doc{index}@example.com",
+                "password": hashed if index % 2 else "doc-pw", "specialization": "Neurology",
+                "license_number": f"LIC{index}", "years_experience": index, "consultation_fee": 100 + index}
+               for index in range(20)]
+    path = tmp_path / "doctors.ndjson"
+    path.write_text("\n".join(json.dumps(doctor) for doctor in doctors) + "\n")
+
+    report = bulk_import(demo_system, str(path), workers=2, chunk_size=4, batch_size=6)
+    assert report.imported == {"Doctor": 20, "Patient": 0}
+    admin = demo_system.auth_system.users.get("ADM001")
+    for index, doctor in enumerate(doctors):
+        user = demo_system.auth_system.users.get_by_email(doctor["email"])
+        assert isinstance(user, Doctor) and user.user_id.startswith("DOC")
+        assert (user.years_experience, user.consultation_fee) == (index, 100 + index)
+        assert user in admin.managed_doctors
+    assert demo_system.auth_system.login("doc1@example.com", "doc-pw") is not None
+    assert demo_system.auth_system.login("doc2@example.com", "doc-pw") is not None
+
+@pytest.mark.parametrize("row, message", [
+    ({"role": "nurse"}, "role"),
+    ({"role": "patient", "name": "X"}, "missing"),
+    ({"role": "doctor", "name": "X", "email": "x@example.com", "password": "p", "specialization": "S",
+      "license_number": "L", "years_experience": "-1"}, "years_experience")
+])
+def test_invalid_ndjson_rows(demo_system, tmp_path, row, message):
+    path = tmp_path / "rows.ndjson"
+    path.write_text(json.dumps(row) + "\n[1, 2]\n")
+
+    report = bulk_import(demo_system, str(path), workers=1)
+    assert report.invalid == 2 and report.imported == {"Patient": 0, "Doctor": 0}
+    assert message in report.errors[0][1] and report.errors[1] == (2, "expected a JSON object")
@@ -0,0 +1,65 @@
+import pytest
+
+@pytest.mark.parametrize("path, email, password", [
+    ("/api/patient/dashboard", "alice@email.com", "pat123"),
+    ("/api/doctor/dashboard", "sarah@hospital.com", "doc123"),
+    ("/api/admin/dashboard", "admin@hospital.com", "admin123")
+])
+def test_unchanged_dashboard_is_not_modified(client, login_headers, path, email, password):
+    headers = login_headers(email, password)
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    etag = first.headers["ETag"]
+
+    again = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+def test_change_gives_a_new_etag(app_module, client, login_headers):
+    headers = login_headers("bob@email.com", "pat123")
+    etag = client.get("/api/patient/dashboard", headers=headers).headers["ETag"]
+
+    app_module.portal_system.auth_system.users.get("PAT002").add_allergy("Aspirin")
+    changed = client.get("/api/patient/dashboard", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "Aspirin" in changed.get_json()["dashboard"]["user_info"]["allergies"]
+
+def test_etag_is_per_user(client, login_headers):
+    alice = client.get("/api/patient/dashboard", headers=login_headers("alice@email.com", "pat123"))
+    carol_headers = login_headers("carol@email.com", "pat123")
+
+    response = client.get("/api/patient/dashboard", headers={**carol_headers, "If-None-Match": alice.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.get_json()["dashboard"]["user_info"]["name"] == "Carol Davis"
+
+def test_dashboard_needs_the_right_role(client, login_headers):
+    assert client.get("/api/admin/dashboard").status_code == 401
+    response = client.get("/api/admin/dashboard", headers=login_headers("alice@email.com", "pat123"))
+    assert response.status_code == 401
+
+def test_workers_agree_on_the_etag(app_module, tmp_path):
+    from portal_system import HospitalPortalSystem
+    from storage import SharedState, open_state_backend
+
+    # Two systems on one shared state file, like two gunicorn workers behind a load balancer
+    url = f"sqlite:///{tmp_path / 'state.db'}"
+    first, second = HospitalPortalSystem(), HospitalPortalSystem()
+    states = [SharedState(system, open_state_backend(url)) for system in (first, second)]
+    for state in states:
+        state.attach()
+    first.initialize_demo_data()
+    states[1].sync()
+
+    tags = {}
+    for user_id in ("PAT001", "DOC001", "ADM001"):
+        tags[user_id], body = app_module.dashboard_json(first.auth_system.users.get(user_id))
+        assert app_module.dashboard_json(second.auth_system.users.get(user_id)) == (tags[user_id], body)
+
+    first.auth_system.users.get("PAT001").add_allergy("Pollen")
+    states[1].sync()
+    etag, _ = app_module.dashboard_json(first.auth_system.users.get("PAT001"))
+    assert etag != tags["PAT001"]
+    assert app_module.dashboard_json(second.auth_system.users.get("PAT001"))[0] == etag
@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from portal_system import HospitalPortalSystem
+from synthetic_data import ADMIN_EMAIL, SyntheticHospital
+
+@pytest.fixture(scope="module")
+def current_hospital():
+    """A synthetic hospital around today, so dashboards have past, today's and upcoming appointments"""
+    system = HospitalPortalSystem()
+    SyntheticHospital(seed=11, doctors=6, patients=120, appointments=2_000, records=50, anchor=date.today(),
+                      past_days=3, future_days=3).populate(system)
+    return system, system.auth_system.users.get_by_email(ADMIN_EMAIL)
+
+def _scan(appointments, status, start, end=None):
+    """Matching appointments by linear scan, earliest first"""
+    return sorted((a for a in appointments if a.status == status and a.date >= start and (end is None or a.date < end)),
+                  key=lambda a: a.date)
+
+def test_doctor_dashboards_match_a_scan(current_hospital):
+    _, admin = current_hospital
+    for doctor in admin.managed_doctors:
+        now = datetime.now()
+        today = datetime.combine(now.date(), datetime.min.time())
+        tomorrow = today + timedelta(days=1)
+        appointments = doctor.appointments
+        dashboard = doctor.get_dashboard_data()
+        upcoming_today = _scan(appointments, "scheduled", now, tomorrow)
+
+        assert dashboard["today_appointments"] == len(_scan(appointments, "scheduled", today, tomorrow))
+        assert dashboard["pending_appointments"] == len(_scan(appointments, "scheduled", now))
+        assert dashboard["completed_today"] == len(_scan(appointments, "completed", today, tomorrow))
+        assert dashboard["next_appointment"] in (upcoming_today[:1] or [None])
+
+def test_patient_dashboards_match_a_scan(current_hospital):
+    _, admin = current_hospital
+    for patient in admin.managed_patients[::6]:
+        now = datetime.now()
+        upcoming = _scan(patient.appointments, "scheduled", now)
+        dashboard = patient.get_dashboard_data()
+
+        assert dashboard["upcoming_appointments"] == len(upcoming)
+        assert dashboard["total_appointments"] == len(patient.appointments)
+        assert dashboard["next_appointment"] in (upcoming[:1] or [None])
+
+def test_dashboards_follow_changes(current_hospital):
+    _, admin = current_hospital
+    doctor = max(admin.managed_doctors, key=lambda d: len(_scan(d.appointments, "scheduled", datetime.now())))
+    upcoming = _scan(doctor.appointments, "scheduled", datetime.now())
+    before = doctor.get_dashboard_data()["pending_appointments"]
+
+    upcoming[0].cancel_appointment()
+    upcoming[1].complete_appointment("Seen early")
+    assert doctor.get_dashboard_data()["pending_appointments"] == before - 2
+
+    upcoming[0].cancel_appointment()  # already cancelled; counts stay put
+    patient = admin.find_patient_by_id(upcoming[2].patient_id)
+    patient.book_appointment(doctor.user_id, datetime.now() + timedelta(hours=1), "Urgent")
+    assert doctor.get_dashboard_data()["pending_appointments"] == before - 1
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.patient import Patient
+from portal_system import HospitalPortalSystem
+
+START = datetime(2030, 5, 6, 8, 0)
+
+@pytest.fixture
+def clinic():
+    """Three cardiologists with different hours over two days, one neurologist and one patient"""
+    system = HospitalPortalSystem()
+    admin = HospitalAdmin("ADM1", "Admin", "admin@x.com", "pw", "super")
+    doctors = [Doctor(f"DOC{number}", f"Dr. {number}", f"doc{number}@x.com", "pw", specialization, f"LIC{number}", 5)
+               for number, specialization in enumerate(["Cardiology", "Cardiology", "cardiology", "Neurology"])]
+    patient = Patient("PAT1", "Pat", "pat@x.com", "pw", 40, "Male", "555", "")
+    system.auth_system.register_users([admin, patient] + doctors)
+    admin.add_doctors(doctors)
+    admin.add_patient(patient)
+    for day in range(2):
+        date = START + timedelta(days=day)
+        doctors[0].set_availability(date, "09:00", "12:00")
+        doctors[1].set_availability(date, "08:30", "10:00")
+        doctors[2].schedule.add_availability(date, "09:15", "11:00", slot_duration=15)
+        doctors[3].set_availability(date, "08:00", "18:00")
+    return admin, doctors, patient
+
+def _brute_force(doctors, start, end):
+    """Every free slot of every doctor, from the per-day listings, in time order"""
+    slots = []
+    for doctor in doctors:
+        day = start
+        while day.date() <= end.date():
+            for time in doctor.schedule.get_available_slots(day):
+                slot = datetime.combine(day.date(), datetime.strptime(time, "%H:%M").time())
+                if start <= slot < end:
+                    slots.append((slot, doctor.user_id))
+            day += timedelta(days=1)
+    return sorted(slots)
+
+def test_earliest_slots_match_a_full_listing(clinic):
+    admin, doctors, _ = clinic
+    found = admin.find_earliest_available_slots("CARDIOLOGY", limit=25, days=3, start=START)
+
+    expected = _brute_force(doctors[:3], START, START + timedelta(days=3))[:25]
+    assert [(f"{slot:%Y-%m-%d}", f"{slot:%H:%M}", doctor_id) for slot, doctor_id in expected] == \
+        [(s["date"], s["time"], s["doctor_id"]) for s in found]
+    assert admin.find_earliest_available_slots("Dermatology", start=START) == []
+
+def test_booked_slot_is_no_longer_offered(clinic):
+    admin, doctors, patient = clinic
+    appointment_id = patient.book_appointment("DOC1", START.replace(hour=8, minute=30, second=12), "Checkup")
+
+    first = admin.find_earliest_available_slots("Cardiology", limit=1, start=START)[0]
+    assert (first["doctor_id"], first["time"]) == ("DOC0", "09:00")
+    offered = [(s["doctor_id"], s["time"]) for s in admin.find_earliest_available_slots(
+        "Cardiology", 50, days=1, start=START)]
+    assert ("DOC1", "08:30") not in offered and ("DOC1", "09:00") in offered
+
+    patient.repository.get(appointment_id).cancel_appointment()
+    first = admin.find_earliest_available_slots("Cardiology", limit=1, start=START)[0]
+    assert (first["doctor_id"], first["time"]) == ("DOC1", "08:30")
+
+def test_rescheduled_appointment_moves_its_hold(clinic):
+    admin, doctors, patient = clinic
+    appointment_id = patient.book_appointment("DOC3", START.replace(hour=8), "Headache")
+    patient.repository.get(appointment_id).reschedule(START.replace(hour=8, minute=30))
+
+    times = [s["time"] for s in admin.find_earliest_available_slots("Neurology", limit=3, start=START)]
+    assert times == ["08:00", "09:00", "09:30"]
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+MARCH = {"start": "2030-03-01", "end": "2030-04-01"}
+
+@pytest.fixture(scope="module")
+def march_appointments(app_module):
+    """Four appointments well after the demo ones: three in March 2030, one on April 1st"""
+    users = app_module.portal_system.auth_system.users
+    appointments = app_module.portal_system.auth_system.appointments
+    booked = [
+        users.get("PAT001").book_appointment("DOC001", datetime(2030, 3, 1, 10), "Checkup"),
+        users.get("PAT002").book_appointment("DOC002", datetime(2030, 3, 5, 11), "Fever"),
+        users.get("PAT003").book_appointment("DOC001", datetime(2030, 3, 10, 9), "Back pain"),
+        users.get("PAT001").book_appointment("DOC003", datetime(2030, 4, 1, 14), "Follow up")
+    ]
+    appointments.get(booked[0]).complete_appointment("Healthy")
+    appointments.get(booked[2]).cancel_appointment()
+    return booked
+
+@pytest.fixture
+def admin_headers(login_headers):
+    return login_headers("admin@hospital.com", "admin123")
+
+# Exports stream inside the request context, so read each response before sending the next request
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+def _csv(response):
+    return list(csv.DictReader(io.StringIO(response.data.decode())))
+
+def test_appointments_between_dates(client, admin_headers, march_appointments):
+    response = client.get("/admin/export/appointments.ndjson", query_string=MARCH, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [row["appointment_id"] for row in _ndjson(response)] == march_appointments[:3]
+
+def test_appointments_by_status_and_fields(client, admin_headers, march_appointments):
+    response = client.get("/admin/export/appointments.csv", headers=admin_headers,
+                          query_string={**MARCH, "status": "cancelled", "fields": "appointment_id,status"})
+
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == "attachment; filename=appointments.csv"
+    assert _csv(response) == [{"appointment_id": march_appointments[2], "status": "cancelled"}]
+
+def test_patients_by_registration_date(client, admin_headers):
+    everyone = _ndjson(client.get("/admin/export/patients.ndjson", headers=admin_headers,
+                                  query_string={"start": "2000-01-01", "fields": "user_id,name"}))
+    nobody = _csv(client.get("/admin/export/patients.csv", headers=admin_headers,
+                             query_string={"start": "2100-01-01"}))
+
+    assert [row["user_id"] for row in everyone] == ["PAT001", "PAT002", "PAT003"]
+    assert set(everyone[0]) == {"user_id", "name"}
+    assert nobody == []
+
+def test_doctor_utilization_filters(client, admin_headers, march_appointments):
+    march = _csv(client.get("/admin/export/doctor_utilization.csv", query_string=MARCH, headers=admin_headers))
+    completed = _ndjson(client.get("/admin/export/doctor_utilization.ndjson", headers=admin_headers,
+                                   query_string={**MARCH, "status": "completed"}))
+
+    assert {row["doctor_id"]: row["appointments"] for row in march} == {"DOC001": "2", "DOC002": "1", "DOC003": "0"}
+    assert {row["doctor_id"]: row["appointments"] for row in completed} == {"DOC001": 1, "DOC002": 0, "DOC003": 0}
+
+@pytest.mark.parametrize("path, query, status", [
+    ("/admin/export/appointments.csv", {"fields": "appointment_id,password"}, 400),
+    ("/admin/export/appointments.csv", {"start": "not-a-date"}, 400),
+    ("/admin/export/appointments.xml", {}, 404),
+    ("/admin/export/invoices.csv", {}, 404)
+])
+def test_bad_export_requests(client, admin_headers, path, query, status):
+    assert client.get(path, query_string=query, headers=admin_headers).status_code == status
+
+def test_exports_need_an_admin(client, login_headers):
+    patient_headers = login_headers("alice@email.com", "pat123")
+
+    assert client.get("/admin/export/patients.csv").status_code == 403
+    assert client.get("/admin/export/patients.csv", headers=patient_headers).status_code == 403
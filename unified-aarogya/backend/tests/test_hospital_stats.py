@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from models.hospital_admin import HospitalStats
+from models.patient import Patient
+
+def _recounted(admin):
+    stats = HospitalStats()
+    stats.update_stats(admin.managed_patients, admin.managed_doctors)
+    return stats
+
+def _snapshot(stats):
+    days = {day: {status: count for status, count in counts.items() if count}
+            for day, counts in stats.daily_appointments.items()}
+    return {
+        "total_patients": stats.total_patients,
+        "total_doctors": stats.total_doctors,
+        "total_appointments": stats.total_appointments,
+        "departments": stats.departments,
+        "appointment_status": stats.appointment_status,
+        "daily_appointments": {day: counts for day, counts in days.items() if counts},
+        "new_patients_this_week": stats.new_patients_this_week()
+    }
+
+def test_incremental_stats_match_a_recount(small_hospital):
+    system, admin = small_hospital
+    assert _snapshot(admin.hospital_stats) == _snapshot(_recounted(admin))
+
+    appointments = system.auth_system.appointments
+    scheduled = list(appointments.with_status("scheduled"))
+    scheduled[0].complete_appointment("Fine")
+    scheduled[1].cancel_appointment()
+    scheduled[2].reschedule(scheduled[2].date + timedelta(days=3))
+    patient = admin.managed_patients[5]
+    patient.book_appointment(admin.managed_doctors[0].user_id, scheduled[3].date, "Follow up")
+    admin.remove_doctor(admin.managed_doctors[-1].user_id)
+
+    # A patient joining with history brings their appointments along
+    newcomer = Patient("PAT_NEW", "New Patient", "new@x.com", "pw", 50, "Other", "555", "")
+    system.auth_system.register_user(newcomer)
+    newcomer.book_appointment(admin.managed_doctors[1].user_id, scheduled[4].date, "Referral")
+    admin.add_patient(newcomer)
+
+    assert _snapshot(admin.hospital_stats) == _snapshot(_recounted(admin))
+    assert admin.hospital_stats.total_appointments == sum(p.count_appointments() for p in admin.managed_patients)
+
+def test_appointments_of_other_patients_are_ignored(small_hospital):
+    system, admin = small_hospital
+    before = _snapshot(admin.hospital_stats)
+    stranger = Patient("PAT_OTHER", "Stranger", "stranger@x.com", "pw", 30, "Male", "555", "")
+    system.auth_system.register_user(stranger)
+    stranger.book_appointment(admin.managed_doctors[0].user_id, admin.managed_patients[0].appointments[0].date,
+                              "Walk-in")
+
+    assert _snapshot(admin.hospital_stats) == before
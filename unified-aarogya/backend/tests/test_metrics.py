@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from metrics import (LATENCY_BUCKETS, UNMATCHED, MetricsMiddleware, RequestMetrics, estimate_quantile,
+                     mark_endpoint)
+
+def samples(text):
+    """{metric with labels: value} from a Prometheus text exposition, checking every line parses"""
+    values = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            assert re.match(r"# (HELP|TYPE) aarogya_\w+ ", line)
+            continue
+        name, value = line.rsplit(" ", 1)
+        values[name] = float(value)
+    return values
+
+def record(metrics, endpoint, status, seconds, size, method="GET"):
+    metrics.started(method, endpoint)
+    metrics.finished(method, endpoint, status, seconds, size, True)
+
+def test_render_counters_and_histograms():
+    metrics = RequestMetrics()
+    record(metrics, "/api/doctors", "200", 0.004, 300)
+    record(metrics, "/api/doctors", "200", 0.2, 5000)
+    record(metrics, "/api/doctors", "400", 20.0, 100)
+    metrics.started("GET", "/api/doctors")  # still in flight
+
+    text = metrics.render()
+    values = samples(text)
+    labels = 'endpoint="/api/doctors",method="GET"'
+    assert values[f'aarogya_http_requests_total{{{labels},status="200"}}'] == 2
+    assert values[f'aarogya_http_requests_total{{{labels},status="400"}}'] == 1
+    assert values[f'aarogya_http_request_duration_seconds_bucket{{{labels},le="0.005"}}'] == 1
+    assert values[f'aarogya_http_request_duration_seconds_bucket{{{labels},le="0.25"}}'] == 2
+    assert values[f'aarogya_http_request_duration_seconds_bucket{{{labels},le="10.0"}}'] == 2
+    assert values[f'aarogya_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 3
+    assert values[f'aarogya_http_request_duration_seconds_count{{{labels}}}'] == 3
+    assert values[f'aarogya_http_request_duration_seconds_sum{{{labels}}}'] == pytest.approx(20.204)
+    assert values[f'aarogya_http_response_size_bytes_bucket{{{labels},le="128"}}'] == 1
+    assert values[f'aarogya_http_response_size_bytes_sum{{{labels}}}'] == 5400
+    assert values[f'aarogya_http_requests_in_flight{{{labels}}}'] == 1
+    assert values["aarogya_metrics_workers"] == 1
+    assert "# TYPE aarogya_http_request_duration_seconds histogram" in text
+    assert text.endswith("\n")
+
+def test_labels_are_escaped():
+    metrics = RequestMetrics()
+    record(metrics, '/odd"path\\', "200", 0.01, 10)
+    assert 'endpoint="/odd\\"path\\\\"' in metrics.render()
+
+def test_estimate_quantile():
+    counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    assert estimate_quantile(LATENCY_BUCKETS, counts, 0.5) == 0.0
+    counts[LATENCY_BUCKETS.index(0.1)] = 10  # ten requests between 0.075 and 0.1 seconds
+    assert estimate_quantile(LATENCY_BUCKETS, counts, 0.5) == pytest.approx(0.0875)
+    counts[-1] = 90  # the slowest ones are over the last bound
+    assert estimate_quantile(LATENCY_BUCKETS, counts, 0.99) == LATENCY_BUCKETS[-1]
+
+def test_workers_are_merged_through_files(tmp_path):
+    metrics = RequestMetrics(str(tmp_path))
+    record(metrics, "/login", "200", 0.01, 50, method="POST")
+
+    other = RequestMetrics()
+    record(other, "/login", "401", 0.02, 60, method="POST")
+    other.started("POST", "/login")
+    document = other.snapshot()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    for pid in (os.getppid(), exited.pid):  # a running worker and one that has exited
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(dict(document, pid=pid)))
+    (tmp_path / "metrics-junk.json").write_text("{}")
+
+    values = samples(metrics.render())
+    labels = 'endpoint="/login",method="POST"'
+    assert values[f'aarogya_http_requests_total{{{labels},status="200"}}'] == 1
+    assert values[f'aarogya_http_requests_total{{{labels},status="401"}}'] == 2
+    assert values[f'aarogya_http_requests_in_flight{{{labels}}}'] == 1  # only the running worker's
+    assert values["aarogya_metrics_workers"] == 2
+
+    metrics.flush()
+    assert json.loads((tmp_path / f"metrics-{os.getpid()}.json").read_text()) == metrics.snapshot()
+
+def test_middleware_measures_streamed_bodies():
+    metrics = RequestMetrics()
+
+    def app(environ, start_response):
+        if environ["PATH_INFO"] == "/boom":
+            raise RuntimeError("boom")
+        if environ["PATH_INFO"] == "/stream":
+            mark_endpoint(metrics, environ, "GET", "/stream")
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return iter([b"abc", b"defg"])
+
+    middleware = MetricsMiddleware(app, metrics)
+    body = middleware({"REQUEST_METHOD": "GET", "PATH_INFO": "/stream"}, lambda status, headers, exc_info=None: None)
+    assert metrics.merged()[0][("GET", "/stream")].in_flight == 1
+    assert b"".join(body) == b"abcdefg"
+    body.close()
+    middleware({"REQUEST_METHOD": "GET", "PATH_INFO": "/missing"}, lambda *args: None).close()
+    with pytest.raises(RuntimeError):
+        middleware({"REQUEST_METHOD": "GET", "PATH_INFO": "/boom"}, lambda *args: None)
+
+    totals = metrics.merged()[0]
+    stream = totals[("GET", "/stream")]
+    assert (stream.count, stream.size_sum, stream.statuses, stream.in_flight) == (1, 7, {"200": 1}, 0)
+    assert totals[("GET", UNMATCHED)].statuses == {"200": 1, "500": 1}
+
+def test_metrics_route(client, monkeypatch):
+    client.get("/api/user_info").close()  # a request is recorded when the server closes its body
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/plain; version=0.0.4; charset=utf-8"
+    values = samples(response.get_data(as_text=True))
+    assert values['aarogya_http_requests_total{endpoint="/api/user_info",method="GET",status="401"}'] >= 1
+
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from models.patient import MedicalRecord, Patient
+from portal_system import HospitalPortalSystem
+from storage import MongoStore, connect
+
+@pytest.fixture
+def store():
+    store = MongoStore(connect("mongomock://localhost", "aarogya_test"))
+    store.ensure_indexes()
+    return store
+
+def _add_record(system):
+    patient = system.auth_system.users.get("PAT001")
+    record = MedicalRecord("MR_TEST_1", "PAT001", "DOC001", "Mild hypertension", "Reduce salt",
+                           datetime(2025, 3, 1, 9, 30))
+    record.add_medication("Lisinopril", "10mg", "30 days")
+    record.add_lab_result("Blood pressure", "140/90", "120/80")
+    patient.add_medical_record(record)
+
+def test_save_system_writes_every_collection(store, demo_system):
+    _add_record(demo_system)
+    counts = store.save_system(demo_system)
+
+    assert counts == {"admins": 1, "doctors": 3, "patients": 3, "appointments": 2, "medical_records": 1}
+    assert store.patients.find_one({"_id": "PAT001"})["allergies"] == ["Penicillin"]
+    assert store.admins.find_one({"_id": "ADM001"})["managed_patients"] == ["PAT001", "PAT002", "PAT003"]
+
+def test_save_upserts_instead_of_duplicating(store, demo_system):
+    patient = demo_system.auth_system.users.get("PAT002")
+    store.save(patient)
+    patient.phone = "555-9999"
+    store.save(patient)
+
+    assert store.patients.count_documents({}) == 1
+    assert store.patients.find_one({"_id": "PAT002"})["phone"] == "555-9999"
+
+def test_ensure_indexes_rejects_duplicate_email(store):
+    store.save(Patient("PAT_A", "First", "same@example.com", "pw", 30, "Female", "1", ""))
+    with pytest.raises(BulkWriteError):
+        store.save(Patient("PAT_B", "Second", "same@example.com", "pw", 40, "Male", "2", ""))
+
+    assert store.patients.count_documents({"email": "same@example.com"}) == 1
+
+def test_load_into_round_trip(store, demo_system):
+    _add_record(demo_system)
+    appointment = demo_system.auth_system.users.get("PAT001").appointments[0]
+    appointment.complete_appointment("All clear", "Rest", "Follow up in a month")
+    store.save_system(demo_system)
+
+    restored = HospitalPortalSystem()
+    loaded = store.load_into(restored)
+    assert loaded == {"admins": 1, "doctors": 3, "patients": 3, "appointments": 2, "medical_records": 1}
+
+    users = restored.auth_system.users
+    patient = users.get("PAT003")
+    assert (patient.name, patient.email, patient.age, patient.blood_type) == ("Carol Davis", "carol@email.com", 35, "B+")
+    assert patient.allergies == ["Shellfish", "Latex"]
+    assert users.get_by_email("SARAH@hospital.com").user_id == "DOC001"
+
+    doctor = users.get("DOC001")
+    original = demo_system.auth_system.users.get("DOC001")
+    tomorrow = datetime.now() + timedelta(days=1)
+    assert doctor.qualifications == original.qualifications
+    assert doctor.schedule.get_available_slots(tomorrow) == original.schedule.get_available_slots(tomorrow)
+
+    admin = users.get("ADM001")
+    assert [d.user_id for d in admin.managed_doctors] == ["DOC001", "DOC002", "DOC003"]
+    assert admin.find_patient_by_id("PAT002") is users.get("PAT002")
+    assert admin.hospital_stats.total_appointments == 2
+
+    restored_appointment = restored.auth_system.appointments.get(appointment.appointment_id)
+    assert restored_appointment.status == "completed"
+    assert restored_appointment.diagnosis == "All clear"
+    assert [a.appointment_id for a in users.get("PAT001").appointments] == [appointment.appointment_id]
+
+    record = users.get("PAT001").medical_history[0]
+    assert (record.record_id, record.diagnosis, record.date) == ("MR_TEST_1", "Mild hypertension",
+                                                                 datetime(2025, 3, 1, 9, 30))
+    assert [med.medication for med in record.medications] == ["Lisinopril"]
+    assert record.lab_results["Blood pressure"].result == "140/90"
+
+def test_load_into_keeps_systems_apart(store, demo_system):
+    store.save_system(demo_system)
+    first, second = HospitalPortalSystem(), HospitalPortalSystem()
+    store.load_into(first)
+    store.load_into(second)
+
+    assert len(first.auth_system.appointments) == 2
+    assert len(second.auth_system.appointments) == 2
@@ -0,0 +1,76 @@
+import pytest
+
+from models.pagination import MAX_PAGE_SIZE, encode_cursor
+
+def _walk(fetch, limit, cursor=None):
+    """Every item from following next_cursor until the last page"""
+    items = []
+    while True:
+        page = fetch(cursor, limit)
+        assert len(page) <= limit
+        items.extend(page.items)
+        if page.next_cursor is None:
+            return items
+        cursor = page.next_cursor
+
+@pytest.mark.parametrize("limit", [1, 7, 50, MAX_PAGE_SIZE])
+def test_page_walks_every_appointment_once(small_hospital, limit):
+    appointments = small_hospital[0].auth_system.appointments
+    walked = _walk(lambda cursor, size: appointments.page(cursor, size), limit)
+
+    assert len(walked) == len(appointments)
+    assert len({appointment.appointment_id for appointment in walked}) == len(appointments)
+
+@pytest.mark.parametrize("status", ["scheduled", "completed", "cancelled"])
+def test_status_pages_match_a_filtered_walk(small_hospital, status):
+    appointments = small_hospital[0].auth_system.appointments
+    everything = _walk(lambda cursor, size: appointments.page(cursor, size), MAX_PAGE_SIZE)
+    wanted = [appointment for appointment in everything if appointment.status == status]
+
+    assert _walk(lambda cursor, size: appointments.page(cursor, size, status), 13) == wanted
+    assert len(wanted) == appointments.count_status(status)
+
+def test_owner_pages_follow_status_changes(small_hospital):
+    system, admin = small_hospital
+    appointments = system.auth_system.appointments
+    doctor = admin.managed_doctors[1]
+
+    def scheduled_for_doctor(cursor=None):
+        return _walk(lambda cursor, size: appointments.page_for_owner(doctor.user_id, cursor, size, "scheduled"),
+                     5, cursor)
+
+    before = scheduled_for_doctor()
+    assert before == [a for a in appointments.for_doctor(doctor.user_id) if a.status == "scheduled"]
+
+    # A cursor stays valid when its appointment leaves the status being paged
+    first = appointments.page_for_owner(doctor.user_id, None, 2, "scheduled")
+    first.items[-1].cancel_appointment()
+    assert first.items[:1] + scheduled_for_doctor(first.next_cursor) == before[:1] + before[2:]
+
+def test_last_page_has_no_cursor(small_hospital):
+    appointments = small_hospital[0].auth_system.appointments
+    empty = appointments.page_for_owner("NO_SUCH_DOCTOR", None, 10, "scheduled")
+
+    assert empty.items == [] and empty.next_cursor is None
+    assert appointments.page(None, len(appointments)).next_cursor is not None  # capped at MAX_PAGE_SIZE
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("patients", "PAT001"),
+                                    encode_cursor("appointments", "APT_MISSING")])
+def test_invalid_cursor(small_hospital, cursor):
+    appointments = small_hospital[0].auth_system.appointments
+
+    with pytest.raises(ValueError):
+        appointments.page(cursor, 10)
+
+@pytest.mark.parametrize("path", ["/api/patients", "/api/doctors", "/api/appointments"])
+def test_listings_need_a_login(client, path):
+    assert client.get(path).status_code == 401
+
+def test_patient_listing_needs_an_admin(client, login_headers):
+    response = client.get("/api/patients", headers=login_headers("alice@email.com", "pat123"))
+    assert response.status_code == 403
+
+    response = client.get("/api/patients", query_string={"limit": 2},
+                          headers=login_headers("admin@hospital.com", "admin123"))
+    assert response.status_code == 200
+    assert len(response.get_json()["patients"]) == 2 and response.get_json()["next_cursor"]
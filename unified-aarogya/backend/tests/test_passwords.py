@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import threading
+
+import passwords
+
+from models.patient import Patient
+from passwords import PasswordHasher, hash_password, is_hashed, verify_password
+
+def test_hash_round_trip():
+    stored = hash_password("s3cret", iterations=1000)
+
+    assert stored.startswith("pbkdf2_sha256$1000$") and is_hashed(stored)
+    assert verify_password("s3cret", stored)
+    assert not verify_password("S3cret", stored)
+    assert hash_password("s3cret", iterations=1000) != stored  # fresh salt every time
+
+def test_stored_hash_is_standard_pbkdf2():
+    stored = hash_password("pw", iterations=1000)
+    _, _, salt, digest = stored.split("$")
+
+    def unb64(text):
+        return base64.b64decode(text + "=" * (-len(text) % 4))
+
+    assert hashlib.pbkdf2_hmac("sha256", b"pw", unb64(salt), 1000) == unb64(digest)
+
+def test_legacy_plaintext_and_malformed_hashes():
+    assert verify_password("pat123", "pat123") and not is_hashed("pat123")
+    assert not verify_password("pat123", "pbkdf2_sha256$oops")
+    assert not verify_password("pat123", None) and not verify_password(None, "pat123")
+
+def test_hasher_runs_on_its_pool(monkeypatch):
+    hasher = PasswordHasher(iterations=1000, max_workers=2)
+    threads = []
+    for name in ("hash_password", "verify_password"):
+        function = getattr(passwords, name)
+        monkeypatch.setattr(passwords, name, lambda *args, function=function: (
+            threads.append(threading.current_thread().name), function(*args))[1])
+    try:
+        stored = hasher.hash("pw")
+        assert hasher.verify("pw", stored) and not hasher.verify("nope", stored)
+    finally:
+        hasher.shutdown()
+
+    assert len(threads) == 3 and all(name.startswith("password-hash") for name in threads)
+
+def test_needs_rehash():
+    hasher = PasswordHasher(iterations=1000, max_workers=1)
+
+    assert hasher.needs_rehash("plaintext")
+    assert hasher.needs_rehash(hash_password("pw", iterations=2000))
+    assert not hasher.needs_rehash(hash_password("pw", iterations=1000))
+
+def test_login_upgrades_plaintext_and_old_work_factors(demo_system):
+    auth = demo_system.auth_system
+    patient = Patient("PAT_OLD", "Old", "old@x.com", "pw", 60, "Male", "1", "")
+    auth.users.add(patient)  # added directly, as legacy data was, so the password is still plaintext
+    assert patient.password == "pw"
+
+    assert auth.login("old@x.com", "pw") is patient
+    assert is_hashed(patient.password) and not auth.hasher.needs_rehash(patient.password)
+
+    patient.password = hash_password("pw", iterations=auth.hasher.iterations + 1)
+    assert auth.login("old@x.com", "pw") is patient
+    assert not auth.hasher.needs_rehash(patient.password)
+    assert auth.login("old@x.com", "wrong") is None
+
+def test_registration_hashes_passwords(demo_system):
+    alice = demo_system.auth_system.users.get("PAT001")
+
+    assert is_hashed(alice.password) and alice.password != "pat123"
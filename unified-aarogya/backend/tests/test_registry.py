@@ -0,0 +1,47 @@
+from models.doctor import Doctor
+from models.patient import Patient
+from models.registry import UserRegistry
+
+def _patient(user_id, email):
+    return Patient(user_id, f"Patient {user_id}", email, "pw", 30, "Female", "555", "")
+
+def test_lookups_match_a_linear_scan(small_hospital):
+    users = small_hospital[0].auth_system.users
+    everyone = users.values()
+
+    for user in everyone[::25]:
+        assert users.get(user.user_id) is next(u for u in everyone if u.user_id == user.user_id)
+        assert users.get_by_email(user.email.upper()) is next(u for u in everyone if u.email == user.email)
+    for role in ("Patient", "Doctor", "Hospital Admin"):
+        assert users.by_role(role) == [u for u in everyone if u.role == role]
+        assert users.first_with_role(role) is next(u for u in everyone if u.role == role)
+
+def test_duplicate_id_or_email_is_rejected():
+    users = UserRegistry()
+
+    assert users.add(_patient("PAT1", "a@x.com"))
+    assert not users.add(_patient("PAT1", "b@x.com"))
+    assert not users.add(_patient("PAT2", " A@X.com "))
+    assert users.add_many([_patient("PAT2", "a@x.com"), _patient("PAT3", "c@x.com"),
+                           _patient("PAT3", "d@x.com")]) == [users.get("PAT3")]
+    assert len(users) == 2 and not users.has_email("d@x.com")
+
+def test_remove_and_change_email_keep_indexes_in_step():
+    users = UserRegistry()
+    patient, other = _patient("PAT1", "a@x.com"), _patient("PAT2", "b@x.com")
+    doctor = Doctor("DOC1", "Dr. One", "doc@x.com", "pw", "Cardiology", "LIC1", 10)
+    users.add_many([patient, other, doctor])
+
+    assert not users.change_email(patient, "B@x.com")
+    assert users.change_email(patient, "new@x.com")
+    assert users.get_by_email("a@x.com") is None and users.get_by_email("NEW@x.com") is patient
+
+    assert users.remove("DOC1") is doctor
+    assert "DOC1" not in users and users.get_by_email("doc@x.com") is None
+    assert users.by_role("Doctor") == [] and users.remove("DOC1") is None
+
+def test_login_uses_the_email_index(demo_system):
+    auth = demo_system.auth_system
+
+    assert auth.login("  Sarah@Hospital.com ", "doc123").user_id == "DOC001"
+    assert not auth.register_user(_patient("PAT999", "SARAH@hospital.com"))
@@ -0,0 +1,47 @@
+import pytest
+
+from models.analytics import numpy_available
+from models.reports import REPORT_TYPES, ReportEngine
+
+pytestmark = pytest.mark.skipif(not numpy_available(), reason="NumPy is not installed")
+
+def _python_reports(admin):
+    return ReportEngine(admin.managed_patients, admin.managed_doctors).generate(REPORT_TYPES)
+
+def _sorted_specializations(reports):
+    reports["doctor_performance"]["specializations"].sort()
+    return reports
+
+def test_analytics_matches_report_engine(small_hospital):
+    _, admin = small_hospital
+    admin.enable_analytics()
+
+    reports = admin.analytics.generate(REPORT_TYPES)
+    assert reports == _python_reports(admin)
+    assert type(reports["appointment_analytics"]["completion_rate"]) is float
+    assert admin.generate_report("patient_summary") == _python_reports(admin)["patient_summary"]
+
+def test_analytics_follows_model_changes(small_hospital):
+    system, admin = small_hospital
+    admin.enable_analytics()
+    appointments = system.auth_system.appointments
+    scheduled = list(appointments.with_status("scheduled"))
+    scheduled[0].complete_appointment("Recovered")
+    scheduled[1].cancel_appointment()
+    patient = admin.managed_patients[0]
+    patient.update_personal_info(age=70)
+    patient.add_allergy("Peanuts")
+    doctor = admin.managed_doctors[0]
+    doctor.specialization = "Geriatrics"
+    doctor.touch()
+
+    assert (_sorted_specializations(admin.analytics.generate(REPORT_TYPES))
+            == _sorted_specializations(_python_reports(admin)))
+
+def test_invalid_report_type(small_hospital):
+    _, admin = small_hospital
+    admin.enable_analytics()
+
+    assert admin.generate_report("no_such_report") == {"error": "Invalid report type"}
+    with pytest.raises(ValueError):
+        ReportEngine([], []).generate(["no_such_report"])
@@ -0,0 +1,128 @@
+import random
+from datetime import datetime, timedelta
+
+from models.doctor import Doctor, Schedule
+
+DAY = datetime(2025, 6, 2, 8, 0)
+
+class ListSchedule:
+    """The string-list Schedule this module replaced, kept as the reference for its outputs"""
+
+    def __init__(self):
+        self.time_slots = {}  # date -> list of time slots
+        self.booked_slots = {}  # date -> list of booked times
+
+    def add_availability(self, date: datetime, start_time: str, end_time: str, slot_duration: int = 30):
+        date_key = date.date()
+        if date_key not in self.time_slots:
+            self.time_slots[date_key] = []
+            self.booked_slots[date_key] = []
+        start_hour, start_min = map(int, start_time.split(':'))
+        end_hour, end_min = map(int, end_time.split(':'))
+        current_time = datetime.combine(date_key, datetime.min.time().replace(hour=start_hour, minute=start_min))
+        end_time_obj = datetime.combine(date_key, datetime.min.time().replace(hour=end_hour, minute=end_min))
+        while current_time < end_time_obj:
+            self.time_slots[date_key].append(current_time.strftime('%H:%M'))
+            current_time += timedelta(minutes=slot_duration)
+
+    def book_slot(self, date: datetime, time: str) -> bool:
+        date_key = date.date()
+        if date_key in self.time_slots and time in self.time_slots[date_key]:
+            if time not in self.booked_slots[date_key]:
+                self.booked_slots[date_key].append(time)
+                return True
+        return False
+
+    def get_available_slots(self, date: datetime):
+        date_key = date.date()
+        if date_key not in self.time_slots:
+            return []
+        booked = self.booked_slots.get(date_key, [])
+        return [slot for slot in self.time_slots[date_key] if slot not in booked]
+
+def _both():
+    return Schedule(), ListSchedule()
+
+def test_availability_matches_the_list_schedule():
+    new, old = _both()
+    for schedule in (new, old):
+        schedule.add_availability(DAY, "09:00", "12:00")
+        schedule.add_availability(DAY, "14:00", "17:00")
+        schedule.add_availability(DAY + timedelta(days=1), "08:15", "10:00", slot_duration=15)
+        schedule.add_availability(DAY + timedelta(days=2), "23:30", "23:59", slot_duration=10)
+
+    for offset in range(4):
+        day = DAY + timedelta(days=offset)
+        assert new.get_available_slots(day) == old.get_available_slots(day)
+    assert new.time_slots == old.time_slots
+    assert new.get_available_slots(DAY + timedelta(days=3)) == []
+
+def test_book_slot_matches_the_list_schedule():
+    new, old = _both()
+    for schedule in (new, old):
+        schedule.add_availability(DAY, "09:00", "12:00")
+    attempts = [
+        (DAY, "10:00"),  # free
+        (DAY, "10:00"),  # double booking
+        (DAY, "10:15"),  # between offered slots
+        (DAY, "12:00"),  # end of the range is not offered
+        (DAY, "9:00"),   # not in HH:MM form
+        (DAY, "25:00"),
+        (DAY + timedelta(days=1), "10:00"),  # unknown date
+        (DAY, "09:00")
+    ]
+
+    for date, time in attempts:
+        assert new.book_slot(date, time) == old.book_slot(date, time), (date, time)
+    assert new.get_available_slots(DAY) == old.get_available_slots(DAY)
+    assert new.booked_slots == {day: sorted(times) for day, times in old.booked_slots.items()}
+
+def test_random_bookings_match_the_list_schedule():
+    rng = random.Random(2)
+    new, old = _both()
+    days = [DAY + timedelta(days=offset) for offset in range(5)]
+    for day in days:
+        for schedule in (new, old):
+            schedule.add_availability(day, "08:00", "18:00", slot_duration=20)
+
+    for _ in range(300):
+        day = rng.choice(days + [DAY + timedelta(days=9)])
+        time = f"{rng.randrange(7, 19):02d}:{rng.choice((0, 20, 30, 40)):02d}"
+        assert new.book_slot(day, time) == old.book_slot(day, time)
+    for day in days:
+        assert new.get_available_slots(day) == old.get_available_slots(day)
+        assert new.get_booked_slots(day) == sorted(old.booked_slots[day.date()])
+        assert new.count_available_slots(day) == len(old.get_available_slots(day))
+
+def test_booked_slots_come_out_sorted():
+    # The list schedule kept booking order; the bitsets list booked times by time of day
+    new, old = _both()
+    for schedule in (new, old):
+        schedule.add_availability(DAY, "09:00", "12:00")
+        schedule.book_slot(DAY, "11:00")
+        schedule.book_slot(DAY, "09:30")
+
+    assert old.booked_slots[DAY.date()] == ["11:00", "09:30"]
+    assert new.get_booked_slots(DAY) == ["09:30", "11:00"]
+
+def test_view_schedule():
+    doctor = Doctor("DOC1", "Dr. One", "doc@x.com", "pw", "Cardiology", "LIC1", 10)
+    old = ListSchedule()
+    for date, start, end in ((DAY, "09:00", "11:00"), (DAY + timedelta(days=1), "13:00", "14:00")):
+        doctor.set_availability(date, start, end)
+        old.add_availability(date, start, end)
+    for date, time in ((DAY, "10:30"), (DAY, "09:00")):
+        doctor.schedule.book_slot(date, time)
+        old.book_slot(date, time)
+
+    assert doctor.view_schedule(DAY) == {DAY.date(): {
+        "available_slots": old.get_available_slots(DAY),
+        "booked_slots": sorted(old.booked_slots[DAY.date()])
+    }}
+    assert doctor.view_schedule() == {
+        "time_slots": old.time_slots,
+        "booked_slots": {day: sorted(times) for day, times in old.booked_slots.items()}
+    }
+    assert doctor.view_schedule(DAY + timedelta(days=5)) == {
+        (DAY + timedelta(days=5)).date(): {"available_slots": [], "booked_slots": []}
+    }
@@ -0,0 +1,91 @@
+import json
+from datetime import datetime
+
+import pytest
+
+import serializers
+from models.doctor import Doctor
+from models.hospital_admin import HospitalAdmin
+from models.patient import Appointment, MedicalRecord, Patient
+from serializers import FIELDS, dumps, parse_fields, to_dict
+
+def naive_dict(obj):
+    """What hand-written to_dict code would build: every exposed field, entries as plain dicts"""
+    result = {}
+    for field in FIELDS[type(obj)]:
+        value = getattr(obj, field)
+        if field == "medications":
+            value = [dict(entry) for entry in value]
+        elif field == "lab_results":
+            value = {name: dict(entry) for name, entry in value.items()}
+        result[field] = value
+    return result
+
+def naive_dumps(payload):
+    def default(obj):
+        if type(obj) in FIELDS:
+            return naive_dict(obj)
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if isinstance(obj, set):
+            return list(obj)
+        return str(obj)
+    return json.dumps(payload, default=default)
+
+@pytest.fixture
+def record():
+    record = MedicalRecord("REC001", "PAT001", "DOC001", "Flu", "Rest", datetime(2025, 6, 2, 9, 30))
+    record.add_medication("Paracetamol", "500mg", "5 days")
+    record.add_lab_result("CBC", "Normal", "4.5-11")
+    return record
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run a test with orjson when installed, and with the standard json module"""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serializers, "orjson", None)
+    return request.param
+
+def test_encoders_match_naive_dicts(demo_system, record):
+    users = demo_system.auth_system.users
+    objects = [users.get("PAT001"), users.get("DOC001"), users.get("ADM001"), record,
+               users.get("PAT001").appointments[0]]
+    assert {type(obj) for obj in objects} == {Patient, Doctor, HospitalAdmin, MedicalRecord, Appointment}
+    for obj in objects:
+        assert to_dict(obj) == naive_dict(obj)
+        assert list(to_dict(obj)) == list(FIELDS[type(obj)])
+        assert "password" not in to_dict(obj) and "password_hash" not in to_dict(obj)
+
+def test_dumps_matches_naive_json(demo_system, record, backend):
+    patient = demo_system.auth_system.users.get("PAT001")
+    payload = {"patient": patient, "appointments": patient.appointments, "records": [record],
+               "when": datetime(2025, 6, 2, 9, 30), "tags": {"a"}}
+    assert isinstance(dumps(payload), bytes)
+    assert json.loads(dumps(payload)) == json.loads(naive_dumps(payload))
+
+def test_dashboards_serialize(demo_system, backend):
+    for user_id in ("PAT001", "DOC001", "ADM001"):
+        user = demo_system.auth_system.users.get(user_id)
+        body = json.loads(dumps({"dashboard": user.get_dashboard_data()}))
+        assert body["dashboard"] == json.loads(naive_dumps({"dashboard": user.get_dashboard_data()}))["dashboard"]
+
+def test_field_selection(demo_system, backend):
+    appointments = demo_system.auth_system.users.get("PAT001").appointments
+    selection = {Appointment: parse_fields(Appointment, "status, appointment_id")}
+    body = json.loads(dumps({"appointments": appointments}, selection))
+    assert body["appointments"] == [{"status": a.status, "appointment_id": a.appointment_id} for a in appointments]
+    # Other selections and the default are unaffected
+    assert json.loads(dumps(appointments[0])) == json.loads(naive_dumps(appointments[0]))
+
+def test_parse_fields():
+    assert parse_fields(Appointment, None) is None
+    assert parse_fields(Appointment, "") is None
+    assert parse_fields(Appointment, "date,,status ") == ("date", "status")
+    with pytest.raises(ValueError, match="password"):
+        parse_fields(Patient, "name,password")
+
+def test_unknown_class_is_rejected():
+    with pytest.raises(TypeError):
+        to_dict(object())
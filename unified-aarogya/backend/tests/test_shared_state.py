@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.patient import Patient
+from portal_system import HospitalPortalSystem
+from storage import SharedState, open_state_backend
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two systems sharing one SQLite state file, like two gunicorn workers; the first loads the demo data"""
+    url = f"sqlite:///{tmp_path / 'state.db'}"
+    first, second = HospitalPortalSystem(), HospitalPortalSystem()
+    states = [SharedState(system, open_state_backend(url)) for system in (first, second)]
+    for state in states:
+        state.attach()
+    first.initialize_demo_data()
+    states[1].sync()
+    return (first, states[0]), (second, states[1])
+
+def test_changes_reach_the_other_worker(workers):
+    (first, _), (second, second_state) = workers
+    users = second.auth_system.users
+
+    assert len(users) == len(first.auth_system.users)
+    assert users.get("PAT003").allergies == ["Shellfish", "Latex"]
+    assert len(second.auth_system.appointments) == 2
+
+    first.auth_system.users.get("PAT002").add_allergy("Pollen")
+    appointment = first.auth_system.users.get("PAT001").appointments[0]
+    appointment.complete_appointment("Healthy")
+    assert second_state.sync() == 2
+    assert users.get("PAT002").allergies == ["Pollen"]
+    assert second.auth_system.appointments.get(appointment.appointment_id).status == "completed"
+    assert second_state.sync() == 0
+
+def test_specialization_change_refiles_the_doctor(workers):
+    (first, _), (second, second_state) = workers
+    first.auth_system.users.get("DOC001").set_availability(datetime(2030, 1, 7), "09:00", "10:00")
+    doctor = first.auth_system.users.get("DOC001")
+    old = doctor.specialization
+    doctor.specialization = "Oncology"
+    doctor.touch()
+    second_state.sync()
+
+    admin = second.auth_system.users.get("ADM001")
+    assert [d.user_id for d in admin.find_doctor_by_specialization("oncology")] == ["DOC001"]
+    assert "DOC001" not in [d.user_id for d in admin.find_doctor_by_specialization(old)]
+    assert admin.hospital_stats.departments.get("Oncology") == 1 and old not in admin.hospital_stats.departments
+    slots = admin.find_earliest_available_slots("Oncology", start=datetime(2030, 1, 7))
+    assert [(s["doctor_id"], s["time"]) for s in slots] == [("DOC001", "09:00"), ("DOC001", "09:30")]
+
+def test_conflicting_user_is_skipped(workers):
+    (first, first_state), (second, _) = workers
+    # Each worker registers a different patient under the same new ID; the second write wins the shared copy
+    mine = Patient("PAT_X", "First", "first@x.com", "pw", 30, "Male", "1", "")
+    first.auth_system.register_user(mine)
+    other = Patient("PAT_X", "Second", "second@x.com", "pw", 40, "Female", "2", "")
+    other.created_at -= timedelta(minutes=1)
+    second.auth_system.register_user(other)
+    first_state.sync()
+
+    assert first.auth_system.users.get("PAT_X") is mine and mine.name == "First"
+    assert first.auth_system.users.get_by_email("second@x.com") is None
+    assert first_state.conflicts[-1][:2] == ("patient", "PAT_X")
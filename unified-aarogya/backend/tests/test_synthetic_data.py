@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pytest
+
+from portal_system import HospitalPortalSystem
+from serializers import to_dict
+from synthetic_data import ADMIN_EMAIL, DEFAULT_PASSWORD, SyntheticHospital
+
+SIZES = dict(doctors=10, patients=150, appointments=800, records=120, anchor=date(2025, 6, 2),
+             past_days=20, future_days=10)
+
+def generate(**options):
+    system = HospitalPortalSystem()
+    report = SyntheticHospital(**dict(SIZES, **options)).populate(system)
+    return system, report
+
+def snapshot(system):
+    """Everything generated, without creation times and password hashes"""
+    def plain(obj):
+        return {field: value for field, value in to_dict(obj).items() if field not in ("created_at", "last_login")}
+    users = sorted(system.auth_system.users, key=lambda user: user.user_id)
+    return {
+        "users": [plain(user) for user in users],
+        "assigned": {user.user_id: list(user.assigned_patients) for user in users if user.role == "Doctor"},
+        "schedules": {user.user_id: sorted(user.schedule.booked_slots.items()) for user in users
+                      if user.role == "Doctor"},
+        "appointments": [plain(appointment) for appointment in system.auth_system.appointments.scan()],
+        "records": [plain(record) for user in users if user.role == "Patient" for record in user.medical_history]
+    }
+
+def test_same_seed_gives_the_same_hospital():
+    first, first_report = generate(seed=3)
+    second, second_report = generate(seed=3)
+
+    assert snapshot(first) == snapshot(second)
+    assert first_report.statuses == second_report.statuses
+    assert snapshot(first) != snapshot(generate(seed=4)[0])
+
+def test_counts_match_the_request():
+    system, report = generate(seed=3)
+
+    assert report.counts == {"doctors": 10, "patients": 150, "appointments": 800, "medical_records": 120}
+    assert report.shortfalls() == {}
+    assert sum(report.statuses.values()) == len(system.auth_system.appointments) == 800
+    users = system.auth_system.users
+    assert len(users) == 161 and len(users.get_by_email(ADMIN_EMAIL).managed_doctors) == 10
+    assert system.auth_system.login(ADMIN_EMAIL, DEFAULT_PASSWORD) is not None
+
+def test_appointments_fit_the_schedules():
+    system, _ = generate(seed=3, doctors=30)
+    appointments = list(system.auth_system.appointments.scan())
+    anchor = datetime(2025, 6, 2)
+
+    assert [a.date for a in appointments] == sorted(a.date for a in appointments)
+    taken = [(a.doctor_id, a.date) for a in appointments if a.status != "cancelled"]
+    assert len(taken) == len(set(taken))  # nobody double-booked
+    assert all(a.status != "completed" for a in appointments if a.date >= anchor)
+    users = system.auth_system.users
+    pediatric = [a for a in appointments if users.get(a.doctor_id).specialization == "Pediatrics"]
+    assert pediatric and all(users.get(a.patient_id).age < 18 for a in pediatric)
+
+def test_sizes_draw_from_their_own_streams():
+    small, _ = generate(seed=3)
+    busier, _ = generate(seed=3, appointments=900)
+
+    assert snapshot(small)["users"] == snapshot(busier)["users"]
+    assert snapshot(small)["assigned"] == snapshot(busier)["assigned"]
+
+def test_shortfall_when_slots_run_out():
+    system, report = generate(seed=3, doctors=2, appointments=100_000, records=0)
+
+    assert 0 < report.counts["appointments"] < 100_000
+    assert report.shortfalls() == {"appointments": 100_000 - report.counts["appointments"]}
+
+def test_unknown_scale():
+    with pytest.raises(ValueError, match="Unknown scale"):
+        SyntheticHospital.from_scale("huge")
+    assert SyntheticHospital.from_scale("tiny", doctors=5).sizes["doctors"] == 5
@@ -0,0 +1,101 @@
+from throttle import LoginThrottle
+
+WINDOW = 100.0
+
+def test_locks_after_max_failures():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW)
+
+    assert throttle.record_failure("a@x.com", now=10) == 2
+    assert throttle.record_failure("a@x.com", now=11) == 1
+    assert not throttle.is_locked("a@x.com", now=12)
+    assert throttle.record_failure("a@x.com", now=12) == 0
+    assert throttle.is_locked("a@x.com", now=12)
+    assert not throttle.is_locked("b@x.com", now=12)
+
+def test_lockout_lasts_a_full_window():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW)
+    # Bunched at the end of a window, so the sliding estimate drops below the limit right after it rolls over
+    for now in (97, 98, 99):
+        throttle.record_failure("a@x.com", now=now)
+
+    assert throttle.failures("a@x.com", now=101) < 3
+    assert throttle.is_locked("a@x.com", now=101)
+    assert throttle.is_locked("a@x.com", now=198.9)
+    assert not throttle.is_locked("a@x.com", now=199.1)
+
+def test_failures_slide_out_of_the_window():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW)
+    throttle.record_failure("a@x.com", now=10)
+    throttle.record_failure("a@x.com", now=20)
+
+    assert throttle.failures("a@x.com", now=50) == 2
+    assert throttle.failures("a@x.com", now=150) == 1  # half of the previous window still overlaps
+    assert throttle.failures("a@x.com", now=250) == 0
+    assert throttle.remaining("a@x.com", now=250) == 3
+
+def test_reset_clears_a_key():
+    throttle = LoginThrottle(max_failures=2, window=WINDOW)
+    throttle.record_failure("a@x.com", now=10)
+    throttle.record_failure("a@x.com", now=11)
+    throttle.reset("a@x.com")
+
+    assert not throttle.is_locked("a@x.com", now=12)
+    assert "a@x.com" not in throttle
+
+def test_memory_is_bounded():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW, max_entries=100)
+    for number in range(250):
+        throttle.record_failure(f"junk{number}@x.com", now=10)
+
+    assert len(throttle) == 100
+    assert throttle.evicted == 150
+    assert "junk249@x.com" in throttle and "junk0@x.com" not in throttle
+
+def test_expired_entries_are_dropped():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW)
+    throttle.record_failure("old@x.com", now=10)
+    throttle.record_failure("new@x.com", now=10 + 2 * WINDOW)
+
+    assert "old@x.com" not in throttle
+    assert len(throttle) == 1
+
+def test_login_is_refused_while_locked(demo_system):
+    auth = demo_system.auth_system
+    auth.login_throttle = LoginThrottle(max_failures=3, window=WINDOW)
+    for _ in range(3):
+        assert auth.login("alice@email.com", "wrong") is None
+
+    assert auth.login("ALICE@email.com", "pat123") is None
+    auth.login_throttle.reset("alice@email.com")
+    assert auth.login("ALICE@email.com", "pat123").user_id == "PAT001"
+
+def test_junk_cannot_evict_a_lockout():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW, max_entries=50)
+    for now in (1, 2, 3):
+        throttle.record_failure("victim@x.com", now=now)
+    for number in range(500):
+        throttle.record_failure(f"junk{number}@x.com", now=5)
+
+    assert len(throttle) == 50
+    assert throttle.is_locked("victim@x.com", now=50)
+    assert throttle.evicted_locked == 0
+
+def test_lockout_is_dropped_only_when_every_key_is_locked():
+    throttle = LoginThrottle(max_failures=1, window=WINDOW, max_entries=3)
+    for number in range(4):
+        throttle.record_failure(f"user{number}@x.com", now=10 + number)
+
+    assert len(throttle) == 3
+    assert "user0@x.com" not in throttle  # the oldest lockout goes
+    assert all(throttle.is_locked(f"user{number}@x.com", now=20) for number in (1, 2, 3))
+    assert throttle.stats()["evicted_locked"] == 1
+
+def test_ended_lockout_rejoins_the_sliding_count():
+    throttle = LoginThrottle(max_failures=3, window=WINDOW, max_entries=10)
+    for now in (1, 2, 3, 50):  # the last failure lands while locked
+        throttle.record_failure("a@x.com", now=now)
+    throttle.record_failure("b@x.com", now=110)  # past the lockout end at 103
+
+    assert throttle.stats()["locked"] == 0 and len(throttle) == 2
+    assert throttle.is_locked("a@x.com", now=110)  # 4 failures at 90% overlap still reach the limit
+    assert not throttle.is_locked("a@x.com", now=170)
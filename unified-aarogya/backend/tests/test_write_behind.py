@@ -0,0 +1,121 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo.errors import AutoReconnect, WriteError
+
+from models.patient import Patient
+from storage import MongoStore, WriteBehindQueue, connect
+
+class FlakyStore(MongoStore):
+    """A mongomock store whose save_documents can be made to fail"""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.fail_ids = set()  # documents that always fail to write
+        self.unreachable = 0  # calls still to fail with a connection error
+        self.calls = 0
+
+    def save_documents(self, documents):
+        self.calls += 1
+        documents = list(documents)
+        if self.unreachable:
+            self.unreachable -= 1
+            raise AutoReconnect("connection refused")
+        if any(document["_id"] in self.fail_ids for _, document in documents):
+            raise WriteError("document rejected")
+        return super().save_documents(documents)
+
+@pytest.fixture
+def store(request):
+    return FlakyStore(connect("mongomock://localhost", f"write_behind_{request.node.name}"))
+
+def _patient(number):
+    return Patient(f"PAT{number}", f"Patient {number}", f"p{number}@x.com", "pw", 30, "Female", "555", "")
+
+def test_changes_to_one_object_coalesce(store):
+    queue = WriteBehindQueue(store)
+    patient = _patient(1)
+    for age in range(31, 41):
+        patient.age = age
+        queue.enqueue(patient)
+
+    assert len(queue) == 1
+    assert queue.flush() == 1
+    assert store.patients.find_one({"_id": "PAT1"})["age"] == 40
+    assert queue.flush() == 0 and store.calls == 1
+
+def test_documents_are_taken_when_queued(store):
+    queue = WriteBehindQueue(store)
+    patient = _patient(1)
+    patient.add_allergy("Dust")
+    queue.enqueue(patient)
+    patient.add_allergy("Pollen")  # not queued, so not written
+
+    queue.flush()
+    assert store.patients.find_one({"_id": "PAT1"})["allergies"] == ["Dust"]
+
+def test_full_batch_flushes_before_the_interval(store):
+    queue = WriteBehindQueue(store, flush_interval=60, batch_size=5)
+    queue.start()
+    try:
+        for number in range(4):
+            queue.enqueue(_patient(number))
+        time.sleep(0.1)
+        assert store.patients.count_documents({}) == 0  # below batch_size, waits for the interval
+
+        queue.enqueue(_patient(4))
+        deadline = time.time() + 5
+        while store.patients.count_documents({}) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.patients.count_documents({}) == 5
+        assert queue.stats()["batches"] == 1
+    finally:
+        queue.stop()
+
+def test_stop_flushes_what_is_pending(store):
+    queue = WriteBehindQueue(store, flush_interval=60)
+    queue.start()
+    queue.enqueue(_patient(1))
+    queue.stop()
+
+    assert store.patients.count_documents({}) == 1 and len(queue) == 0
+
+def test_unreachable_database_keeps_the_batch(store):
+    queue = WriteBehindQueue(store, flush_interval=0.01)
+    queue.enqueue(_patient(1))
+    queue.enqueue(_patient(2))
+    store.unreachable = 2
+
+    assert queue.flush() == 0 and queue.flush() == 0
+    assert len(queue) == 2 and not queue.dead_letters
+    assert queue.flush() == 2
+    assert store.patients.count_documents({}) == 2
+
+def test_bad_document_goes_to_dead_letters(store):
+    queue = WriteBehindQueue(store, max_attempts=3)
+    store.fail_ids.add("PAT2")
+    for number in range(1, 4):
+        queue.enqueue(_patient(number))
+
+    assert queue.flush() == 2  # the batch fails, then the good documents go one at a time
+    assert len(queue) == 1
+    queue.flush()
+    queue.flush()
+    assert len(queue) == 0
+    assert [(name, document["_id"]) for name, document, _ in queue.dead_letters] == [("patients", "PAT2")]
+    assert queue.stats()["dead_letters"] == 1
+    assert sorted(store.patients.distinct("_id")) == ["PAT1", "PAT3"]
+
+def test_attached_queue_follows_model_changes(store, demo_system):
+    queue = WriteBehindQueue(store)
+    queue.attach(demo_system.auth_system.users)
+    alice = demo_system.auth_system.users.get("PAT001")
+    alice.add_allergy("Latex")
+    appointment_id = alice.book_appointment("DOC002", datetime.now() + timedelta(days=4), "Rash")
+    demo_system.auth_system.register_user(_patient(9))
+
+    assert queue.flush() == 3
+    assert store.patients.find_one({"_id": "PAT001"})["allergies"] == ["Penicillin", "Latex"]
+    assert store.appointments.find_one({"_id": appointment_id})["reason"] == "Rash"
+    assert store.patients.find_one({"_id": "PAT9"}) is not None
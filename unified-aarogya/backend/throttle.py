@@ -0,0 +1,154 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_FAILURES = 3
+DEFAULT_WINDOW = 15 * 60  # seconds
+DEFAULT_MAX_ENTRIES = 100_000  # about 27 MB of entries with typical email keys
+
+class LoginThrottle:
+    """Counts failed logins per key over a sliding window, in bounded memory
+
+    Each key keeps two counters: failures in the current fixed window and
+    in the one before it. The sliding count is the current counter plus
+    the previous one weighted by how much of the previous window still
+    overlaps the last `window` seconds, so a check or a failure is O(1).
+    The weighting is an estimate: failures bunched at the end of a window
+    would count as slightly under max_failures a moment after it rolls
+    over. So the failure that reaches max_failures also stamps a lockout
+    end one full window later, and the key stays locked until then
+    whatever the estimate says. After that the lockout lifts on its own
+    once old failures slide out.
+
+    Entries sit in an OrderedDict in order of their last failure. A key
+    with no failure for two windows has nothing left to count, so expired
+    entries are dropped from the front on every write, and when more than
+    max_entries keys are tracked the least recently failed one is evicted.
+    A burst of junk emails therefore costs at most max_entries small
+    tuples: about 270 bytes each with an email key, or roughly 27 MB at
+    the default cap of 100,000.
+
+    Keys whose lockout is running sit in a second OrderedDict, in order of
+    lockout end, and go back to the first once it ends. Evicting for room
+    takes unlocked keys first, so filling the table with junk emails
+    cannot lift a real lockout early. Only when every tracked key is
+    locked out is the oldest lockout dropped; that is counted in
+    evicted_locked.
+    """
+
+    def __init__(self, max_failures: Optional[int] = None, window: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.max_failures = max_failures or int(os.getenv("LOGIN_MAX_FAILURES", DEFAULT_MAX_FAILURES))
+        self.window = window or float(os.getenv("LOGIN_THROTTLE_WINDOW", DEFAULT_WINDOW))
+        self.max_entries = max_entries or int(os.getenv("LOGIN_THROTTLE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        # key -> (window number, failures in it, failures in the window before, time of last failure,
+        #         time the lockout ends or 0.0)
+        self._entries: "OrderedDict[Hashable, Tuple[int, int, int, float, float]]" = OrderedDict()
+        self._locked: "OrderedDict[Hashable, Tuple[int, int, int, float, float]]" = OrderedDict()  # same, while locked
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.evicted_locked = 0  # active lockouts dropped because every tracked key was locked
+
+    def _failures(self, entry: Tuple[int, int, int, float, float], now: float) -> float:
+        number, current, previous, _, _ = entry
+        window_now = int(now // self.window)
+        if window_now == number + 1:
+            previous, current = current, 0
+        elif window_now > number + 1:
+            return 0.0
+        overlap = 1.0 - (now % self.window) / self.window
+        return current + previous * overlap
+
+    def _entry(self, key: Hashable) -> Optional[Tuple[int, int, int, float, float]]:
+        entry = self._entries.get(key)
+        return entry if entry is not None else self._locked.get(key)
+
+    def failures(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Failures for a key over the last window"""
+        entry = self._entry(key)
+        if entry is None:
+            return 0.0
+        return self._failures(entry, time.time() if now is None else now)
+
+    def is_locked(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """True while a key's lockout lasts or it has max_failures or more failures in the last window"""
+        return self.remaining(key, now) == 0
+
+    def remaining(self, key: Hashable, now: Optional[float] = None) -> int:
+        """Attempts left before a key is locked"""
+        entry = self._entry(key)
+        if entry is None:
+            return self.max_failures
+        now = time.time() if now is None else now
+        if now < entry[4]:
+            return 0
+        return max(0, self.max_failures - math.ceil(self._failures(entry, now)))
+
+    def record_failure(self, key: Hashable, now: Optional[float] = None) -> int:
+        """Count a failed attempt and return the attempts remaining"""
+        now = time.time() if now is None else now
+        window_now = int(now // self.window)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = self._locked.get(key)
+            locked_until = entry[4] if entry is not None else 0.0
+            if entry is None or entry[0] < window_now - 1:
+                entry = (window_now, 1, 0, now, locked_until)
+            elif entry[0] == window_now - 1:
+                entry = (window_now, 1, entry[1], now, locked_until)
+            else:
+                entry = (window_now, entry[1] + 1, entry[2], now, locked_until)
+            if locked_until <= now and self._failures(entry, now) >= self.max_failures:
+                entry = entry[:4] + (now + self.window,)
+            if now >= entry[4]:
+                self._locked.pop(key, None)
+                self._entries[key] = entry
+            else:
+                if entry[4] != locked_until:
+                    self._locked.pop(key, None)  # a new lockout goes to the back
+                self._locked[key] = entry  # a running one keeps its place
+            self._evict(now)
+        return self.remaining(key, now)
+
+    def reset(self, key: Hashable):
+        """Forget a key, e.g. after a successful login"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._locked.pop(key, None)
+
+    def _evict(self, now: float):
+        ttl = 2 * self.window
+        entries, locked = self._entries, self._locked
+        # Ended lockouts rejoin the other keys, whose old failures may still count
+        while locked:
+            key, entry = next(iter(locked.items()))
+            if now < entry[4]:
+                break
+            del locked[key]
+            if now - entry[3] < ttl:
+                entries[key] = entry
+        while entries:
+            entry = next(iter(entries.values()))
+            if now - entry[3] < ttl and len(entries) + len(locked) <= self.max_entries:
+                break
+            entries.popitem(last=False)
+            self.evicted += 1
+        while len(locked) > self.max_entries:  # every tracked key is locked out
+            locked.popitem(last=False)
+            self.evicted += 1
+            self.evicted_locked += 1
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._locked)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries or key in self._locked
+
+    def stats(self) -> Dict:
+        """Counters for monitoring"""
+        return {"tracked": len(self), "locked": len(self._locked), "max_entries": self.max_entries,
+                "evicted": self.evicted, "evicted_locked": self.evicted_locked, "window_seconds": self.window}
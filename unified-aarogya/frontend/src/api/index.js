@@ -3,6 +3,21 @@ const API_BASE_URL = import.meta.env.PROD
   ? 'https://aarogya-1bcm9b9fl-aayushi-singhhs-projects.vercel.app' 
   : 'http://localhost:5001';
 
+// Dashboards answer with an ETag; the browser revalidates with If-None-Match
+// and a 304 is served from its cache, so polling an unchanged dashboard is cheap.
+
+// Signed bearer token from the last login, sent as the Authorization header
+const TOKEN_KEY = 'aarogyaToken';
+
+export const getToken = () => localStorage.getItem(TOKEN_KEY);
+
+export const clearToken = () => localStorage.removeItem(TOKEN_KEY);
+
+const authHeaders = (headers = {}) => {
+  const token = getToken();
+  return token ? { ...headers, Authorization: `Bearer ${token}` } : headers;
+};
+
 export const api = {
   // User authentication
   login: async (email, password) => {
@@ -14,12 +29,19 @@ export const api = {
       credentials: 'include',
       body: JSON.stringify({ email, password }),
     });
+    if (response.ok) {
+      const data = await response.clone().json().catch(() => null);
+      if (data && data.token) {
+        localStorage.setItem(TOKEN_KEY, data.token);
+      }
+    }
     return response;
   },
 
   // Get user info
   getUserInfo: async () => {
     const response = await fetch(`${API_BASE_URL}/api/user_info`, {
+      headers: authHeaders(),
       credentials: 'include',
     });
     return response.json();
@@ -28,7 +50,8 @@ export const api = {
   // Patient endpoints
   patient: {
     getDashboard: async () => {
-      const response = await fetch(`${API_BASE_URL}/patient/dashboard`, {
+      const response = await fetch(`${API_BASE_URL}/api/patient/dashboard`, {
+        headers: authHeaders(),
         credentials: 'include',
       });
       return response;
@@ -37,9 +60,9 @@ export const api = {
     bookAppointment: async (appointmentData) => {
       const response = await fetch(`${API_BASE_URL}/patient/book_appointment`, {
         method: 'POST',
-        headers: {
+        headers: authHeaders({
           'Content-Type': 'application/json',
-        },
+        }),
         credentials: 'include',
         body: JSON.stringify(appointmentData),
       });
@@ -50,7 +73,8 @@ export const api = {
   // Doctor endpoints
   doctor: {
     getDashboard: async () => {
-      const response = await fetch(`${API_BASE_URL}/doctor/dashboard`, {
+      const response = await fetch(`${API_BASE_URL}/api/doctor/dashboard`, {
+        headers: authHeaders(),
         credentials: 'include',
       });
       return response;
@@ -60,7 +84,8 @@ export const api = {
   // Admin endpoints
   admin: {
     getDashboard: async () => {
-      const response = await fetch(`${API_BASE_URL}/admin/dashboard`, {
+      const response = await fetch(`${API_BASE_URL}/api/admin/dashboard`, {
+        headers: authHeaders(),
         credentials: 'include',
       });
       return response;
@@ -70,6 +95,7 @@ export const api = {
   // Initialize demo data
   initializeDemoData: async () => {
     const response = await fetch(`${API_BASE_URL}/demo_data`, {
+      headers: authHeaders(),
       credentials: 'include',
     });
     return response;